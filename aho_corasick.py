@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick automaton for multi-pattern substring search and replacement.
+
+All patterns are compiled into one trie with failure links, so a single
+left-to-right pass over a text finds every occurrence of every pattern.
+Replacement keeps the leftmost-longest, non-overlapping matches, the
+same choice a regex alternation sorted longest-first would make.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+
+class Automaton:
+    """Compiled pattern set over plain strings."""
+
+    __slots__ = ('goto', 'fail', 'outputs')
+
+    def __init__(self, patterns: Iterable[str]):
+        # State 0 is the root; goto[state] maps a character to the next state
+        self.goto = [{}]
+        self.fail = [0]
+        # Lengths of patterns ending at each state, longest first
+        self.outputs = [()]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append(())
+                state = next_state
+            if len(pattern) not in self.outputs[state]:
+                self.outputs[state] = (len(pattern),) + self.outputs[state]
+
+        # Breadth-first failure links; outputs inherit their fallback's matches
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(char, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = tuple(sorted(
+                    set(self.outputs[next_state]) | set(self.outputs[self.fail[next_state]]), reverse=True))
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(start, end) of every pattern occurrence, overlapping, in end order."""
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length in outputs[state]:
+                yield index + 1 - length, index + 1
+
+    def leftmost_longest(self, text: str) -> List[Tuple[int, int]]:
+        """Non-overlapping matches, preferring the earliest start, then the longest."""
+        best = {}
+        for start, end in self.finditer(text):
+            if end > best.get(start, start):
+                best[start] = end
+        matches = []
+        position = 0
+        for start in sorted(best):
+            if start >= position:
+                matches.append((start, best[start]))
+                position = best[start]
+        return matches
+
+    def replace(self, text: str, replacements: Dict[str, str]) -> str:
+        """Text with each leftmost-longest match substituted from replacements."""
+        matches = self.leftmost_longest(text)
+        if not matches:
+            return text
+        parts = []
+        position = 0
+        for start, end in matches:
+            parts.append(text[position:start])
+            parts.append(replacements[text[start:end]])
+            position = end
+        parts.append(text[position:])
+        return ''.join(parts)
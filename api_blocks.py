@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Single-pass block extractor for finfactor/apiResonse.json.
+
+Walks the capture dump exactly once, tracking string/escape state so braces
+inside string values never unbalance the scan, and yields one ApiBlock per
+captured API with byte spans of its request and response values.
+"""
+
+import json
+import mmap
+import re
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from pathlib import Path
+
+
+# Spans are (start, end) byte offsets into the dump, end exclusive.
+ApiBlock = namedtuple('ApiBlock', ['name', 'endpoint', 'request_span', 'response_span', 'offset'])
+
+# Only the tokens that matter for block structure are matched; everything
+# between them (numbers, commas, whitespace, quoted keys) is skipped by the
+# regex engine without touching Python.
+_TOKEN = re.compile(
+    rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+    rb"|'[^'\\]*(?:\\.[^'\\]*)*'"
+    rb'|//[^\n]*'
+    rb'|/\*.*?\*/'
+    rb'|[{}\[\]]'
+    rb'|\b(name|endpoint|request|response)\s*:',
+    re.DOTALL,
+)
+
+# Inside a captured request/response value only bracket balance matters, so
+# each match swallows strings, comments and plain text up to the next bracket.
+_CAPTURE_TOKEN = re.compile(
+    rb'[^"\'{}\[\]/]*'
+    rb'(?:(?:"[^"\\]*(?:\\.[^"\\]*)*"'
+    rb"|'[^'\\]*(?:\\.[^'\\]*)*'"
+    rb'|//[^\n]*|/\*.*?\*/|/)'
+    rb'[^"\'{}\[\]/]*)*'
+    rb'[{}\[\]]',
+    re.DOTALL,
+)
+
+_STRING_VALUE = re.compile(
+    rb'\s*("[^"\\]*(?:\\.[^"\\]*)*"'
+    rb"|'[^'\\]*(?:\\.[^'\\]*)*')",
+    re.DOTALL,
+)
+
+_SCALAR_VALUE = re.compile(
+    rb'\s*(null|undefined|true|false|-?[0-9][0-9.eE+-]*'
+    rb'|"[^"\\]*(?:\\.[^"\\]*)*"'
+    rb"|'[^'\\]*(?:\\.[^'\\]*)*')",
+    re.DOTALL,
+)
+
+_WHITESPACE = re.compile(rb'\s*')
+
+_QUOTE, _APOS, _SLASH = ord('"'), ord("'"), ord('/')
+_OPENERS = (ord('{'), ord('['))
+_CLOSERS = (ord('}'), ord(']'))
+
+
+def _unquote(raw: bytes) -> str:
+    """Decode a quoted JS string literal."""
+    if raw[0] == _QUOTE:
+        return json.loads(raw)
+    return raw[1:-1].decode('utf-8').replace("\\'", "'")
+
+
+def iter_api_blocks(buf):
+    """
+    Yield an ApiBlock for every `{ name: ..., endpoint: ..., ... }` record.
+
+    `buf` is any bytes-like object (bytes, mmap). Record keys are only
+    recognised at the nesting level of the record itself, so `name:` keys
+    inside request/response payloads are never mistaken for new APIs.
+    """
+    depth = 0
+    record = None
+    record_depth = -1
+    capture = None
+    capture_start = 0
+    pos = 0
+
+    while True:
+        if capture is not None:
+            m = _CAPTURE_TOKEN.match(buf, pos)
+            if m is None:
+                break
+            pos = m.end()
+            if buf[pos - 1] in _OPENERS:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == record_depth:
+                    record[capture] = (capture_start, pos)
+                    capture = None
+            continue
+
+        m = _TOKEN.search(buf, pos)
+        if m is None:
+            break
+        pos = m.end()
+        start = m.start()
+        c = buf[start]
+
+        if c == _QUOTE or c == _APOS or c == _SLASH:
+            continue
+
+        if c in _OPENERS:
+            depth += 1
+            continue
+
+        if c in _CLOSERS:
+            depth -= 1
+            if record is not None and depth < record_depth:
+                if b'endpoint' in record:
+                    yield _make_block(record)
+                record = None
+            continue
+
+        # A bare `key:` marker.
+        key = m.group(1)
+        if record is None or depth != record_depth:
+            if key != b'name':
+                continue
+            record = {'offset': start}
+            record_depth = depth
+
+        if key == b'name' or key == b'endpoint':
+            if key in record:
+                # A second `name:` at the same level starts a new record.
+                if key == b'name' and b'endpoint' in record:
+                    yield _make_block(record)
+                    record = {'offset': start}
+                else:
+                    continue
+            value = _STRING_VALUE.match(buf, pos)
+            if value is not None:
+                record[key] = _unquote(value.group(1))
+            continue
+
+        value_start = _WHITESPACE.match(buf, pos).end()
+        if value_start < len(buf) and buf[value_start] in _OPENERS:
+            capture = key
+            capture_start = value_start
+            depth += 1
+            pos = value_start + 1
+        else:
+            value = _SCALAR_VALUE.match(buf, pos)
+            if value is not None:
+                record[key] = value.span(1)
+
+    if record is not None and capture is None and b'endpoint' in record:
+        yield _make_block(record)
+
+
+def _make_block(record) -> ApiBlock:
+    return ApiBlock(
+        name=record.get(b'name', ''),
+        endpoint=record[b'endpoint'],
+        request_span=record.get(b'request'),
+        response_span=record.get(b'response'),
+        offset=record['offset'],
+    )
+
+
+def span_text(buf, span) -> str:
+    """Return the decoded source text of a span, or '' for a missing span."""
+    if span is None:
+        return ''
+    return bytes(buf[span[0]:span[1]]).decode('utf-8')
+
+
+@contextmanager
+def open_dump(api_file: Path):
+    """Memory-map the dump read-only for the duration of the block."""
+    with open(api_file, 'rb') as f:
+        if Path(api_file).stat().st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            yield buf
+
+
+def read_api_blocks(api_file: Path):
+    """
+    Scan a dump file and return its blocks as dicts with decoded text,
+    in the same shape the line-based scanners produce.
+    """
+    apis = []
+    with open_dump(api_file) as buf:
+        for block in iter_api_blocks(buf):
+            apis.append({
+                'name': block.name,
+                'endpoint': block.endpoint,
+                'request': span_text(buf, block.request_span),
+                'response': span_text(buf, block.response_span),
+                'offset': block.offset
+            })
+    return apis
+
+
+def main():
+    """Print the blocks found in a dump."""
+    base_dir = Path(__file__).parent
+    api_file = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'finfactor' / 'apiResonse.json'
+
+    with open_dump(api_file) as buf:
+        count = 0
+        for block in iter_api_blocks(buf):
+            count += 1
+            size = block.response_span[1] - block.response_span[0] if block.response_span else 0
+            print(f"  📡 {block.name}")
+            print(f"     Endpoint: {block.endpoint}")
+            print(f"     Response: {size:,} bytes at offset {block.offset:,}")
+
+    print(f"\n✅ Found {count} API blocks")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Persistent byte-offset index for API blocks in finfactor/apiResonse.json.
+
+The index is a JSON sidecar next to the dump recording, per API name and
+endpoint, where its request/response values live. ApiIndexReader mmaps the
+dump and decodes a single block on demand, so fetching one API never
+re-scans the whole file.
+"""
+
+import json
+import mmap
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import js_literal
+from api_blocks import iter_api_blocks, open_dump
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx.json'
+
+
+def index_path(api_file: Path) -> Path:
+    """Sidecar index location for a dump."""
+    api_file = Path(api_file)
+    return api_file.with_name(api_file.name + INDEX_SUFFIX)
+
+
+def _span_entry(span) -> Optional[List[int]]:
+    if span is None:
+        return None
+    return [span[0], span[1] - span[0]]
+
+
+def build_index(api_file: Path) -> Dict:
+    """Scan the dump once and write its sidecar index."""
+    api_file = Path(api_file)
+    stat = api_file.stat()
+
+    apis = []
+    with open_dump(api_file) as buf:
+        for block in iter_api_blocks(buf):
+            apis.append({
+                'name': block.name,
+                'endpoint': block.endpoint,
+                'offset': block.offset,
+                'request': _span_entry(block.request_span),
+                'response': _span_entry(block.response_span)
+            })
+
+    index = {
+        'version': INDEX_VERSION,
+        'dump': api_file.name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'apis': apis
+    }
+
+    with open(index_path(api_file), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+
+    return index
+
+
+def load_index(api_file: Path, rebuild: bool = True) -> Dict:
+    """Load the sidecar index, rebuilding it if missing or stale."""
+    api_file = Path(api_file)
+    sidecar = index_path(api_file)
+    stat = api_file.stat()
+
+    if sidecar.exists():
+        with open(sidecar, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if (index.get('version') == INDEX_VERSION
+                and index.get('size') == stat.st_size
+                and index.get('mtime_ns') == stat.st_mtime_ns):
+            return index
+
+    if not rebuild:
+        raise FileNotFoundError(f"No up-to-date index for {api_file}")
+    return build_index(api_file)
+
+
+class ApiIndexReader:
+    """Random access to individual API blocks through the sidecar index."""
+
+    def __init__(self, api_file: Path, rebuild: bool = True):
+        self.api_file = Path(api_file)
+        self.index = load_index(self.api_file, rebuild)
+        self.by_key = {}
+        self.by_name = {}
+        for entry in self.index['apis']:
+            self.by_key.setdefault((entry['name'], entry['endpoint']), entry)
+            self.by_name.setdefault(entry['name'], entry)
+        self._file = None
+        self._buf = None
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        if self._buf is None:
+            self._file = open(self.api_file, 'rb')
+            self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._buf is not None:
+            self._buf.close()
+            self._file.close()
+            self._buf = None
+            self._file = None
+
+    def entry(self, name: str, endpoint: Optional[str] = None) -> Dict:
+        """Index entry for an API, by name or (name, endpoint)."""
+        if endpoint is not None:
+            return self.by_key[(name, endpoint)]
+        return self.by_name[name]
+
+    def raw(self, name: str, endpoint: Optional[str] = None, part: str = 'response') -> str:
+        """Source text of one API's request or response value."""
+        span = self.entry(name, endpoint)[part]
+        if span is None:
+            return ''
+        self.open()
+        start, length = span
+        return self._buf[start:start + length].decode('utf-8')
+
+    def response(self, name: str, endpoint: Optional[str] = None):
+        """Decoded response of one API."""
+        text = self.raw(name, endpoint, 'response')
+        return js_literal.loads(text) if text else None
+
+    def request(self, name: str, endpoint: Optional[str] = None):
+        """Decoded request of one API."""
+        text = self.raw(name, endpoint, 'request')
+        return js_literal.loads(text) if text else None
+
+
+def main():
+    """Build the index, or print one API's response if a name is given."""
+    base_dir = Path(__file__).parent
+    api_file = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'finfactor' / 'apiResonse.json'
+
+    with ApiIndexReader(api_file) as reader:
+        if len(sys.argv) > 2:
+            print(json.dumps(reader.response(sys.argv[2]), indent=2, ensure_ascii=False))
+            return
+
+        print(f"✅ Indexed {len(reader.index['apis'])} API blocks in {index_path(api_file)}")
+
+
+if __name__ == '__main__':
+    main()
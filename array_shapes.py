@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Full-array shape union for the recursive field walkers.
+
+Instead of sampling the first few elements of an array, every element is
+fingerprinted by its structure (keys, value types and nested shapes) and
+the walker only descends into one representative per distinct shape. The
+number of elements sharing each shape is kept so walkers can report how
+often every field actually occurs.
+"""
+
+from typing import Any, List, Tuple
+
+
+def shape_of(value: Any):
+    """
+    Hashable structural fingerprint of a decoded value.
+    Dicts are (keys, value shapes), lists are their distinct container
+    element shapes with multiplicities in first-seen order (scalar elements
+    carry no fields) and scalars are their type, so values never affect the
+    result while occurrence counts and field order below a representative
+    stay exact.
+    """
+    if isinstance(value, dict):
+        return (tuple(value), tuple(map(shape_of, value.values())))
+    if isinstance(value, list):
+        counts = {}
+        for item in value:
+            if isinstance(item, (dict, list)):
+                shape = shape_of(item)
+                counts[shape] = counts.get(shape, 0) + 1
+        return tuple(counts.items())
+    return type(value)
+
+
+def distinct_elements(items: List) -> List[Tuple[Any, int]]:
+    """
+    One (representative, count) pair per distinct container-element shape,
+    in first-seen order. Scalar elements carry no fields and are dropped.
+    """
+    counts = {}
+    representatives = {}
+
+    for item in items:
+        if not isinstance(item, (dict, list)):
+            continue
+        shape = shape_of(item)
+        if shape in counts:
+            counts[shape] += 1
+        else:
+            counts[shape] = 1
+            representatives[shape] = item
+
+    return [(representatives[shape], counts[shape]) for shape in representatives]
@@ -0,0 +1,1002 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for the ingestion pipeline.
+
+Runs against a synthetic apiResonse.json-style dump so results are
+reproducible without a real capture. Usage:
+
+    python3 benchmarks.py [name ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def make_synthetic_dump(n_apis=43, n_transactions=2000):
+    """Build a capture dump in the same JS-literal layout as apiResonse.json."""
+    fi_paths = ['deposit', 'term-deposit', 'recurring-deposit', 'mutual-fund', 'equities', 'etf', 'nps']
+    lines = ['const apiResponses = {', '  responses: [']
+
+    for i in range(n_apis):
+        fi_path = fi_paths[i % len(fi_paths)]
+        response = {
+            'status': 'SUCCESS',
+            'message': 'Fetched {ok} with braces } inside a string',
+            'summary': {
+                'currentValue': 1234.5 + i,
+                'investmentValue': 1000,
+                'holders': [{'name': 'A', 'pan': 'ABCDE1234F', 'nominee': 'REGISTERED'}],
+            },
+            'transactions': [
+                {
+                    'txnId': f'T{i}-{j}',
+                    'amount': j * 1.5,
+                    'type': 'CREDIT' if j % 2 else 'DEBIT',
+                    'narration': f'UPI/{j}/"quoted"',
+                    'reference': None,
+                    'reversed': False,
+                    **({'chequeNumber': str(j)} if j % 97 == 0 else {}),
+                }
+                for j in range(n_transactions if fi_path == 'deposit' else n_transactions // 10)
+            ],
+        }
+        request = {'accountRef': f'acc-{i}', 'page': 1}
+        lines.append('    {')
+        lines.append(f'      name: "{fi_path} API {i}",')
+        lines.append(f'      endpoint: "/pfm/api/v2/{fi_path}/acc-{i}/account-statement",')
+        lines.append('      request: ' + json.dumps(request, indent=2).replace('\n', '\n      ') + ',')
+        lines.append('      response: ' + json.dumps(response, indent=2).replace('\n', '\n      ') + ',')
+        lines.append('      error: null')
+        lines.append('    },')
+
+    lines.append('  ]')
+    lines.append('};')
+    return '\n'.join(lines)
+
+
+def _timeit(func, repeat=3):
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _scan_lines(content):
+    """
+    The line-based scanner the tokenizer replaced (parse_all_apis.parse_by_lines),
+    with the fixes it needed to return decodable blocks at all: the block
+    starts at the first '{' after 'response:', braces are counted outside
+    string literals only, up to the one that closes the block, and blocks
+    are no longer cut off after 1,000 lines.
+    """
+    import re
+
+    braces = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\'|([{}])')
+    lines = content.split('\n')
+    matches = []
+    for i, line in enumerate(lines):
+        if not ('name:' in line and i + 1 < len(lines) and 'endpoint:' in lines[i + 1]):
+            continue
+        name_match = re.search(r'name:\s*"([^"]+)"', line)
+        endpoint_match = re.search(r'endpoint:\s*"([^"]+)"', lines[i + 1])
+        if not (name_match and endpoint_match):
+            continue
+        response_start = next((j for j in range(i, min(i + 20, len(lines))) if 'response:' in lines[j]), -1)
+        if response_start <= 0:
+            continue
+        brace_count = 0
+        response_lines = []
+        for j in range(response_start, len(lines)):
+            text = lines[j]
+            if not response_lines:
+                start = text.find('{', text.find('response:'))
+                if start == -1:
+                    continue
+                text = text[start:]
+            end = None
+            for brace in braces.finditer(text):
+                if brace.group(1):
+                    brace_count += 1 if brace.group(1) == '{' else -1
+                    if brace_count == 0:
+                        end = brace.end()
+                        break
+            response_lines.append(text[:end])
+            if end is not None:
+                break
+        matches.append({
+            'name': name_match.group(1),
+            'endpoint': endpoint_match.group(1),
+            'response': '\n'.join(response_lines)
+        })
+    return matches
+
+
+def bench_tokenizer(dump_file: Path):
+    """Single-pass tokenizer vs the line-based scanner it replaced, each scanning and decoding every block."""
+    from api_blocks import read_api_blocks
+    from js_literal import loads
+
+    content = dump_file.read_text(encoding='utf-8')
+
+    def decoded(apis):
+        return [(api['name'], api['endpoint'], loads(api['response'])) for api in apis if api.get('response')]
+
+    # Like for like: both sides must yield the same decoded blocks before they are timed
+    expected = decoded(read_api_blocks(dump_file))
+    assert decoded(_scan_lines(content)) == expected
+
+    for label, func in [
+        ('line-based scanner (fixed) + loads', lambda: decoded(_scan_lines(content))),
+        ('api_blocks.read_api_blocks + loads', lambda: decoded(read_api_blocks(dump_file))),
+    ]:
+        elapsed, blocks = _timeit(func)
+        peak = _peak_memory(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {len(blocks)} decoded blocks  "
+              f"{peak / 1024 / 1024:.1f} MB peak")
+    for label, func in [
+        ('line-based scanner (fixed), scan only', lambda: _scan_lines(content)),
+        ('api_blocks.read_api_blocks, scan only', lambda: read_api_blocks(dump_file)),
+    ]:
+        elapsed, _ = _timeit(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms")
+
+
+def bench_decoder(dump_file: Path):
+    """JS-literal decoder vs eval() on the largest response block."""
+    from api_blocks import read_api_blocks
+    from js_literal import loads
+
+    largest = max((api['response'] for api in read_api_blocks(dump_file)), key=len)
+    # Same block with the JS-only syntax the decoder has to rewrite
+    relaxed = largest.replace('"txnId":', 'txnId:').replace('"reference": null', '"reference": undefined')
+
+    def run_eval(text):
+        true, false, null, undefined = True, False, None, None
+        return eval(text)
+
+    # Regressions: escaped quotes inside single-quoted strings, comments
+    # between a trailing comma and its closing bracket
+    for text, expected in [
+        ("{'a': 'x\\\"y'}", {'a': 'x"y'}),
+        ("{'a': 'x\"y', 'b': 'it\\'s'}", {'a': 'x"y', 'b': "it's"}),
+        ("{'a': 'p\\\\'}", {'a': 'p\\'}),
+        ("[1, // c\n]", [1]),
+        ("{'a': 1, /* c */}", {'a': 1}),
+        ("{'a': [1, 2, /* c */ ], }", {'a': [1, 2]}),
+    ]:
+        assert loads(text) == expected, text
+        if '/' not in text:
+            assert run_eval(text) == expected, text
+
+    print(f"   Block size: {len(largest) / 1024:,.0f} KB")
+    baseline, expected = _timeit(lambda: run_eval(largest))
+    for label, func in [
+        ('eval (strict JSON block)', lambda: run_eval(largest)),
+        ('js_literal.loads (strict JSON block)', lambda: loads(largest)),
+        ('js_literal.loads (unquoted keys, undefined)', lambda: loads(relaxed)),
+    ]:
+        elapsed, result = _timeit(func)
+        assert result == expected, label
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {baseline / elapsed:5.1f}x eval")
+
+
+def bench_index(dump_file: Path):
+    """Indexed single-API fetch vs re-scanning the whole dump."""
+    from api_blocks import read_api_blocks
+    from api_index import ApiIndexReader, build_index
+    from js_literal import loads
+
+    elapsed, index = _timeit(lambda: build_index(dump_file), repeat=1)
+    print(f"   {'build_index':45s} {elapsed * 1000:9.1f} ms  {len(index['apis'])} APIs")
+
+    target = index['apis'][len(index['apis']) // 2]['name']
+
+    def full_scan():
+        api = next(api for api in read_api_blocks(dump_file) if api['name'] == target)
+        return loads(api['response'])
+
+    def indexed():
+        with ApiIndexReader(dump_file) as reader:
+            return reader.response(target)
+
+    for label, func in [('full re-scan + decode', full_scan), ('ApiIndexReader.response', indexed)]:
+        elapsed, _ = _timeit(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms")
+
+
+def bench_parallel(dump_file: Path):
+    """Serial vs process-pool decoding and field extraction."""
+    from api_blocks import read_api_blocks
+    from parse_complete_43 import extract_all_apis
+
+    # Many captures per FIP: replicate the 43 blocks to a realistic count
+    apis = [api for api in read_api_blocks(dump_file) if api['response']] * 8
+
+    def run(workers):
+        return [(api['name'], fields) for api, fields, _ in extract_all_apis(apis, workers)]
+
+    print(f"   {len(apis)} API blocks, {os.cpu_count()} CPUs")
+    baseline, expected = _timeit(lambda: run(1), repeat=1)
+    for workers in (1, 2, 4, 8):
+        elapsed, result = _timeit(lambda: run(workers), repeat=1)
+        assert result == expected, f"workers={workers} changed the merged result"
+        print(f"   {f'workers={workers}':45s} {elapsed * 1000:9.1f} ms  {baseline / elapsed:5.2f}x")
+
+
+def bench_skeleton(dump_file: Path):
+    """Skeleton scan vs full decode + recursive walk on the largest block."""
+    from api_blocks import read_api_blocks
+    from js_literal import loads
+    from parse_complete_43 import extract_all_fields_recursive
+    from skeleton import scan_skeleton
+
+    # Regression: text inside a string value must not fingerprint as a key,
+    # or the second element's shape matches the first and items.b is lost
+    paths = [field['path'] for field in scan_skeleton('{items: [{a: "q, b: 1"}, {a: "q", b: 1}]}')]
+    assert paths == ['items', 'items.a', 'items.b'], paths
+
+    largest = max((api['response'] for api in read_api_blocks(dump_file)), key=len)
+    stats = {}
+    scan_skeleton(largest, stats)
+    print(f"   Block size: {len(largest) / 1024:,.0f} KB, "
+          f"array elements scanned {stats['elements_scanned']}, skipped {stats['elements_skipped']}")
+
+    for label, func in [
+        ('loads + extract_all_fields_recursive', lambda: extract_all_fields_recursive(loads(largest))),
+        ('skeleton.scan_skeleton', lambda: scan_skeleton(largest)),
+    ]:
+        elapsed, fields = _timeit(func)
+        peak = _peak_memory(func)
+        names = len({field['name'] for field in fields})
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {names} field names  {peak / 1024:,.0f} KB peak")
+
+
+def bench_shapes(dump_file: Path):
+    """Exhaustive array coverage: shape union vs walking every element."""
+    from api_blocks import read_api_blocks
+    from js_literal import loads
+    from parse_complete_43 import extract_all_fields_recursive
+
+    # The existing walkers' record-per-field style, minus the [:3] cap
+    def walk_every_element(obj, parent='', out=None):
+        out = [] if out is None else out
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                path = f"{parent}.{key}" if parent else key
+                out.append({'name': key, 'path': path, 'type': type(value).__name__})
+                walk_every_element(value, path, out)
+        elif isinstance(obj, list):
+            for item in obj:
+                walk_every_element(item, parent, out)
+        return out
+
+    largest = loads(max((api['response'] for api in read_api_blocks(dump_file)), key=len))
+    for label, func in [
+        ('every element, no shape union',
+         lambda: {field['path'] for field in walk_every_element(largest)}),
+        ('extract_all_fields_recursive (shape union)',
+         lambda: {field['path'] for field in extract_all_fields_recursive(largest)}),
+    ]:
+        elapsed, paths = _timeit(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {len(paths)} paths")
+
+
+def bench_memo(dump_file: Path):
+    """Hash-consed shape memo vs the recursive walker across all APIs."""
+    from api_blocks import read_api_blocks
+    from js_literal import loads
+    from parse_complete_43 import extract_all_fields_recursive
+    from shape_memo import ShapeMemo
+
+    responses = [loads(api['response']) for api in read_api_blocks(dump_file) if api['response']]
+
+    def run_memo():
+        memo = ShapeMemo()
+        fields = [memo.extract(response) for response in responses]
+        return fields, memo.stats()
+
+    walker, expected = _timeit(lambda: [extract_all_fields_recursive(response) for response in responses])
+    elapsed, (fields, stats) = _timeit(run_memo)
+    assert fields == expected
+    print(f"   {'extract_all_fields_recursive':45s} {walker * 1000:9.1f} ms")
+    print(f"   {'ShapeMemo.extract':45s} {elapsed * 1000:9.1f} ms  "
+          f"{stats['shapes']} shapes, {stats['hits']:,} hits / {stats['misses']} misses")
+
+
+def bench_walker(dump_file: Path):
+    """Shared explicit-stack walker vs the per-script recursive walkers."""
+    from api_blocks import read_api_blocks
+    from array_shapes import distinct_elements
+    from field_walker import field_dicts, field_type, walk_fields
+    from js_literal import loads
+
+    # The walkers field_walker replaced: a list built and extended per level
+    def recursive_distinct(obj, parent='', depth=0, max_depth=100, occurrences=1):
+        fields = []
+        if depth > max_depth:
+            return fields
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                full_path = f"{parent}.{key}" if parent else key
+                fields.append({'name': key, 'path': full_path, 'type': field_type(value),
+                               'depth': depth, 'occurrences': occurrences})
+                if isinstance(value, dict):
+                    fields.extend(recursive_distinct(value, full_path, depth + 1, max_depth, occurrences))
+                elif isinstance(value, list) and len(value) > 0:
+                    for item, count in distinct_elements(value):
+                        fields.extend(recursive_distinct(item, full_path, depth + 1, max_depth, occurrences * count))
+        elif isinstance(obj, list) and len(obj) > 0:
+            for item, count in distinct_elements(obj):
+                fields.extend(recursive_distinct(item, parent, depth, max_depth, occurrences * count))
+        return fields
+
+    def recursive_first_item(obj, parent='', depth=0, max_depth=50):
+        fields = []
+        if depth > max_depth:
+            return fields
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                full_path = f"{parent}.{key}" if parent else key
+                fields.append({'name': key, 'path': full_path, 'type': field_type(value), 'depth': depth})
+                if isinstance(value, (dict, list)):
+                    fields.extend(recursive_first_item(value, full_path, depth + 1, max_depth))
+        elif isinstance(obj, list) and len(obj) > 0:
+            fields.extend(recursive_first_item(obj[0], parent, depth, max_depth))
+        return fields
+
+    responses = [loads(api['response']) for api in read_api_blocks(dump_file) if api['response']]
+    # A deep, narrow document where per-level list concatenation dominates
+    deep = {}
+    node = deep
+    for level in range(90):
+        node['meta'] = {'level': level, 'tags': ['a', 'b']}
+        node['child'] = {}
+        node = node['child']
+    inputs = responses + [deep] * 200
+
+    expected = [recursive_distinct(obj) for obj in inputs]
+    assert [field_dicts(obj) for obj in inputs] == expected
+
+    walkers = [
+        ('recursive, first element only (old)', lambda: [recursive_first_item(obj) for obj in inputs]),
+        ('recursive, distinct shapes (old)', lambda: [recursive_distinct(obj) for obj in inputs]),
+        ('field_walker.field_dicts', lambda: [field_dicts(obj) for obj in inputs]),
+        ('field_walker.walk_fields (tuples)', lambda: [list(walk_fields(obj)) for obj in inputs]),
+    ]
+    # Rounds interleave the walkers so machine noise hits them alike; best round wins
+    best = {label: (float('inf'), None) for label, _ in walkers}
+    for _ in range(10):
+        for label, func in walkers:
+            elapsed, fields = _timeit(func, repeat=1)
+            best[label] = min(best[label], (elapsed, fields), key=lambda timing: timing[0])
+    for label, _ in walkers:
+        elapsed, fields = best[label]
+        records = sum(map(len, fields))
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {records / elapsed / 1e6:5.2f} M records/s")
+
+
+def bench_store(dump_file: Path):
+    """Columnar FieldStore vs per-occurrence dicts for the 43-API run."""
+    from api_blocks import read_api_blocks
+    from field_store import FieldStore
+    from parse_complete_43 import categorize_api, extract_all_apis
+
+    # parse_complete_43's per-API field lists for the whole dump
+    extracted = [
+        (api['name'], api['endpoint'], categorize_api(api['endpoint']), fields)
+        for api, fields, _ in extract_all_apis(
+            [api for api in read_api_blocks(dump_file) if api['response']])
+    ]
+    # Fresh strings per API, as they come out of separate decodes
+    extracted = [
+        (name, endpoint, category, [
+            {key: (value.encode().decode() if isinstance(value, str) else value)
+             for key, value in field.items()}
+            for field in fields
+        ])
+        for name, endpoint, category, fields in extracted
+    ]
+
+    def build_dicts():
+        all_fields = {}
+        for api_name, endpoint, category, fields in extracted:
+            by_name = all_fields.setdefault(category, {})
+            for field in fields:
+                by_name.setdefault(field['name'], []).append({
+                    'api_name': api_name,
+                    'api_endpoint': endpoint,
+                    'path': field['path'],
+                    'type': field['type'],
+                    'depth': field['depth'],
+                    'occurrences': field.get('occurrences', 1)
+                })
+        return all_fields
+
+    def build_store():
+        store = FieldStore()
+        for api_name, endpoint, category, fields in extracted:
+            store.add_api(api_name, endpoint, category, fields)
+        return store
+
+    holders = {}
+    for label, func in [('per-occurrence dicts', build_dicts), ('FieldStore', build_store)]:
+        elapsed, _ = _timeit(func)
+        tracemalloc.start()
+        holders[label] = func()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {retained / 1024:,.0f} KB retained")
+
+    store, dicts = holders['FieldStore'], holders['per-occurrence dicts']
+    for category, by_name in dicts.items():
+        assert store.field_names(category) == list(by_name)
+        for name, sources in by_name.items():
+            assert store.field_sources(category, name) == sources
+    print(f"   {len(store):,} field occurrences")
+
+
+def bench_trie(dump_file: Path):
+    """Path trie node ids vs per-record path strings, and prefix queries."""
+    from api_blocks import read_api_blocks
+    from field_walker import walk_fields
+    from js_literal import loads
+    from path_trie import ROOT, PathTrie
+
+    responses = [loads(api['response']) for api in read_api_blocks(dump_file) if api['response']]
+
+    def with_strings():
+        return [list(walk_fields(response)) for response in responses]
+
+    def with_trie():
+        trie = PathTrie()
+        return trie, [list(walk_fields(response, ROOT, child=trie.child)) for response in responses]
+
+    for label, func in [('walk_fields (path strings)', with_strings), ('walk_fields (trie ids)', with_trie)]:
+        elapsed, _ = _timeit(func)
+        tracemalloc.start()
+        result = func()
+        retained = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {retained / 1024:,.0f} KB retained")
+    trie, node_records = result
+
+    records = [record for records in with_strings() for record in records]
+    prefix = 'summary'
+    node = trie.find(prefix)
+    for label, func in [
+        ('prefix query, scan all records', lambda: {path for _, path, _, _, _ in records
+                                                    if path == prefix or path.startswith(prefix + '.')}),
+        ('prefix query, PathTrie.prefix', lambda: {trie.path(node) for node in trie.prefix(prefix)}),
+        ('depth-2 paths under prefix, PathTrie.at_depth', lambda: trie.at_depth(2, node)),
+    ]:
+        elapsed, found = _timeit(func, repeat=20)
+        print(f"   {label:45s} {elapsed * 1e6:9.1f} µs  {len(found)} paths")
+
+    assert ({path for _, path, _, _, _ in records}
+            == {trie.path(node) for records in node_records for _, node, _, _, _ in records})
+
+
+def bench_xsd(dump_file: Path):
+    """Compiling every ReBIT XSD vs loading the cached compiled models."""
+    from block_cache import BlockCache
+    from xsd_compiler import COMPILER_VERSION, compile_xsd, load_compiled
+
+    # Regression: an element referenced only from a named group is not a root
+    grouped = dump_file.parent / 'grouped.xsd'
+    grouped.write_text(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+        '<xs:group name="G"><xs:choice><xs:element ref="Leaf"/></xs:choice></xs:group>'
+        '<xs:element name="Leaf" type="xs:string"/>'
+        '<xs:element name="Top"><xs:complexType><xs:group ref="G"/></xs:complexType></xs:element>'
+        '</xs:schema>', encoding='utf-8')
+    assert compile_xsd(grouped)['roots'] == ['Top']
+
+    xsd_files = sorted((Path(__file__).parent / 'rebit-schemas' / 'schemas').glob('*/*.xsd'))
+    cache = BlockCache(dump_file.parent / 'xsd-cache', version=COMPILER_VERSION)
+    for xsd_file in xsd_files:
+        load_compiled(xsd_file, cache)
+
+    print(f"   {len(xsd_files)} XSDs")
+    for label, func in [
+        ('compile_xsd (parse + resolve)', lambda: [compile_xsd(xsd_file) for xsd_file in xsd_files]),
+        ('load_compiled (content-hash cache)', lambda: [load_compiled(xsd_file, cache) for xsd_file in xsd_files]),
+    ]:
+        elapsed, models = _timeit(func)
+        fields = sum(len(model['fields']) for model in models)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {fields} fields")
+
+
+def _compile_data_points(xsd_file: Path, fi_type: str):
+    # Module-level so schema-loading workers can unpickle it
+    from xsd_compiler import compile_xsd
+    return {'attributes': compile_xsd(xsd_file)['fields']}
+
+
+def bench_schemas(dump_file: Path):
+    """Serial vs process-pool loading of every ReBIT FI-type directory."""
+    from rebit_loader import load_rebit_data
+
+    rebit_dir = Path(__file__).parent / 'rebit-schemas' / 'schemas'
+    print(f"   {os.cpu_count()} CPUs")
+    baseline, (expected, timings) = _timeit(lambda: load_rebit_data(rebit_dir, _compile_data_points, workers=1))
+    for workers in (1, 2, 4, None):
+        elapsed, (rebit_data, _) = _timeit(lambda: load_rebit_data(rebit_dir, _compile_data_points, workers))
+        assert rebit_data == expected, f"workers={workers} changed the merged result"
+        label = f"workers={workers or 'default'}"
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {baseline / elapsed:5.2f}x  {len(timings)} files")
+
+
+def bench_validator(dump_file: Path):
+    """Streaming XML validation throughput on the ReBIT sample instances."""
+    from xml_validator import load_validators, validate_many
+
+    rebit_dir = Path(__file__).parent / 'rebit-schemas' / 'schemas'
+    validators = load_validators(rebit_dir)
+    samples = [path.read_bytes() for path in sorted(rebit_dir.glob('*/*.xml'))]
+    documents = samples * 200
+
+    # One large statement: the deposit sample with 20,000 transactions
+    deposit = (rebit_dir / 'deposit' / 'Deposit.xml').read_bytes()
+    start = deposit.index(b'<Transaction ')
+    end = deposit.index(b'/>', start) + 2
+    statement = deposit[:start] + deposit[start:end] * 20000 + deposit[end:]
+
+    def run(docs, workers=1):
+        return [errors for _, _, errors in validate_many(docs, validators, workers)]
+
+    for label, docs, workers in [
+        (f'{len(documents):,} sample documents', documents, 1),
+        (f'{len(documents):,} sample documents, 4 workers', documents, 4),
+    ]:
+        elapsed, results = _timeit(lambda: run(docs, workers), repeat=1)
+        assert not any(results)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {len(docs) / elapsed:,.0f} docs/s")
+
+    elapsed, results = _timeit(lambda: run([statement]), repeat=1)
+    peak = _peak_memory(lambda: run([statement]))
+    print(f"   {'deposit statement, 20,000 transactions':45s} {elapsed * 1000:9.1f} ms  "
+          f"{len(statement) / 1024 / 1024:.1f} MB, {peak / 1024:,.0f} KB peak, {len(results[0])} errors")
+
+
+def bench_conformance(dump_file: Path):
+    """Value conformance: per-value regex compile vs precompiled lookup tables."""
+    import re
+
+    import js_literal
+    from api_blocks import read_api_blocks
+    from conformance import build_value_tables, check_response
+    from categorizer import categorize_api
+
+    tables = build_value_tables(Path(__file__).parent / 'rebit-schemas' / 'schemas')
+    responses = [(tables[categorize_api(api['endpoint'])], js_literal.loads(api['response']))
+                 for api in read_api_blocks(dump_file) if categorize_api(api['endpoint']) in tables]
+
+    def naive(table, obj):
+        # Every occurrence re-walks the declarations and compiles their patterns
+        violations = 0
+        stack = [obj]
+        while stack:
+            value = stack.pop()
+            items = value.items() if isinstance(value, dict) else (('', item) for item in value)
+            for key, child in items:
+                if isinstance(child, (dict, list)):
+                    stack.append(child)
+                elif key in table and isinstance(child, (str, int, float)) and not isinstance(child, bool):
+                    text = str(child)
+                    for _, check in table.by_name[key]:
+                        if check.enumerations is not None and text not in list(check.enumerations):
+                            violations += 1
+                        elif check.pattern is not None and not re.fullmatch(check.pattern.__self__.pattern, text):
+                            violations += 1
+        return violations
+
+    values = sum(sum(result['checked'] for result in check_response(obj, table).values())
+                 for table, obj in responses)
+    print(f"   {len(responses)} responses, {values:,} constrained values")
+    for label, func in [
+        ('per-value scan, re.fullmatch each value', lambda: [naive(table, obj) for table, obj in responses]),
+        ('value counts + lookup tables', lambda: [check_response(obj, table) for table, obj in responses]),
+    ]:
+        elapsed, _ = _timeit(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms")
+
+
+def bench_coverage(dump_file: Path):
+    """Streaming XML path coverage: memory on a large statement, directory fan-out."""
+    from xml_coverage import load_declarations, scan_statement, scan_statements
+
+    rebit_dir = Path(__file__).parent / 'rebit-schemas' / 'schemas'
+    declarations = load_declarations(rebit_dir)
+
+    # Regression: an element whose only content is its children counts as populated,
+    # although the children are detached by the time its end tag is seen
+    _, counts, _ = scan_statement(b'<A><B><C v="1"/></B></A>', {None: ('test', {})})
+    assert all(populated for _, populated in counts) and len(counts) == 4, counts
+
+    deposit = (rebit_dir / 'deposit' / 'Deposit.xml').read_bytes()
+    _, counts, _ = scan_statement(deposit, declarations)
+    assert counts[('Account.Profile', True)] and not counts[('Account.Profile', False)], counts
+    start = deposit.index(b'<Transaction ')
+    end = deposit.index(b'/>', start) + 2
+    for transactions in (2000, 20000):
+        statement = deposit[:start] + deposit[start:end] * transactions + deposit[end:]
+        elapsed, (_, counts, elements) = _timeit(lambda: scan_statement(statement, declarations), repeat=1)
+        peak = _peak_memory(lambda: scan_statement(statement, declarations))
+        print(f"   {f'deposit statement, {transactions:,} transactions':45s} {elapsed * 1000:9.1f} ms  "
+              f"{len(statement) / 1024 / 1024:.1f} MB, {peak / 1024:,.0f} KB peak, {elements:,} elements")
+
+    statements = dump_file.parent / 'statements'
+    statements.mkdir(exist_ok=True)
+    samples = sorted(rebit_dir.glob('*/*.xml'))
+    for i in range(400):
+        sample = samples[i % len(samples)]
+        (statements / f"{i:04d}-{sample.name}").write_bytes(sample.read_bytes())
+    paths = sorted(statements.glob('*.xml'))
+    print(f"   {os.cpu_count()} CPUs")
+    for workers in (1, 4):
+        elapsed, scanned = _timeit(lambda: scan_statements(paths, declarations, workers), repeat=1)
+        documents = sum(totals['documents'] for fi_type, totals in scanned.items() if fi_type is not None)
+        print(f"   {f'{len(paths)} statements, workers={workers}':45s} {elapsed * 1000:9.1f} ms  {documents} scanned")
+
+
+def bench_specs(dump_file: Path):
+    """OpenAPI spec indexing: SafeLoader vs CSafeLoader vs the on-disk index cache."""
+    import yaml
+
+    import spec_index
+    from block_cache import BlockCache
+
+    spec_files = sorted(spec_index.DEFAULT_SPECS_DIR.glob('*.yaml'))
+    cache = BlockCache(dump_file.parent / 'spec-cache', version=spec_index.SPEC_INDEX_VERSION)
+    for spec_file in spec_files:
+        spec_index.load_spec_index(spec_file, cache)
+
+    default_loader = spec_index.SpecLoader
+
+    def build_with(loader):
+        spec_index.SpecLoader = loader
+        try:
+            return [spec_index.build_spec_index(spec_file) for spec_file in spec_files]
+        finally:
+            spec_index.SpecLoader = default_loader
+
+    print(f"   {len(spec_files)} specs, {sum(spec_file.stat().st_size for spec_file in spec_files) / 1024:.0f} KB")
+    for label, func in [
+        ('yaml.SafeLoader (pure Python)', lambda: build_with(yaml.SafeLoader)),
+        (f'yaml.{default_loader.__name__}', lambda: build_with(default_loader)),
+        ('load_spec_index (content-hash cache)',
+         lambda: [spec_index.load_spec_index(spec_file, cache) for spec_file in spec_files]),
+    ]:
+        elapsed, indexes = _timeit(func)
+        endpoints = sum(len(index['endpoints']) for index in indexes)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms  {endpoints} endpoints")
+
+
+def bench_routes(dump_file: Path, n_urls=1_000_000):
+    """Route matching of 1M synthetic URLs: regex per template vs RouteTrie."""
+    import random
+    import re
+
+    from route_trie import RouteTrie, _segments, routes_from_postman, routes_from_specs
+    from spec_index import load_spec_indexes
+
+    routes = list(routes_from_postman(Path(__file__).parent / 'postman.json'))
+    routes += routes_from_specs(load_spec_indexes())
+    # Internal routing rules: 20 services x 10 resources with ids and a static-file wildcard
+    routes += [(None, f'/svc{s}/v1/res{r}/{{id}}/detail', f'svc{s}.res{r}') for s in range(20) for r in range(10)]
+    routes += [(None, f'/svc{s}/static/*', f'svc{s}.static') for s in range(20)]
+    trie = RouteTrie(routes)
+
+    rng = random.Random(0)
+    urls = []
+    for i in range(n_urls):
+        kind = i % 4
+        if kind == 0:
+            urls.append(f'https://api.example.com/svc{rng.randrange(20)}/v1/res{rng.randrange(10)}/{rng.getrandbits(48):x}/detail')
+        elif kind == 1:
+            urls.append(f'/svc{rng.randrange(20)}/static/js/{rng.randrange(1000)}.js')
+        elif kind == 2:
+            urls.append(f'/Consent/{rng.getrandbits(64):x}?fipid=fip{rng.randrange(9)}')
+        else:
+            urls.append(f'/pfm/api/v2/deposit/user-account-statement?page={rng.randrange(50)}')
+
+    def to_regex(template):
+        parts = []
+        for segment in _segments(template):
+            if segment == '*':
+                parts.append('(?:/.*)?')
+                break
+            is_param = segment[0] in '{:'
+            parts.append('/[^/]+' if is_param else '/' + re.escape(segment))
+        return re.compile(''.join(parts) + '/?')
+
+    compiled = [(to_regex(template), operation_id) for _, template, operation_id in routes]
+
+    def linear(url):
+        path = '/' + '/'.join(_segments(url))
+        for pattern, operation_id in compiled:
+            if pattern.fullmatch(path):
+                return operation_id
+        return None
+
+    sample = urls[:n_urls // 20]
+    print(f"   {len(routes)} templates, {n_urls:,} URLs")
+    elapsed, expected = _timeit(lambda: [linear(url) for url in sample], repeat=1)
+    print(f"   {f'regex per template ({len(sample):,} URL sample)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{len(sample) / elapsed:,.0f} URLs/s, ~{elapsed * n_urls / len(sample):.1f} s for {n_urls:,}")
+    elapsed, matches = _timeit(lambda: [trie.match(url) for url in urls], repeat=1)
+    print(f"   {'RouteTrie.match':45s} {elapsed * 1000:9.1f} ms  {n_urls / elapsed:,.0f} URLs/s")
+    assert [match.operation_id if match else None for match in matches[:len(sample)]] == expected
+    assert all(matches)
+
+
+def bench_categorizer(dump_file: Path, n_endpoints=2_000_000):
+    """Endpoint categorization: ordered substring rules vs compiled scan vs memoized."""
+    import random
+
+    from categorizer import Categorizer
+    from route_trie import routes_from_postman
+
+    categorizer = Categorizer.from_file()
+    rules = [(rule['category'], [needle.lower() for needle in rule['contains']],
+              [needle.lower() for needle in rule.get('unless', ())]) for rule in categorizer.rules]
+
+    def linear(endpoint):
+        endpoint_lower = endpoint.lower()
+        for category, needles, vetoes in rules:
+            if any(needle in endpoint_lower for needle in needles) and not any(veto in endpoint_lower for veto in vetoes):
+                return category
+        return categorizer.default
+
+    # Logged traffic: the postman endpoints, repeated with a few hundred account refs
+    templates = [template.replace('{{baseUrl}}', '') for _, template, _ in
+                 routes_from_postman(Path(__file__).parent / 'postman.json')]
+    rng = random.Random(0)
+    endpoints = [f"{rng.choice(templates)}?accountRef=acc-{rng.randrange(500)}" for _ in range(n_endpoints)]
+    sample = endpoints[:n_endpoints // 10]
+
+    print(f"   {len(rules)} rules, {n_endpoints:,} endpoints, {len(set(endpoints)):,} distinct")
+    elapsed, expected = _timeit(lambda: [linear(endpoint) for endpoint in sample], repeat=1)
+    print(f"   {f'ordered substring rules ({len(sample):,} sample)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{len(sample) / elapsed:,.0f} endpoints/s")
+    elapsed, compiled = _timeit(lambda: [categorizer._categorize(endpoint) for endpoint in sample], repeat=1)
+    assert compiled == expected
+    print(f"   {f'compiled scan, uncached ({len(sample):,} sample)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{len(sample) / elapsed:,.0f} endpoints/s")
+    categorize = categorizer.categorize
+    elapsed, _ = _timeit(lambda: [categorize(endpoint) for endpoint in endpoints], repeat=1)
+    info = categorize.cache_info()
+    print(f"   {'Categorizer.categorize (LRU memo)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{n_endpoints / elapsed:,.0f} endpoints/s, {info.hits / (info.hits + info.misses) * 100:.1f}% hits")
+
+
+def bench_templates(dump_file: Path, n_calls=100_000):
+    """Endpoint normalization of 100k captured calls: uncached vs LRU-memoized templates."""
+    import random
+    import uuid
+
+    from endpoint_templates import EndpointNormalizer
+
+    rng = random.Random(0)
+    fi_paths = ['deposit', 'term-deposit', 'recurring-deposit', 'mutual-fund', 'equities', 'etf', 'nps']
+    calls = []
+    for i in range(n_calls):
+        fi_path = rng.choice(fi_paths)
+        kind = i % 3
+        if kind == 0:
+            calls.append(f'/pfm/api/v2/{fi_path}/acc-{rng.randrange(2000)}/account-statement?page={rng.randrange(20)}')
+        elif kind == 1:
+            calls.append(f'/pfm/api/v2/{fi_path}/consent/{uuid.UUID(int=rng.getrandbits(128))}')
+        else:
+            calls.append(f'/pfm/api/v2/{fi_path}/insights/2024-{rng.randrange(1, 13):02d}-01?from=2024-01-01')
+
+    normalizer = EndpointNormalizer()
+    # Regression: an 8-digit id starting with 19/20 is not a compact date
+    assert normalizer._normalize('/accounts/20481234') == '/accounts/{id}'
+    assert normalizer._normalize('/insights/20240131') == '/insights/{date}'
+    print(f"   {n_calls:,} calls, {len(set(calls)):,} distinct endpoints")
+    elapsed, expected = _timeit(lambda: [normalizer._normalize(call) for call in calls], repeat=1)
+    print(f"   {'normalize, uncached':45s} {elapsed * 1000:9.1f} ms  {n_calls / elapsed:,.0f} calls/s")
+    elapsed, templates = _timeit(lambda: [normalizer.normalize(call) for call in calls])
+    assert templates == expected
+    info = normalizer.normalize.cache_info()
+    print(f"   {'EndpointNormalizer.normalize (LRU memo)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{n_calls / elapsed:,.0f} calls/s, {len(set(templates))} templates, {info.currsize:,} cached")
+
+
+def bench_semantic(dump_file: Path, n_occurrences=100_000):
+    """Canonical names for 100k field occurrences: per-call abbreviation scan vs compiled table."""
+    import random
+
+    from parse_schemas_enhanced import load_semantic_matcher
+
+    matcher = load_semantic_matcher()
+    abbreviations = matcher.mappings.get('abbreviation_expansions', {})
+
+    def scan(field_name):
+        # The per-call lookup: direct probe, then every abbreviation tried in turn
+        normalized = matcher._normalize(field_name)
+        if normalized in matcher.field_to_canonical:
+            return matcher.field_to_canonical[normalized]
+        for abbr, expansion in abbreviations.items():
+            if abbr in normalized:
+                expanded = normalized.replace(abbr, expansion.lower())
+                if expanded in matcher.field_to_canonical:
+                    return matcher.field_to_canonical[expanded]
+        return field_name
+
+    rng = random.Random(0)
+    known = sorted(matcher.field_to_canonical.values())
+    tokens = ['Id', 'Type', 'Date', 'Amount', 'Number', 'Value', 'Name', 'Ref', 'Status']
+    vocabulary = known + [rng.choice(sorted(abbreviations)) + rng.choice(tokens) for _ in range(300)]
+    occurrences = [rng.choice(vocabulary) for _ in range(n_occurrences)]
+
+    print(f"   {n_occurrences:,} occurrences, {len(set(occurrences))} distinct names, "
+          f"{len(matcher.expanded_to_canonical)} precomputed spellings")
+    for label, func in [
+        ('per-occurrence abbreviation scan', lambda: [scan(name) for name in occurrences]),
+        ('canonicalize_many (fresh matcher)', lambda: load_semantic_matcher().canonicalize_many(occurrences)),
+    ]:
+        elapsed, _ = _timeit(func)
+        print(f"   {label:45s} {elapsed * 1000:9.1f} ms")
+
+
+def bench_equivalence(dump_file: Path, n_groups=5000, n_pairs=20_000):
+    """Pairwise equivalence checks against 5,000 groups: linear group scan vs union-find ids."""
+    import random
+
+    from parse_schemas_enhanced import load_semantic_matcher
+
+    rng = random.Random(0)
+    matcher = load_semantic_matcher()
+    groups = [[f'field{g}v{v}' for v in range(rng.randrange(2, 5))] for g in range(n_groups)]
+    # Some groups overlap, so equivalence has to be closed transitively
+    for _ in range(n_groups // 10):
+        rng.choice(groups).append(rng.choice(rng.choice(groups)))
+    matcher.mappings['semantic_equivalents']['same_meaning_different_names'] = groups
+    elapsed, _ = _timeit(matcher._build_equivalence_groups, repeat=1)
+
+    names = [name for group in groups for name in group]
+    pairs = [(rng.choice(names), rng.choice(names)) for _ in range(n_pairs)]
+
+    def linear(field1, field2):
+        for group in groups:
+            if field1 in group and field2 in group:
+                return True
+        return False
+
+    print(f"   {n_groups:,} groups, {len(matcher.group_representatives):,} after merging, "
+          f"built in {elapsed * 1000:.1f} ms; {n_pairs:,} pairs")
+    elapsed, direct = _timeit(lambda: [linear(a, b) for a, b in pairs[:n_pairs // 20]], repeat=1)
+    print(f"   {f'linear group scan ({n_pairs // 20:,} pair sample)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{n_pairs // 20 / elapsed:,.0f} pairs/s")
+    group = matcher.equivalence_group
+    elapsed, merged = _timeit(lambda: [group.get(a) == group.get(b) for a, b in pairs])
+    assert all(merged[i] for i, value in enumerate(direct) if value)
+    elapsed, _ = _timeit(lambda: [matcher.are_equivalent(a, b) for a, b in pairs])
+    print(f"   {'are_equivalent (group ids)':45s} {elapsed * 1000:9.1f} ms  {n_pairs / elapsed:,.0f} pairs/s")
+
+
+def bench_fuzzy(dump_file: Path, n_fields=20_000):
+    """Fuzzy candidates for 20k x 20k field names: pairwise Python scoring vs blocked TF-IDF."""
+    import random
+
+    from fuzzy_match import FuzzyMatcher
+    from parse_schemas_enhanced import load_semantic_matcher
+
+    rng = random.Random(0)
+    matcher = load_semantic_matcher()
+    abbreviations = sorted(matcher.mappings.get('abbreviation_expansions', {}))
+    syllables = ['ba', 'ce', 'di', 'fo', 'gu', 'ka', 'le', 'mi', 'no', 'pu', 'ra', 'se', 'ti', 'vo']
+    words = abbreviations + [''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))) for _ in range(3000)]
+    # Zipf-like word frequencies, as in real schemas ('amount' is everywhere, 'fatca' is not)
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+
+    def field_name():
+        parts = rng.choices(words, weights, k=rng.randint(1, 4))
+        return parts[0] + ''.join(part.capitalize() for part in parts[1:])
+
+    left = [field_name() for _ in range(n_fields)]
+    right = [field_name() for _ in range(n_fields)]
+    sample = left[:50]
+    print(f"   {len(set(left)):,} x {len(set(right)):,} distinct names")
+
+    elapsed, _ = _timeit(lambda: [[matcher.get_similarity_score(a, b) for b in right] for a in sample], repeat=1)
+    print(f"   {f'pairwise get_similarity_score ({len(sample)} rows)':45s} {elapsed * 1000:9.1f} ms  "
+          f"~{elapsed * len(set(left)) / len(sample):,.0f} s for all rows")
+    fuzzy = FuzzyMatcher.from_semantic_matcher(matcher)
+    elapsed, candidates = _timeit(lambda: fuzzy.top_k(left, right, k=5), repeat=1)
+    peak = _peak_memory(lambda: FuzzyMatcher.from_semantic_matcher(matcher).top_k(left, right, k=5))
+    print(f"   {'FuzzyMatcher.top_k (all rows)':45s} {elapsed * 1000:9.1f} ms  "
+          f"{len(candidates):,} names with candidates, peak {peak / 1e6:.0f} MB")
+
+
+def bench_assignment(dump_file: Path, size=5000):
+    """One-to-one assignment on 5,000 x 5,000 similarity matrices: dense LSA vs component-wise solving."""
+    import numpy as np
+    from scipy import sparse
+    from scipy.optimize import linear_sum_assignment
+
+    from field_assignment import DEFAULT_TIME_BUDGET, assign
+
+    rng = np.random.default_rng(0)
+    cases = [
+        # Blocked similarity: many small clusters of related names
+        ('clustered', sparse.block_diag([
+            sparse.random(25, 25, density=0.4, random_state=rng) for _ in range(size // 25)], format='csr')),
+        ('random, 10 per row', sparse.random(size, size, density=10 / size, random_state=rng, format='csr')),
+        ('dense', rng.random((size, size))),
+    ]
+    threshold = 0.3
+    print(f"   {size:,} x {size:,}, threshold {threshold}, budget {DEFAULT_TIME_BUDGET:.0f} s")
+    for label, weights in cases:
+        dense = weights.toarray() if sparse.issparse(weights) else weights
+        dense = np.where(dense >= threshold, dense, 0)
+        elapsed, (rows, cols) = _timeit(lambda: linear_sum_assignment(dense, maximize=True), repeat=1)
+        optimum = dense[rows, cols].sum()
+        print(f"   {f'{label}: linear_sum_assignment':45s} {elapsed * 1000:9.1f} ms  weight {optimum:,.1f}")
+        elapsed, (pairs, stats) = _timeit(lambda: assign(weights, threshold), repeat=1)
+        print(f"   {f'{label}: assign':45s} {elapsed * 1000:9.1f} ms  weight "
+              f"{sum(weight for _, _, weight in pairs):,.1f}, {stats['components']:,} components, "
+              f"{stats['greedy']} greedy ({stats['truncated']} cut short)")
+
+
+BENCHMARKS = {
+    'tokenizer': bench_tokenizer,
+    'decoder': bench_decoder,
+    'index': bench_index,
+    'parallel': bench_parallel,
+    'skeleton': bench_skeleton,
+    'shapes': bench_shapes,
+    'memo': bench_memo,
+    'walker': bench_walker,
+    'store': bench_store,
+    'trie': bench_trie,
+    'xsd': bench_xsd,
+    'schemas': bench_schemas,
+    'validator': bench_validator,
+    'conformance': bench_conformance,
+    'coverage': bench_coverage,
+    'specs': bench_specs,
+    'routes': bench_routes,
+    'categorizer': bench_categorizer,
+    'templates': bench_templates,
+    'semantic': bench_semantic,
+    'equivalence': bench_equivalence,
+    'fuzzy': bench_fuzzy,
+    'assignment': bench_assignment,
+}
+
+
+def main():
+    names = sys.argv[1:] or list(BENCHMARKS)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dump_file = Path(tmp) / 'apiResonse.json'
+        dump_file.write_text(make_synthetic_dump(), encoding='utf-8')
+        print(f"📦 Synthetic dump: {dump_file.stat().st_size / 1024 / 1024:.1f} MB")
+
+        for name in names:
+            print(f"\n⏱️  {name}: {BENCHMARKS[name].__doc__}")
+            BENCHMARKS[name](dump_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Content-hash cache for incremental re-ingestion of API blocks.
+
+Each extracted block's raw response text is hashed together with an
+extractor version; the decoded field list for that hash is stored on disk,
+so a re-run only decodes blocks that are new or changed. A manifest of the
+previous run's per-API shapes lets us report which APIs changed shape.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+MANIFEST_FILE = 'manifest.json'
+
+
+class BlockCache:
+    """On-disk map of block content hash -> extracted field list."""
+
+    def __init__(self, cache_dir: Path, version: str = 'v1'):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, text: str) -> str:
+        """Hash of a block's raw text under this extractor version."""
+        digest = hashlib.blake2b(self.version.encode('utf-8'), digest_size=20)
+        digest.update(text.encode('utf-8'))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Cached fields for a hash, or None on a miss."""
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                fields = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fields
+
+    def put(self, key: str, fields: List[Dict]):
+        """Store fields for a hash (atomic rename, safe across processes)."""
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(fields, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def diff_shapes(self, shapes: Dict[str, List[Dict]]) -> Dict:
+        """
+        Compare this run's per-API fields with the previous run's manifest,
+        then record this run as the new manifest.
+
+        `shapes` maps an API key (e.g. "name endpoint") to its field list.
+        Returns {'added_apis', 'removed_apis', 'changed': {api: {'added', 'removed'}}}.
+        """
+        manifest_path = self.cache_dir / MANIFEST_FILE
+        previous = {}
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)
+
+        current = {
+            api: sorted({f"{field['path']}:{field['type']}" for field in fields})
+            for api, fields in shapes.items()
+        }
+
+        report = {
+            'first_run': not previous,
+            'added_apis': sorted(set(current) - set(previous)),
+            'removed_apis': sorted(set(previous) - set(current)),
+            'changed': {}
+        }
+        for api in sorted(set(current) & set(previous)):
+            before, after = set(previous[api]), set(current[api])
+            if before != after:
+                report['changed'][api] = {
+                    'added': sorted(after - before),
+                    'removed': sorted(before - after)
+                }
+
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+
+        return report
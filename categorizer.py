@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Rule-driven API categorization.
+
+Categories come from an ordered rule file (category_rules.json): each
+rule names a category, the substrings that select it and optional
+substrings that veto it, and the first matching rule wins. All
+substrings are compiled into one regex alternation listed in rule order,
+so each search over the lowercased endpoint reports the highest-priority
+substring starting at the next matching position; the best of those is
+the endpoint's category. Results are memoized per endpoint in a
+bounded LRU.
+"""
+
+import json
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_RULES_FILE = Path(__file__).parent / 'category_rules.json'
+
+
+class Categorizer:
+    """Compiled ordered category rules; `categorize(endpoint)` is memoized."""
+
+    def __init__(self, rules: List[Dict], default: str = 'other', cache_size: int = 1 << 16):
+        self.rules = rules
+        self.default = default
+        self.fi_types = frozenset(rule['category'] for rule in rules if rule.get('fi_type'))
+
+        # substring -> index of the first rule listing it
+        priorities = {}
+        for index, rule in enumerate(rules):
+            for needle in rule['contains']:
+                priorities.setdefault(needle.lower(), index)
+        self._priorities = priorities
+        self._vetoes = [tuple(needle.lower() for needle in rule.get('unless', ())) for rule in rules]
+        # Alternatives in priority order: at each position the best rule's substring matches first
+        needles = sorted(priorities, key=lambda needle: (priorities[needle], -len(needle)))
+        self._search = re.compile('|'.join(map(re.escape, needles))).search
+        self.categorize = lru_cache(maxsize=cache_size)(self._categorize)
+
+    @classmethod
+    def from_file(cls, rules_file: Path = DEFAULT_RULES_FILE, **kwargs) -> 'Categorizer':
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+        return cls(config['rules'], config.get('default', 'other'), **kwargs)
+
+    def _categorize(self, endpoint: str) -> str:
+        endpoint_lower = endpoint.lower()
+        priorities = self._priorities
+        search = self._search
+        best = None
+        # Restart one character past each hit so overlapping substrings are seen too
+        match = search(endpoint_lower)
+        while match is not None:
+            priority = priorities[match.group()]
+            if best is None or priority < best:
+                best = priority
+                if best == 0:
+                    break
+            match = search(endpoint_lower, match.start() + 1)
+        if best is None:
+            return self.default
+        if not self._vetoed(best, endpoint_lower):
+            return self.rules[best]['category']
+        # Vetoed: later rules may have been shadowed at the same position, so check them in order
+        for index in range(best + 1, len(self.rules)):
+            if (any(needle.lower() in endpoint_lower for needle in self.rules[index]['contains'])
+                    and not self._vetoed(index, endpoint_lower)):
+                return self.rules[index]['category']
+        return self.default
+
+    def _vetoed(self, index: int, endpoint_lower: str) -> bool:
+        return any(veto in endpoint_lower for veto in self._vetoes[index])
+
+    def fi_type(self, endpoint: str) -> Optional[str]:
+        """The endpoint's category when it is an FI type, else None."""
+        category = self.categorize(endpoint)
+        return category if category in self.fi_types else None
+
+
+_DEFAULT = None
+
+
+def default_categorizer() -> Categorizer:
+    """The categorizer for category_rules.json, built on first use."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = Categorizer.from_file()
+    return _DEFAULT
+
+
+def categorize_api(endpoint: str) -> str:
+    """Categorize API by endpoint."""
+    return default_categorizer().categorize(endpoint)
+
+
+def main():
+    """Categorize endpoints given as arguments (default: the postman collection)."""
+    from route_trie import routes_from_postman
+
+    endpoints = sys.argv[1:] or [template for _, template, _ in
+                                 routes_from_postman(Path(__file__).parent / 'postman.json')]
+    categorizer = default_categorizer()
+    print(f"📖 {len(categorizer.rules)} rules from {DEFAULT_RULES_FILE.name}")
+    for endpoint in endpoints:
+        print(f"   {categorizer.categorize(endpoint):25s} {endpoint}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Value-level conformance of FinFactor responses against ReBIT value sets.
+
+The compiled XSDs are turned into per-FI-type lookup tables: for every
+constrained field name, the enumeration frozenset, anchored pattern and
+numeric bounds of each declaration (see xml_validator.ValueCheck),
+compiled once. A conformance pass gathers every scalar value of each
+decoded response into per-path value counts, then checks each distinct
+value once against the table, so a field with thousands of repeated
+values costs one set probe or regex match per distinct value.
+
+Fields are matched by name; when a name is declared under several
+elements (e.g. `type` on Summary and Transaction) the declaration whose
+parent element matches the JSON parent key is preferred.
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import js_literal
+from api_blocks import read_api_blocks
+from categorizer import categorize_api
+from xml_validator import ValueCheck
+from xsd_compiler import load_compiled
+
+
+def _parent_hint(name: str) -> str:
+    """Normalize an element or JSON key for parent matching: 'Holders' -> 'holder'."""
+    return name.lower().rstrip('s')
+
+
+class ValueTable:
+    """Constrained fields of one FI type: name -> [(parent hint, check)]."""
+
+    def __init__(self, fields: List[Dict]):
+        self.by_name = {}
+        for field in fields:
+            if field['kind'] != 'attribute' and field['base'] == 'object':
+                continue
+            check = ValueCheck(field, lexical=False)
+            if check.enumerations is None and check.pattern is None and not check.bounds:
+                continue
+            parent = field['path'].rpartition('.')[0].rpartition('.')[2]
+            self.by_name.setdefault(field['name'], []).append((_parent_hint(parent), check))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.by_name
+
+    def __len__(self):
+        return len(self.by_name)
+
+    def checks_for(self, name: str, parent: str) -> List[ValueCheck]:
+        candidates = self.by_name.get(name, ())
+        hint = _parent_hint(parent)
+        matching = [check for candidate_hint, check in candidates if candidate_hint == hint]
+        return matching or [check for _, check in candidates]
+
+    def enumerations(self) -> Dict[str, frozenset]:
+        """Field name -> union of its enumerated values, for reporting."""
+        return {
+            name: frozenset().union(*(check.enumerations for _, check in candidates if check.enumerations))
+            for name, candidates in self.by_name.items()
+        }
+
+
+def build_value_tables(rebit_dir: Path) -> Dict[str, ValueTable]:
+    """One ValueTable per FI-type directory."""
+    tables = {}
+    for schema_dir in sorted(path for path in Path(rebit_dir).iterdir() if path.is_dir()):
+        fields = []
+        for xsd_file in sorted(schema_dir.glob('*.xsd')):
+            fields.extend(load_compiled(xsd_file)['fields'])
+        if fields:
+            tables[schema_dir.name] = ValueTable(fields)
+    return tables
+
+
+def collect_values(obj, table: ValueTable) -> Dict[str, Counter]:
+    """
+    Counts of every scalar value of a decoded response, per dotted path,
+    for field names the table constrains. All array elements are visited.
+    """
+    values = {}
+    # Frames are (container, path prefix)
+    stack = [(obj, '')]
+    while stack:
+        value, prefix = stack.pop()
+        if isinstance(value, dict):
+            for key, child in value.items():
+                if isinstance(child, (dict, list)):
+                    stack.append((child, prefix + key + '.'))
+                elif key in table and child is not None and not isinstance(child, bool):
+                    path = prefix + key
+                    counts = values.get(path)
+                    if counts is None:
+                        counts = values[path] = Counter()
+                    counts[child] += 1
+        elif isinstance(value, list):
+            for item in value:
+                if isinstance(item, (dict, list)):
+                    stack.append((item, prefix))
+    return values
+
+
+def _conforms(checks: List[ValueCheck], value) -> Optional[str]:
+    """None if any declaration accepts the value, else the first error."""
+    error = None
+    text = value if isinstance(value, str) else str(value)
+    for check in checks:
+        try:
+            message = check.check(text)
+        except ValueError:
+            # Lexical checks are off, so bounds may see a non-numeric string
+            message = f"{text!r} is not a valid {check.base}"
+        if message is None:
+            return None
+        error = error or message
+    return error
+
+
+def check_response(obj, table: ValueTable, samples: int = 3) -> Dict[str, Dict]:
+    """Per-path {'checked', 'violations', 'distinct', 'samples'} for one response."""
+    report = {}
+    for path, counts in collect_values(obj, table).items():
+        parts = path.split('.')
+        name = parts[-1]
+        parent = parts[-2] if len(parts) > 1 else ''
+        checks = table.checks_for(name, parent)
+
+        bad = {}
+        for value, count in counts.items():
+            message = _conforms(checks, value)
+            if message is not None:
+                bad[value] = (count, message)
+
+        report[path] = {
+            'checked': sum(counts.values()),
+            'distinct': len(counts),
+            'violations': sum(count for count, _ in bad.values()),
+            'samples': [f"{value!r}: {message}" for value, (_, message) in list(bad.items())[:samples]]
+        }
+    return report
+
+
+def conformance_pass(apis: List[Dict], tables: Dict[str, ValueTable],
+                     categorize) -> Tuple[Dict, Dict]:
+    """
+    Check every API whose category has a value table.
+    Returns (per-API reports, per-field totals keyed by 'category:path').
+    """
+    per_api = {}
+    per_field = {}
+    for api in apis:
+        table = tables.get(categorize(api['endpoint']))
+        if table is None or not api['response']:
+            continue
+        try:
+            response = js_literal.loads(api['response'])
+        except js_literal.JSLiteralError:
+            continue
+
+        report = check_response(response, table)
+        per_api[f"{api['name']} {api['endpoint']}"] = report
+        for path, result in report.items():
+            totals = per_field.setdefault(f"{categorize(api['endpoint'])}:{path}",
+                                          {'checked': 0, 'violations': 0, 'apis': 0})
+            totals['checked'] += result['checked']
+            totals['violations'] += result['violations']
+            totals['apis'] += 1
+    return per_api, per_field
+
+
+def main():
+    base_dir = Path(__file__).parent
+    api_file = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'finfactor' / 'apiResonse.json'
+
+    tables = build_value_tables(base_dir / 'rebit-schemas' / 'schemas')
+    print(f"📖 Value tables for {len(tables)} FI types, "
+          f"{sum(len(table) for table in tables.values())} constrained fields")
+
+    apis = read_api_blocks(api_file)
+    per_api, per_field = conformance_pass(apis, tables, categorize_api)
+
+    print(f"\n🔬 Checked {len(per_api)} APIs")
+    for field, totals in sorted(per_field.items(), key=lambda item: -item[1]['violations']):
+        status = '❌' if totals['violations'] else '✅'
+        print(f"   {status} {field}: {totals['violations']:,} / {totals['checked']:,} values "
+              f"violate the schema ({totals['apis']} APIs)")
+
+    output_file = base_dir / 'conformance_report.json'
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({'fields': per_field, 'apis': per_api}, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Saved to: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Endpoint normalization into route templates.
+
+Captured endpoints carry account refs, consent handles, UUIDs, dates and
+pagination query strings, so every call looks like a different API.
+EndpointNormalizer drops the scheme, host and query string and replaces
+each variable path segment with a named placeholder, e.g.
+
+    /pfm/api/v2/deposit/acc-42/account-statement?page=3
+    -> /pfm/api/v2/deposit/{accountRef}/account-statement
+
+Segments are classified by an ordered table of anchored patterns; the
+first match names the placeholder. Templates are memoized per endpoint
+in a bounded LRU, so repeated calls cost one cache probe.
+"""
+
+import re
+import sys
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Tuple
+
+# (placeholder, segment pattern), first match wins
+SEGMENT_PATTERNS = (
+    ('{uuid}', r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'),
+    # Compact dates need a real month and day, so 8-digit ids like 20481234 stay {id}
+    ('{date}', r'\d{4}-\d{2}-\d{2}(?:T[\d:.]+Z?)?|\d{2}-\d{2}-\d{4}'
+               r'|(?:19|20)\d{2}(?:0[1-9]|1[0-2])(?:0[1-9]|[12]\d|3[01])'),
+    ('{accountRef}', r'(?i:acc(?:ount)?)[-_]?[A-Za-z0-9_-]*\d[A-Za-z0-9_-]*'),
+    ('{id}', r'\d+|[0-9a-fA-F]{16,}|(?=[A-Za-z_-]*\d)[A-Za-z0-9_-]{8,}'),
+)
+
+
+class EndpointNormalizer:
+    """Concrete endpoint -> route template, memoized in a bounded LRU."""
+
+    def __init__(self, patterns: Iterable[Tuple[str, str]] = SEGMENT_PATTERNS, cache_size: int = 1 << 16):
+        self.patterns = tuple(patterns)
+        # One anchored alternation; the matching group's index names the placeholder
+        self._classify = re.compile(
+            '|'.join(f'({pattern})' for _, pattern in self.patterns)
+        ).fullmatch
+        self._placeholders = [placeholder for placeholder, _ in self.patterns]
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, endpoint: str) -> str:
+        path = endpoint
+        if '://' in path:
+            start = path.find('/', path.find('://') + 3)
+            path = path[start:] if start != -1 else '/'
+        for separator in ('?', '#'):
+            cut = path.find(separator)
+            if cut != -1:
+                path = path[:cut]
+
+        classify = self._classify
+        placeholders = self._placeholders
+        segments = []
+        for segment in path.split('/'):
+            match = classify(segment) if segment else None
+            if match is not None:
+                # Patterns have no capturing groups of their own, so lastindex is the pattern's
+                segment = placeholders[match.lastindex - 1]
+            segments.append(segment)
+        return '/'.join(segments).rstrip('/') or '/'
+
+
+_DEFAULT = None
+
+
+def normalize_endpoint(endpoint: str) -> str:
+    """Route template of an endpoint with the default segment patterns."""
+    global _DEFAULT
+    if _DEFAULT is None:
+        _DEFAULT = EndpointNormalizer()
+    return _DEFAULT.normalize(endpoint)
+
+
+def main():
+    """Collapse the endpoints of a capture dump into templates."""
+    from pathlib import Path
+
+    from api_blocks import read_api_blocks
+
+    api_file = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / 'finfactor' / 'apiResonse.json'
+    calls = Counter(normalize_endpoint(api['endpoint']) for api in read_api_blocks(api_file))
+
+    print(f"🧭 {sum(calls.values())} captured calls -> {len(calls)} templates")
+    for template, count in calls.most_common():
+        print(f"   {count:6,}  {template}")
+
+
+if __name__ == '__main__':
+    main()
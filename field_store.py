@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Compact columnar store for extracted field records.
+
+The parsers used to keep one dict per field occurrence, each repeating the
+API name, endpoint, path and type strings. FieldStore interns every string
+once (paths as PathTrie nodes) and keeps a row per occurrence as integer
+ids in parallel array-backed columns, with a per-category index from
+field name to rows and a per-path index for subtree queries.
+Records are only rebuilt as dicts when a caller asks for them (e.g. when
+writing the comparison JSON).
+"""
+
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+from path_trie import PathTrie
+
+
+class StringTable:
+    """Bidirectional string <-> small integer id map."""
+
+    __slots__ = ('ids', 'strings')
+
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def intern(self, value: str) -> int:
+        string_id = self.ids.get(value)
+        if string_id is None:
+            string_id = len(self.strings)
+            self.ids[value] = string_id
+            self.strings.append(value)
+        return string_id
+
+    def get(self, value: str) -> Optional[int]:
+        return self.ids.get(value)
+
+    def __getitem__(self, string_id: int) -> str:
+        return self.strings[string_id]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class FieldStore:
+    """Field occurrences of all parsed APIs, grouped by category."""
+
+    __slots__ = (
+        'names', 'paths', 'types', 'categories',
+        'api_names', 'api_endpoints', 'api_categories',
+        'name_col', 'path_col', 'type_col', 'api_col', 'depth_col', 'occurrences_col',
+        '_by_category', '_by_path', '_api_rows',
+    )
+
+    def __init__(self):
+        self.names = StringTable()
+        self.paths = PathTrie()
+        self.types = StringTable()
+        self.categories = StringTable()
+
+        # Per API id
+        self.api_names = []
+        self.api_endpoints = []
+        self.api_categories = array('I')
+
+        # Per row (one field occurrence)
+        self.name_col = array('I')
+        self.path_col = array('I')
+        self.type_col = array('B')
+        self.api_col = array('I')
+        self.depth_col = array('H')
+        self.occurrences_col = array('I')
+
+        # category id -> name id -> row ids, in first-seen order
+        self._by_category = {}
+        # path node id -> row ids
+        self._by_path = {}
+        # api id -> (first row, end row)
+        self._api_rows = []
+
+    def add_api(self, api_name: str, endpoint: str, category: str, fields: List[Dict]) -> int:
+        """Store one API and its field records; returns the API id."""
+        api_id = len(self.api_names)
+        category_id = self.categories.intern(category)
+        self.api_names.append(api_name)
+        self.api_endpoints.append(endpoint)
+        self.api_categories.append(category_id)
+
+        by_name = self._by_category.setdefault(category_id, {})
+        first_row = len(self.name_col)
+        for field in fields:
+            row = len(self.name_col)
+            name_id = self.names.intern(field['name'])
+            self.name_col.append(name_id)
+            path_id = self.paths.insert(field['path'])
+            self.path_col.append(path_id)
+            self.type_col.append(self.types.intern(field['type']))
+            self.api_col.append(api_id)
+            self.depth_col.append(field.get('depth', 0))
+            self.occurrences_col.append(field.get('occurrences', 1))
+
+            rows = by_name.get(name_id)
+            if rows is None:
+                by_name[name_id] = array('I', (row,))
+            else:
+                rows.append(row)
+            rows = self._by_path.get(path_id)
+            if rows is None:
+                self._by_path[path_id] = array('I', (row,))
+            else:
+                rows.append(row)
+
+        self._api_rows.append((first_row, len(self.name_col)))
+        return api_id
+
+    def __len__(self):
+        return len(self.name_col)
+
+    def record(self, row: int) -> Dict:
+        """One field occurrence as the dict the comparison JSON uses."""
+        api_id = self.api_col[row]
+        return {
+            'api_name': self.api_names[api_id],
+            'api_endpoint': self.api_endpoints[api_id],
+            'path': self.paths.path(self.path_col[row]),
+            'type': self.types[self.type_col[row]],
+            'depth': self.depth_col[row],
+            'occurrences': self.occurrences_col[row]
+        }
+
+    def category_names(self) -> List[str]:
+        return [self.categories[category_id] for category_id in self._by_category]
+
+    def field_names(self, category: str) -> List[str]:
+        """Distinct field names seen in a category, in first-seen order."""
+        category_id = self.categories.get(category)
+        if category_id not in self._by_category:
+            return []
+        return [self.names[name_id] for name_id in self._by_category[category_id]]
+
+    def _rows(self, category: str, name: str):
+        category_id = self.categories.get(category)
+        name_id = self.names.get(name)
+        return self._by_category.get(category_id, {}).get(name_id, ())
+
+    def field_sources(self, category: str, name: str) -> List[Dict]:
+        """Every occurrence of a field name in a category, as dicts."""
+        return [self.record(row) for row in self._rows(category, name)]
+
+    def apis_for_field(self, category: str, name: str) -> List[str]:
+        """Distinct API names providing a field in a category."""
+        api_col = self.api_col
+        api_ids = dict.fromkeys(api_col[row] for row in self._rows(category, name))
+        return [self.api_names[api_id] for api_id in api_ids]
+
+    def apis_in_category(self, category: str) -> List[str]:
+        category_id = self.categories.get(category)
+        return [name for name, api_category in zip(self.api_names, self.api_categories)
+                if api_category == category_id]
+
+    def fields_under(self, path: str) -> List[Dict]:
+        """Every occurrence of a field at or below a dotted path, e.g. 'summary.investment'."""
+        by_path = self._by_path
+        records = []
+        for node in self.paths.prefix(path):
+            for row in by_path.get(node, ()):
+                record = self.record(row)
+                record['name'] = self.names[self.name_col[row]]
+                records.append(record)
+        return records
+
+    def api_fields(self, api_id: int) -> Iterator[Dict]:
+        """Field records of one API as the extractor produced them."""
+        first_row, end_row = self._api_rows[api_id]
+        for row in range(first_row, end_row):
+            yield {
+                'name': self.names[self.name_col[row]],
+                'path': self.paths.path(self.path_col[row]),
+                'type': self.types[self.type_col[row]],
+                'depth': self.depth_col[row],
+                'occurrences': self.occurrences_col[row]
+            }
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Shared field walker for decoded API responses.
+
+One explicit-stack generator replaces the per-script recursive walkers:
+it yields a flat (name, path, type, depth, occurrences) tuple per field in
+the same depth-first order those walkers produced, without building and
+concatenating a list at every level. Arrays are covered once per distinct
+element shape (see array_shapes), and there is a single depth policy,
+MAX_DEPTH, that every caller shares unless it passes its own limit.
+"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from array_shapes import distinct_elements
+
+MAX_DEPTH = 100
+
+RECORD_FIELDS = ('name', 'path', 'type', 'depth', 'occurrences')
+
+# (name, path, type, depth, occurrences); the path is whatever `child` builds when given
+FieldRecord = Tuple[str, Any, str, int, int]
+
+FIELD_TYPES = {
+    bool: 'boolean',
+    int: 'integer',
+    float: 'float',
+    str: 'string',
+    list: 'array',
+    dict: 'object',
+    type(None): 'null',
+}
+
+
+def field_type(value: Any) -> str:
+    """Type name the field inventories use for a decoded value."""
+    name = FIELD_TYPES.get(type(value))
+    if name is not None:
+        return name
+    # Subclasses (e.g. OrderedDict) fall back to the isinstance chain
+    for cls in (bool, int, float, str, list, dict):
+        if isinstance(value, cls):
+            return FIELD_TYPES[cls]
+    return 'unknown'
+
+
+def walk_fields(obj: Any, parent: Any = '', depth: int = 0, max_depth: int = MAX_DEPTH,
+                occurrences: int = 1, child: Optional[Callable[[Any, str], Any]] = None) -> Iterator[FieldRecord]:
+    """
+    Yield a record for every field under `obj`, depth-first.
+
+    Keys of an object at depth d are yielded with depth d and their
+    children walked at d + 1, as long as that stays within `max_depth`.
+    Array elements stay at the array's depth and multiply `occurrences`
+    by the number of elements sharing their shape.
+
+    Paths are dotted strings below `parent`. With `child`, each path is
+    child(parent path, key) instead, e.g. PathTrie.child from a node id,
+    so no path string is ever built.
+    """
+    if depth > max_depth or not isinstance(obj, (dict, list)):
+        return
+
+    types = FIELD_TYPES
+    # Frames are (iterator, path prefix (the parent path with `child`), depth, occurrences, is_object)
+    if child is None:
+        parent = parent + '.' if parent else ''
+    stack = [(iter(obj.items()) if isinstance(obj, dict) else iter(distinct_elements(obj)),
+              parent, depth, occurrences, isinstance(obj, dict))]
+
+    while stack:
+        entries, prefix, depth, occurrences, is_object = stack[-1]
+        for key, value in entries:
+            if is_object:
+                kind = types.get(type(value)) or field_type(value)
+                path = prefix + key if child is None else child(prefix, key)
+                yield key, path, kind, depth, occurrences
+                if kind == 'object':
+                    if depth < max_depth:
+                        stack.append((iter(value.items()), path + '.' if child is None else path,
+                                      depth + 1, occurrences, True))
+                        break
+                elif kind == 'array':
+                    if value and depth < max_depth:
+                        stack.append((iter(distinct_elements(value)), path + '.' if child is None else path,
+                                      depth + 1, occurrences, False))
+                        break
+            else:
+                # key is an element representative, value its count
+                if isinstance(key, dict):
+                    stack.append((iter(key.items()), prefix, depth, occurrences * value, True))
+                    break
+                if key:
+                    stack.append((iter(distinct_elements(key)), prefix, depth, occurrences * value, False))
+                    break
+        else:
+            stack.pop()
+
+
+def field_dicts(obj: Any, parent: str = '', depth: int = 0,
+                max_depth: int = MAX_DEPTH, occurrences: int = 1) -> List[Dict]:
+    """walk_fields as the per-field dicts the parsers write to JSON."""
+    # A dict display per record: dict(zip(RECORD_FIELDS, ...)) costs more than the walk saves
+    return [{'name': name, 'path': path, 'type': kind, 'depth': level, 'occurrences': count}
+            for name, path, kind, level, count in walk_fields(obj, parent, depth, max_depth, occurrences)]
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Vectorized fuzzy matching of field names with candidate blocking.
+
+Names are split into word tokens (camelCase, snake_case, kebab-case and
+digit boundaries), abbreviations are spelled out from the semantic
+mappings ('txnAmt' -> transaction amount), and the token text is turned
+into character n-gram TF-IDF vectors held in SciPy sparse matrices with
+L2-normalized rows, so the cosine of two names is one sparse dot product.
+
+Comparing every name against every other name is avoided by blocking:
+only pairs sharing at least one token are scored. Candidate pairs come
+from the product of the two token-incidence matrices, and their scores
+from row-wise products of the n-gram matrices, scored in chunks of
+left-hand names sized so that no chunk holds more than `max_pairs`
+candidate pairs. Tokens carried by more than `max_block` right-hand
+names ('id', 'date', ...) are too common to separate anything and are
+left out of blocking, unless they are all a name has.
+"""
+
+import json
+import math
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+
+NGRAM_SIZE = 3
+DEFAULT_MAX_BLOCK = 2000
+# Candidate pairs scored at once; bounds the row-wise product temporaries
+DEFAULT_MAX_PAIRS = 1 << 18
+
+# Lowercase runs after one capital, acronyms before a capitalized word, digit runs
+_WORD = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+')
+
+
+def split_name(name: str) -> List[str]:
+    """Lowercase word tokens: 'maskedAccNumber' -> ['masked', 'acc', 'number']."""
+    return [token.lower() for token in _WORD.findall(name)]
+
+
+class FuzzyMatcher:
+    """Char n-gram TF-IDF matcher over two sets of field names."""
+
+    def __init__(self, abbreviations: Optional[Dict[str, str]] = None, ngram_size: int = NGRAM_SIZE,
+                 max_block: int = DEFAULT_MAX_BLOCK, max_pairs: int = DEFAULT_MAX_PAIRS):
+        # 'dob' -> ('date', 'of', 'birth'): expansions are split like any other name
+        self.abbreviations = {
+            abbr.lower(): tuple(split_name(expansion))
+            for abbr, expansion in (abbreviations or {}).items()
+        }
+        self.ngram_size = ngram_size
+        self.max_block = max_block
+        self.max_pairs = max_pairs
+        self._tokens = {}
+
+    @classmethod
+    def from_semantic_matcher(cls, matcher, **kwargs) -> 'FuzzyMatcher':
+        """Matcher sharing a SemanticMatcher's abbreviation table."""
+        return cls(matcher.mappings.get('abbreviation_expansions', {}), **kwargs)
+
+    def tokens(self, name: str) -> Tuple[str, ...]:
+        """Expanded word tokens of a name, memoized per name."""
+        tokens = self._tokens.get(name)
+        if tokens is None:
+            expanded = []
+            for token in split_name(name):
+                expanded.extend(self.abbreviations.get(token, (token,)))
+            tokens = self._tokens[name] = tuple(expanded)
+        return tokens
+
+    def _ngrams(self, tokens: Tuple[str, ...]) -> List[str]:
+        text = f" {' '.join(tokens)} "
+        size = self.ngram_size
+        return [text[start:start + size] for start in range(max(len(text) - size + 1, 1))]
+
+    def _vectorize(self, left: List[str], right: List[str]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        """TF-IDF rows for both sides, with idf fitted over the names of both."""
+        vocabulary = {}
+        data, indices, indptr = [], [], [0]
+        for name in left + right:
+            counts = {}
+            for gram in self._ngrams(self.tokens(name)):
+                column = vocabulary.setdefault(gram, len(vocabulary))
+                counts[column] = counts.get(column, 0) + 1
+            indices.extend(counts)
+            # Sublinear term frequency, so a repeated gram does not dominate
+            data.extend(1.0 + math.log(count) for count in counts.values())
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(left) + len(right), len(vocabulary)))
+        document_frequency = np.bincount(matrix.indices, minlength=len(vocabulary))
+        idf = (np.log((1.0 + matrix.shape[0]) / (1.0 + document_frequency)) + 1.0).astype(np.float32)
+        matrix = matrix @ sparse.diags(idf)
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        matrix = sparse.csr_matrix(sparse.diags((1.0 / norms).astype(np.float32)) @ matrix)
+        return matrix[:len(left)], matrix[len(left):]
+
+    def _blocks(self, left: List[str], right: List[str]) -> Tuple[sparse.csr_matrix, sparse.csr_matrix]:
+        """Binary name x token incidence for both sides, without over-common tokens on the left."""
+        vocabulary = {}
+        right_rows = [{vocabulary.setdefault(token, len(vocabulary)) for token in self.tokens(name)}
+                      for name in right]
+        right_counts = np.bincount([column for row in right_rows for column in row],
+                                   minlength=len(vocabulary))
+
+        left_rows = []
+        for name in left:
+            columns = {vocabulary[token] for token in self.tokens(name) if token in vocabulary}
+            keys = {column for column in columns if right_counts[column] <= self.max_block}
+            if not keys and columns:
+                # Only common tokens: block on the rarest of them
+                keys = {min(columns, key=lambda column: right_counts[column])}
+            left_rows.append(keys)
+
+        def incidence(rows):
+            indices = np.fromiter((column for row in rows for column in sorted(row)), dtype=np.int64)
+            indptr = np.cumsum([0] + [len(row) for row in rows], dtype=np.int64)
+            return sparse.csr_matrix((np.ones(len(indices)), indices, indptr),
+                                     shape=(len(rows), len(vocabulary)))
+
+        return incidence(left_rows), incidence(right_rows)
+
+    def similarity(self, left: Iterable[str], right: Iterable[str],
+                   threshold: float = 0.0) -> Tuple[List[str], List[str], sparse.csr_matrix]:
+        """
+        Pruned similarity matrix between the distinct names of each side.
+        Returns (left names, right names, csr matrix of cosine scores) where
+        only blocked pairs scoring at least `threshold` are stored.
+        """
+        left = list(dict.fromkeys(left))
+        right = list(dict.fromkeys(right))
+        if not left or not right:
+            return left, right, sparse.csr_matrix((len(left), len(right)))
+
+        left_vectors, right_vectors = self._vectorize(left, right)
+        left_blocks, right_blocks = self._blocks(left, right)
+        right_blocks_t = right_blocks.T.tocsr()
+        # Upper bound on each left name's candidates: sum of its blocks' sizes
+        cumulative = np.cumsum(left_blocks @ np.asarray(right_blocks.sum(axis=0)).ravel())
+
+        all_rows, all_cols, all_scores = [], [], []
+        start = 0
+        while start < len(left):
+            base = cumulative[start - 1] if start else 0
+            stop = max(int(np.searchsorted(cumulative, base + self.max_pairs, side='right')), start + 1)
+            # Nonzero wherever a left and right name share a blocking token
+            candidates = (left_blocks[start:stop] @ right_blocks_t).tocoo()
+            rows = candidates.row + start
+            cols = candidates.col
+            scores = np.asarray(left_vectors[rows].multiply(right_vectors[cols]).sum(axis=1)).ravel()
+            keep = scores >= threshold
+            all_rows.append(rows[keep])
+            all_cols.append(cols[keep])
+            all_scores.append(np.minimum(scores[keep], 1.0))
+            start = stop
+
+        matrix = sparse.csr_matrix(
+            (np.concatenate(all_scores), (np.concatenate(all_rows), np.concatenate(all_cols))),
+            shape=(len(left), len(right)))
+        return left, right, matrix
+
+    def top_k(self, left: Iterable[str], right: Iterable[str], k: int = 5,
+              threshold: float = 0.3) -> Dict[str, List[Tuple[str, float]]]:
+        """
+        The k best right-hand names for each distinct left-hand name,
+        best first (ties in right-hand order). Names without a candidate
+        at or above the threshold are left out.
+        """
+        left, right, matrix = self.similarity(left, right, threshold)
+        matrix.sort_indices()
+        rows = np.repeat(np.arange(len(left)), np.diff(matrix.indptr))
+        # Scores lie in [0, 1], so one stable sort on row + (1 - score) orders each
+        # row best first while keeping right-hand order among ties
+        order = np.argsort(rows + (1.0 - matrix.data.astype(np.float64)), kind='stable')
+        rows, cols, scores = rows[order], matrix.indices[order], matrix.data[order]
+        row_starts = np.searchsorted(rows, rows, side='left')
+        keep = np.arange(len(rows)) - row_starts < k
+
+        candidates = {}
+        for row, col, score in zip(rows[keep].tolist(), cols[keep].tolist(), scores[keep].tolist()):
+            candidates.setdefault(left[row], []).append((right[col], round(score, 4)))
+        return candidates
+
+
+def main():
+    """Fuzzy candidates between the unmatched fields of a comparison output."""
+    from parse_schemas_enhanced import load_semantic_matcher
+
+    base_dir = Path(__file__).parent
+    comparison_file = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'comparison_100_percent.json'
+    with open(comparison_file, 'r', encoding='utf-8') as f:
+        categories = json.load(f)['categories']
+
+    fuzzy = FuzzyMatcher.from_semantic_matcher(load_semantic_matcher())
+    print(f"🔎 Fuzzy candidates for unmatched fields in {comparison_file.name}")
+    for category, data in sorted(categories.items()):
+        rebit_names = [field['name'] for field in data.get('rebit_only_fields', [])]
+        finn_names = [field['field_name'] for field in data.get('finn_only_fields', [])]
+        candidates = fuzzy.top_k(rebit_names, finn_names, k=3, threshold=0.5)
+        if not candidates:
+            continue
+        print(f"\n📁 {category}: {len(candidates)} of {len(set(rebit_names))} ReBIT-only fields")
+        for name, matches in candidates.items():
+            print(f"   {name:30s} -> " + ', '.join(f"{match} ({score:.2f})" for match, score in matches))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Decoder for the JavaScript object-literal dialect used in apiResonse.json.
+
+Handles unquoted keys, single-quoted strings, trailing commas, comments and
+`undefined` without eval(). Blocks that are already strict JSON go straight
+to the C json decoder; anything else is rewritten to JSON in a single regex
+pass and then decoded the same way.
+"""
+
+import json
+import re
+
+
+class JSLiteralError(ValueError):
+    """Raised when a block cannot be decoded as a JS object literal."""
+
+
+_decoder = json.JSONDecoder()
+
+# Each match is a run of text that is already valid JSON (double-quoted
+# strings, numbers, literals, ordinary commas) followed by one construct that
+# needs rewriting, so the Python callback only runs at rewrite sites. Every
+# alternative after the run starts with a distinct character, which keeps
+# the run unambiguous and the scan linear.
+_PLAIN = r'[^"\'/,A-Za-z_]*'
+# Whitespace and comments between a trailing comma and its closing bracket
+_GAP = r'(?:\s|//[^\n]*|/\*.*?\*/)*'
+_JS_TOKEN = re.compile(
+    r'(' + _PLAIN + r'(?:(?:"[^"\\]*(?:\\.[^"\\]*)*"'
+    r'|,(?!' + _GAP + r'[}\]])'
+    r'|(?!undefined\b)[A-Za-z_]\w*\b(?!\s*:)'
+    r'|/(?![/*]))' + _PLAIN + r')*)'
+    r"(?:'([^'\\]*(?:\\.[^'\\]*)*)'"
+    r'|(//[^\n]*|/\*.*?\*/)'
+    r'|(,)'
+    r'|(undefined)\b'
+    r'|([A-Za-z_]\w*)(?=\s*:)'
+    r'|(.)'
+    r'|\Z)',
+    re.DOTALL,
+)
+
+# A double quote after an even run of backslashes, i.e. not already escaped
+_UNESCAPED_QUOTE = re.compile(r'(?<!\\)((?:\\\\)*)"')
+
+
+def _to_json(match):
+    plain = match.group(1)
+    group = match.lastindex
+    if group == 1:
+        return plain
+    if group == 2:
+        body = _UNESCAPED_QUOTE.sub(r'\1\\"', match.group(2).replace("\\'", "'"))
+        return f'{plain}"{body}"'
+    if group == 3 or group == 4:
+        return plain
+    if group == 5:
+        return plain + 'null'
+    if group == 6:
+        return f'{plain}"{match.group(6)}"'
+    return plain + match.group(7)
+
+
+def to_json(text: str) -> str:
+    """Rewrite a JS object literal as strict JSON text."""
+    return _JS_TOKEN.sub(_to_json, text)
+
+
+def loads(text: str):
+    """Decode a JS object literal into Python objects."""
+    text = text.strip().rstrip(',').rstrip()
+    try:
+        return _decoder.decode(text)
+    except json.JSONDecodeError:
+        pass
+
+    try:
+        return _decoder.decode(to_json(text))
+    except json.JSONDecodeError as e:
+        raise JSLiteralError(f"{e.msg} at line {e.lineno} column {e.colno}") from None
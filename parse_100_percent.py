@@ -6,101 +6,29 @@ ZERO errors. ALL nested fields. ALL APIs.
 """
 
 import json
-import re
 from pathlib import Path
 from collections import defaultdict, OrderedDict
+from api_blocks import read_api_blocks
+from categorizer import categorize_api
+from field_walker import MAX_DEPTH, field_dicts, walk_fields
+import js_literal
+from schema_types import SharedTypeMatcher, intern_schema_tree
+from xsd_compiler import load_compiled
 
 
-def extract_all_nested_fields(obj, parent_path='', depth=0):
+def extract_all_nested_fields(obj, parent_path='', depth=0, occurrences=1):
     """
     Extract EVERY field from nested structure.
-    Goes 100 levels deep. Misses NOTHING.
+    Goes MAX_DEPTH levels deep. Misses NOTHING.
+    Every array element is covered, walking once per distinct shape.
     """
-    fields = []
-    
-    if depth > 100 or obj is None:
-        return fields
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            full_path = f"{parent_path}.{key}" if parent_path else key
-            
-            # Determine type
-            if value is None:
-                field_type = 'null'
-            elif isinstance(value, bool):
-                field_type = 'boolean'
-            elif isinstance(value, int):
-                field_type = 'integer'
-            elif isinstance(value, float):
-                field_type = 'float'
-            elif isinstance(value, str):
-                field_type = 'string'
-            elif isinstance(value, list):
-                field_type = 'array'
-            elif isinstance(value, dict):
-                field_type = 'object'
-            else:
-                field_type = 'unknown'
-            
-            fields.append({
-                'name': key,
-                'path': full_path,
-                'type': field_type,
-                'depth': depth
-            })
-            
-            # Recurse into nested structures
-            if isinstance(value, dict):
-                fields.extend(extract_all_nested_fields(value, full_path, depth + 1))
-            elif isinstance(value, list) and len(value) > 0:
-                # Process first 3 items to catch variations
-                for i, item in enumerate(value[:3]):
-                    if isinstance(item, (dict, list)):
-                        fields.extend(extract_all_nested_fields(item, full_path, depth + 1))
-    
-    elif isinstance(obj, list) and len(obj) > 0:
-        for i, item in enumerate(obj[:3]):
-            if isinstance(item, (dict, list)):
-                fields.extend(extract_all_nested_fields(item, parent_path, depth))
-    
-    return fields
+    return field_dicts(obj, parent_path, depth, MAX_DEPTH, occurrences)
 
 
 def parse_xsd_file(xsd_path):
-    """Parse ReBIT XSD schema file."""
-    import xml.etree.ElementTree as ET
-    
+    """Parse ReBIT XSD schema file into its resolved, path-qualified fields."""
     try:
-        tree = ET.parse(xsd_path)
-        root = tree.getroot()
-        
-        ns = {'xs': 'http://www.w3.org/2001/XMLSchema'}
-        fields = []
-        
-        # Extract attributes
-        for attr in root.findall('.//xs:attribute', ns):
-            name = attr.get('name')
-            if name:
-                fields.append({
-                    'name': name,
-                    'type': attr.get('type', 'string'),
-                    'required': attr.get('use') == 'required',
-                    'schema_file': xsd_path.name
-                })
-        
-        # Extract elements
-        for elem in root.findall('.//xs:element', ns):
-            name = elem.get('name')
-            if name:
-                fields.append({
-                    'name': name,
-                    'type': elem.get('type', 'string'),
-                    'required': elem.get('minOccurs', '1') != '0',
-                    'schema_file': xsd_path.name
-                })
-        
-        return fields
+        return load_compiled(xsd_path)['fields']
     except Exception as e:
         print(f"Error parsing {xsd_path}: {e}")
         return []
@@ -115,98 +43,26 @@ def main():
     print("🎯 100% ACCURATE PARSER - ALL 43 APIs")
     print("="*80)
     
-    # Read the entire file
-    with open(api_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Find ALL 43 API blocks manually
+    # Walk the dump once, extracting every API block
     api_blocks = []
-    lines = content.split('\n')
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for block in read_api_blocks(api_file):
+        response_str = block['response']
         
-        # Look for API name
-        name_match = re.search(r'name:\s*"([^"]+)"', line)
-        if name_match:
-            api_name = name_match.group(1)
-            
-            # Find endpoint
-            endpoint = None
-            for j in range(i, min(i+5, len(lines))):
-                ep_match = re.search(r'endpoint:\s*"([^"]+)"', lines[j])
-                if ep_match:
-                    endpoint = ep_match.group(1)
-                    break
-            
-            if endpoint:
-                # Find response block
-                response_start = -1
-                for j in range(i, min(i+15, len(lines))):
-                    if 'response:' in lines[j]:
-                        response_start = j
-                        break
-                
-                if response_start >= 0:
-                    # Extract response content
-                    response_text = lines[response_start].split('response:', 1)[-1].strip()
-                    
-                    # If response is on same line
-                    if response_text.startswith('null'):
-                        response_obj = None
-                    elif response_text.startswith('{') or response_text.startswith('['):
-                        # Need to find the complete object
-                        brace_count = 0
-                        square_count = 0
-                        response_lines = []
-                        started = False
-                        
-                        for j in range(response_start, min(response_start+10000, len(lines))):
-                            line_content = lines[j]
-                            
-                            if j == response_start:
-                                # Get part after 'response:'
-                                line_content = line_content.split('response:', 1)[-1].strip()
-                            
-                            response_lines.append(line_content)
-                            brace_count += line_content.count('{') - line_content.count('}')
-                            square_count += line_content.count('[') - line_content.count(']')
-                            
-                            if not started and ('{' in line_content or '[' in line_content):
-                                started = True
-                            
-                            if started and brace_count == 0 and square_count == 0:
-                                break
-                            
-                            # Safety: stop at error:
-                            if 'error:' in line_content and j > response_start:
-                                response_lines.pop()
-                                break
-                        
-                        response_str = '\n'.join(response_lines)
-                        
-                        # Remove trailing comma if present
-                        response_str = response_str.rstrip().rstrip(',')
-                        
-                        try:
-                            # Define JS literals
-                            true = True
-                            false = False
-                            null = None
-                            response_obj = eval(response_str)
-                        except:
-                            response_obj = None
-                    else:
-                        response_obj = None
-                    
-                    api_blocks.append({
-                        'name': api_name,
-                        'endpoint': endpoint,
-                        'response': response_obj,
-                        'line': i
-                    })
-        i += 1
+        if response_str:
+            try:
+                response_obj = js_literal.loads(response_str)
+            except js_literal.JSLiteralError:
+                response_obj = None
+        else:
+            response_obj = None
+        
+        api_blocks.append({
+            'name': block['name'],
+            'endpoint': block['endpoint'],
+            'response': response_obj,
+            'offset': block['offset']
+        })
     
     print(f"\n✅ Found {len(api_blocks)} APIs")
     
@@ -227,6 +83,12 @@ def main():
     
     print(f"✅ Parsed {len(rebit_data)} ReBIT FI types")
     
+    # Structurally identical complex types share one id across FI types
+    type_interner, types_by_fi = intern_schema_tree(rebit_dir)
+    type_stats = type_interner.stats()
+    print(f"🧩 {type_stats['elements']} complex elements -> {type_stats['types']} distinct types, "
+          f"{type_stats['shared_types']} shared across FI types")
+    
     # Categorize and extract fields from ALL APIs
     print("\n📡 Extracting fields from ALL 43 APIs...")
     
@@ -238,40 +100,17 @@ def main():
         endpoint = api['endpoint']
         response = api['response']
         
-        # Categorize
-        ep_lower = endpoint.lower()
-        if '/mutual-fund/' in ep_lower or '/mutualfunds' in ep_lower:
-            category = 'mutual_funds'
-        elif '/term-deposit/' in ep_lower:
-            category = 'term_deposit'
-        elif '/recurring-deposit/' in ep_lower:
-            category = 'recurring_deposit'
-        elif '/deposit/' in ep_lower:
-            category = 'deposit'
-        elif '/equities/' in ep_lower or '/equities-and-etfs/' in ep_lower:
-            category = 'equity_shares'
-        elif '/etf/' in ep_lower:
-            category = 'exchange_traded_funds'
-        elif '/nps/' in ep_lower:
-            category = 'national_pension_system'
-        elif 'user-login' in ep_lower or 'user-details' in ep_lower or 'user-subscriptions' in ep_lower or 'user-account-delink' in ep_lower:
-            category = 'user_management'
-        elif 'consent' in ep_lower:
-            category = 'consent_management'
-        elif 'fips' in ep_lower or 'brokers' in ep_lower:
-            category = 'provider_info'
-        elif 'firequest' in ep_lower or 'account-consents' in ep_lower:
-            category = 'fi_request'
-        else:
-            category = 'other'
+        # Categorize (ordered rules in category_rules.json)
+        category = categorize_api(endpoint)
         
         # Extract fields
         if response is not None:
-            fields = extract_all_nested_fields(response)
+            # Raw records, so only the first field of each name becomes a dict
             unique_fields = {}
-            for f in fields:
-                if f['name'] not in unique_fields:
-                    unique_fields[f['name']] = f
+            for name, path, kind, depth, occurrences in walk_fields(response):
+                if name not in unique_fields:
+                    unique_fields[name] = {'name': name, 'path': path, 'type': kind,
+                                           'depth': depth, 'occurrences': occurrences}
             
             field_count = len(unique_fields)
             print(f"  ✅ {api_name}: {field_count} fields")
@@ -303,6 +142,8 @@ def main():
     print("\n🔬 Building comparison...")
     
     all_categories = set(list(rebit_data.keys()) + list(categories.keys()))
+    # Name matches are computed once per type, against every FinFactor name
+    matcher = SharedTypeMatcher(type_interner, (name for data in categories.values() for name in data['fields']))
     
     comparison = {
         'metadata': {
@@ -322,9 +163,9 @@ def main():
         rebit_fields = rebit_data.get(cat, {}).get('fields', {})
         finn_fields = categories.get(cat, {}).get('fields', {})
         
-        common = set(rebit_fields.keys()) & set(finn_fields.keys())
-        rebit_only = set(rebit_fields.keys()) - set(finn_fields.keys())
-        finn_only = set(finn_fields.keys()) - set(rebit_fields.keys())
+        common = set(matcher.common(types_by_fi.get(cat, ()), finn_fields.keys()))
+        rebit_only = set(rebit_fields.keys()) - common
+        finn_only = set(finn_fields.keys()) - common
         
         comparison['categories'][cat] = {
             'summary': {
@@ -342,6 +183,10 @@ def main():
             'apis': categories.get(cat, {}).get('apis', [])
         }
     
+    match_stats = matcher.stats()
+    print(f"   Type matches: {match_stats['computed']} computed, {match_stats['reused']} reused "
+          f"({match_stats['reuse_percent']}%)")
+    
     # Save
     output_file = base_dir / 'comparison_100_percent.json'
     with open(output_file, 'w', encoding='utf-8') as f:
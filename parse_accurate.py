@@ -9,25 +9,15 @@ import re
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 from parse_schemas import extract_xsd_data_points
+import js_literal
+from field_walker import walk_fields
 
 
 def extract_fields_from_dict(data, parent_path='', fields_set=None):
-    """Recursively extract all field names from a dictionary."""
+    """Extract all field paths from a dictionary."""
     if fields_set is None:
         fields_set = set()
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{parent_path}.{key}" if parent_path else key
-            fields_set.add(current_path)
-            
-            if isinstance(value, (dict, list)):
-                extract_fields_from_dict(value, current_path, fields_set)
-    
-    elif isinstance(data, list) and len(data) > 0:
-        # Process first item as template
-        extract_fields_from_dict(data[0], parent_path, fields_set)
-    
+    fields_set.update(path for _, path, _, _, _ in walk_fields(data, parent_path))
     return fields_set
 
 
@@ -110,8 +100,8 @@ def main():
         
         # Try to convert JavaScript object to JSON
         try:
-            # Simple approach: use eval (safe here since we control the file)
-            response_data = eval(response_str)
+            # Decode the JavaScript object literal (no eval)
+            response_data = js_literal.loads(response_str)
             
             # Extract all fields
             fields = extract_fields_from_dict(response_data)
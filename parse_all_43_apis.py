@@ -9,52 +9,15 @@ import re
 from pathlib import Path
 from collections import defaultdict, OrderedDict
 from parse_schemas import extract_xsd_data_points
+from rebit_loader import load_rebit_data, print_timings
+from categorizer import categorize_api
+import js_literal
+from field_walker import MAX_DEPTH, field_dicts
 
 
-def extract_fields_with_paths(obj, parent='', depth=0, max_depth=50):
-    """Recursively extract ALL fields with their full paths and types."""
-    fields = []
-    
-    if depth > max_depth:
-        return fields
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            full_path = f"{parent}.{key}" if parent else key
-            
-            # Determine type
-            if isinstance(value, bool):
-                field_type = 'boolean'
-            elif isinstance(value, int):
-                field_type = 'integer'
-            elif isinstance(value, float):
-                field_type = 'float'
-            elif isinstance(value, str):
-                field_type = 'string'
-            elif isinstance(value, list):
-                field_type = 'array'
-            elif isinstance(value, dict):
-                field_type = 'object'
-            elif value is None:
-                field_type = 'null'
-            else:
-                field_type = 'unknown'
-            
-            fields.append({
-                'name': key,
-                'path': full_path,
-                'type': field_type,
-                'depth': depth
-            })
-            
-            # Recurse
-            if isinstance(value, (dict, list)):
-                fields.extend(extract_fields_with_paths(value, full_path, depth + 1, max_depth))
-    
-    elif isinstance(obj, list) and len(obj) > 0:
-        fields.extend(extract_fields_with_paths(obj[0], parent, depth, max_depth))
-    
-    return fields
+def extract_fields_with_paths(obj, parent='', depth=0, max_depth=MAX_DEPTH):
+    """Extract ALL fields with their full paths and types."""
+    return field_dicts(obj, parent, depth, max_depth)
 
 
 def parse_all_api_responses(api_file: Path):
@@ -95,13 +58,8 @@ def parse_all_api_responses(api_file: Path):
         
         # Parse response
         try:
-            # Define JavaScript literals
-            true = True
-            false = False
-            null = None
-            
-            # Use eval to handle JavaScript object notation
-            response_data = eval(response_str)
+            # Decode the JavaScript object literal (no eval)
+            response_data = js_literal.loads(response_str)
             
             # Extract all fields
             fields = extract_fields_with_paths(response_data)
@@ -145,41 +103,6 @@ def parse_all_api_responses(api_file: Path):
     return all_apis, dict(api_fields_by_category)
 
 
-def categorize_api(endpoint):
-    """Categorize API by endpoint."""
-    endpoint_lower = endpoint.lower()
-    
-    # FI-specific categories
-    if '/mutual-fund/' in endpoint_lower:
-        return 'mutual_funds'
-    elif '/term-deposit/' in endpoint_lower:
-        return 'term_deposit'
-    elif '/recurring-deposit/' in endpoint_lower:
-        return 'recurring_deposit'
-    elif '/equities/' in endpoint_lower or '/equities-and-etfs/' in endpoint_lower:
-        return 'equity_shares'
-    elif '/etf/' in endpoint_lower:
-        return 'exchange_traded_funds'
-    elif '/nps/' in endpoint_lower:
-        return 'national_pension_system'
-    elif '/deposit/' in endpoint_lower:
-        return 'deposit'
-    
-    # General categories
-    elif 'user-login' in endpoint_lower or 'user-details' in endpoint_lower or 'user-subscriptions' in endpoint_lower:
-        return 'user_management'
-    elif 'consent' in endpoint_lower:
-        return 'consent_management'
-    elif 'fips' in endpoint_lower or 'brokers' in endpoint_lower:
-        return 'provider_info'
-    elif 'firequest' in endpoint_lower:
-        return 'fi_request'
-    elif 'mutualfunds' in endpoint_lower and 'mutual-fund' not in endpoint_lower:
-        return 'reference_data'
-    else:
-        return 'other'
-
-
 def main():
     """Main function."""
     base_dir = Path(__file__).parent
@@ -192,38 +115,11 @@ def main():
     
     # Step 1: Parse ReBIT schemas
     print("\n📖 STEP 1: Parsing ReBIT Schemas...")
-    rebit_data = {}
-    
-    for schema_dir in rebit_dir.iterdir():
-        if schema_dir.is_dir():
-            fi_type = schema_dir.name
-            
-            for xsd_file in schema_dir.glob('*.xsd'):
-                data_points = extract_xsd_data_points(xsd_file, fi_type)
-                
-                if fi_type not in rebit_data:
-                    rebit_data[fi_type] = {
-                        'fields': {},
-                        'schemas': set()
-                    }
-                
-                rebit_data[fi_type]['schemas'].add(xsd_file.name)
-                
-                for attr in data_points.get('attributes', []):
-                    field_name = attr['name']
-                    
-                    if field_name not in rebit_data[fi_type]['fields']:
-                        rebit_data[fi_type]['fields'][field_name] = {
-                            'name': field_name,
-                            'type': attr.get('type', 'string'),
-                            'required': attr.get('required', False),
-                            'path': attr.get('path', ''),
-                            'documentation': attr.get('documentation', ''),
-                            'schema_file': xsd_file.name,
-                            'source_type': 'rebit'
-                        }
+    # FI-type directories are parsed concurrently, merged in sorted order
+    rebit_data, schema_timings = load_rebit_data(rebit_dir, extract_xsd_data_points)
     
     print(f"✅ Parsed {len(rebit_data)} ReBIT FI types")
+    print_timings(schema_timings)
     
     # Step 2: Parse ALL FinFactor APIs
     print("\n📡 STEP 2: Parsing ALL 43 FinFactor APIs...")
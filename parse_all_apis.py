@@ -5,60 +5,21 @@ Extracts EVERY field from EVERY API response with complete source tracking.
 """
 
 import json
-import re
 from pathlib import Path
 from collections import defaultdict, OrderedDict
+from api_blocks import read_api_blocks
 from parse_schemas import extract_xsd_data_points
+from rebit_loader import load_rebit_data, print_timings
+import js_literal
+from field_walker import MAX_DEPTH, field_dicts
 
 
-def extract_fields_with_paths(obj, parent='', depth=0, max_depth=50):
+def extract_fields_with_paths(obj, parent='', depth=0, max_depth=MAX_DEPTH):
     """
-    Recursively extract ALL fields with their full paths and types.
-    Returns list of (field_name, full_path, type) tuples.
+    Extract ALL fields with their full paths and types.
+    Returns list of field dicts (name, path, type, depth, occurrences).
     """
-    fields = []
-    
-    if depth > max_depth:
-        return fields
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            full_path = f"{parent}.{key}" if parent else key
-            
-            # Determine type
-            if isinstance(value, bool):
-                field_type = 'boolean'
-            elif isinstance(value, int):
-                field_type = 'integer'
-            elif isinstance(value, float):
-                field_type = 'float'
-            elif isinstance(value, str):
-                field_type = 'string'
-            elif isinstance(value, list):
-                field_type = 'array'
-            elif isinstance(value, dict):
-                field_type = 'object'
-            elif value is None:
-                field_type = 'null'
-            else:
-                field_type = 'unknown'
-            
-            fields.append({
-                'name': key,
-                'path': full_path,
-                'type': field_type,
-                'depth': depth
-            })
-            
-            # Recurse
-            if isinstance(value, (dict, list)):
-                fields.extend(extract_fields_with_paths(value, full_path, depth + 1, max_depth))
-    
-    elif isinstance(obj, list) and len(obj) > 0:
-        # Process first item as template
-        fields.extend(extract_fields_with_paths(obj[0], parent, depth, max_depth))
-    
-    return fields
+    return field_dicts(obj, parent, depth, max_depth)
 
 
 def parse_all_api_responses(api_file: Path):
@@ -69,22 +30,9 @@ def parse_all_api_responses(api_file: Path):
     print(f"📖 Reading API response file: {api_file}")
     print(f"   File size: {api_file.stat().st_size / 1024 / 1024:.1f} MB")
     
-    with open(api_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    print(f"   Total characters: {len(content):,}")
-    
-    # Find all API response blocks
-    # Pattern: name, endpoint, request, response
-    pattern = r'{\s*name:\s*"([^"]+)",\s*endpoint:\s*"([^"]+)",\s*request:\s*{[^}]*},\s*response:\s*({.*?})\s*,\s*error:'
-    
-    matches = list(re.finditer(pattern, content, re.DOTALL))
-    print(f"\n🔍 Found {len(matches)} API responses using regex")
-    
-    # If regex doesn't work well, try line-by-line parsing
-    if len(matches) < 10:
-        print("   ⚠️  Regex found too few matches, trying alternative parsing...")
-        matches = parse_by_lines(content)
+    # Walk the dump once; braces inside strings no longer unbalance blocks
+    matches = [api for api in read_api_blocks(api_file) if api['response']]
+    print(f"\n🔍 Found {len(matches)} API responses")
     
     # Map endpoints to FI types
     fi_type_mapping = {
@@ -107,14 +55,9 @@ def parse_all_api_responses(api_file: Path):
     
     # Process each API
     for match in matches:
-        if isinstance(match, dict):
-            api_name = match['name']
-            endpoint = match['endpoint']
-            response_str = match['response']
-        else:
-            api_name = match.group(1)
-            endpoint = match.group(2)
-            response_str = match.group(3)
+        api_name = match['name']
+        endpoint = match['endpoint']
+        response_str = match['response']
         
         # Determine FI type
         fi_type = None
@@ -137,14 +80,8 @@ def parse_all_api_responses(api_file: Path):
         
         # Parse response
         try:
-            # Convert JavaScript to Python before eval
-            # Define JavaScript literals
-            true = True
-            false = False
-            null = None
-            
-            # Use eval to handle JavaScript object notation
-            response_data = eval(response_str)
+            # Decode the JavaScript object literal (no eval)
+            response_data = js_literal.loads(response_str)
             
             # Extract all fields
             fields = extract_fields_with_paths(response_data)
@@ -190,66 +127,6 @@ def parse_all_api_responses(api_file: Path):
     return dict(api_data)
 
 
-def parse_by_lines(content):
-    """Alternative parser that works line by line."""
-    lines = content.split('\n')
-    matches = []
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Look for API name
-        if 'name:' in line and 'endpoint:' in lines[i+1] if i+1 < len(lines) else False:
-            # Extract name
-            name_match = re.search(r'name:\s*"([^"]+)"', line)
-            endpoint_match = re.search(r'endpoint:\s*"([^"]+)"', lines[i+1])
-            
-            if name_match and endpoint_match:
-                api_name = name_match.group(1)
-                endpoint = endpoint_match.group(1)
-                
-                # Find response block
-                response_start = -1
-                for j in range(i, min(i+20, len(lines))):
-                    if 'response:' in lines[j]:
-                        response_start = j
-                        break
-                
-                if response_start > 0:
-                    # Extract response (find matching braces)
-                    brace_count = 0
-                    response_lines = []
-                    started = False
-                    
-                    for j in range(response_start, min(response_start+1000, len(lines))):
-                        line_content = lines[j]
-                        
-                        if '{' in line_content and not started:
-                            started = True
-                        
-                        if started:
-                            response_lines.append(line_content)
-                            brace_count += line_content.count('{')
-                            brace_count -= line_content.count('}')
-                            
-                            if brace_count == 0 and started:
-                                break
-                    
-                    response_str = '\n'.join(response_lines)
-                    
-                    matches.append({
-                        'name': api_name,
-                        'endpoint': endpoint,
-                        'response': response_str
-                    })
-        
-        i += 1
-    
-    print(f"   Line-by-line parser found {len(matches)} APIs")
-    return matches
-
-
 def main():
     """Main function."""
     base_dir = Path(__file__).parent
@@ -262,38 +139,11 @@ def main():
     
     # Step 1: Parse ReBIT schemas with table tracking
     print("\n📖 STEP 1: Parsing ReBIT Schemas...")
-    rebit_data = {}
-    
-    for schema_dir in rebit_dir.iterdir():
-        if schema_dir.is_dir():
-            fi_type = schema_dir.name
-            
-            for xsd_file in schema_dir.glob('*.xsd'):
-                data_points = extract_xsd_data_points(xsd_file, fi_type)
-                
-                if fi_type not in rebit_data:
-                    rebit_data[fi_type] = {
-                        'fields': {},  # field_name -> field details
-                        'schemas': set()
-                    }
-                
-                rebit_data[fi_type]['schemas'].add(xsd_file.name)
-                
-                for attr in data_points.get('attributes', []):
-                    field_name = attr['name']
-                    
-                    if field_name not in rebit_data[fi_type]['fields']:
-                        rebit_data[fi_type]['fields'][field_name] = {
-                            'name': field_name,
-                            'type': attr.get('type', 'string'),
-                            'required': attr.get('required', False),
-                            'path': attr.get('path', ''),
-                            'documentation': attr.get('documentation', ''),
-                            'schema_file': xsd_file.name,
-                            'source_type': 'rebit'
-                        }
+    # FI-type directories are parsed concurrently, merged in sorted order
+    rebit_data, schema_timings = load_rebit_data(rebit_dir, extract_xsd_data_points)
     
     print(f"✅ Parsed {len(rebit_data)} ReBIT FI types")
+    print_timings(schema_timings)
     for fi_type, data in sorted(rebit_data.items()):
         print(f"   - {fi_type}: {len(data['fields'])} fields from {len(data['schemas'])} schemas")
     
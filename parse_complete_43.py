@@ -2,273 +2,207 @@
 """
 BULLETPROOF PARSER - ALL 43 APIs - ZERO DATAPOINTS MISSED
 Critical for business decision making.
-Uses line-by-line parsing to ensure 100% capture.
+Uses a single-pass tokenizer to ensure 100% capture.
+Run with --workers N to decode and extract API blocks in parallel,
+--skeleton to extract field shapes without decoding values.
 """
 
 import json
-import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from collections import defaultdict, OrderedDict
-from parse_schemas import extract_xsd_data_points
+from rebit_loader import load_rebit_data, print_timings
+from categorizer import categorize_api
+from endpoint_templates import normalize_endpoint
+from api_blocks import read_api_blocks
+from field_walker import MAX_DEPTH, field_dicts
+from shape_memo import ShapeMemo
+from block_cache import BlockCache
+from field_store import FieldStore
+from skeleton import scan_skeleton
+import js_literal
 
 
-def extract_all_fields_recursive(obj, parent='', depth=0, max_depth=100):
+# Bump whenever extraction output changes so cached field lists are invalidated
+EXTRACTOR_VERSION = 'extract_all_fields_recursive/v2'
+SKELETON_VERSION = 'scan_skeleton/v1'
+
+# API names kept per endpoint template; the call count covers the rest
+MAX_TEMPLATE_API_NAMES = 5
+
+# Hash-consed subtree shapes, shared by every API decoded in this process. Each
+# worker process builds its own memo; only its hit/miss counts come back to the
+# parent (see extract_all_apis' memo_stats)
+SHAPE_MEMO = ShapeMemo()
+
+
+def extract_all_fields_recursive(obj, parent='', depth=0, max_depth=MAX_DEPTH, occurrences=1):
     """
-    ULTRA-DEEP recursive extraction - goes up to 100 levels deep.
+    ULTRA-DEEP recursive extraction - goes up to MAX_DEPTH levels deep.
     Captures EVERY field including deeply nested ones.
+    Arrays are walked once per distinct element shape; `occurrences`
+    counts how many times each field appears across all elements.
     """
-    fields = []
-    
-    if depth > max_depth:
-        return fields
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            full_path = f"{parent}.{key}" if parent else key
-            
-            # Determine type
-            if isinstance(value, bool):
-                field_type = 'boolean'
-            elif isinstance(value, int):
-                field_type = 'integer'
-            elif isinstance(value, float):
-                field_type = 'float'
-            elif isinstance(value, str):
-                field_type = 'string'
-            elif isinstance(value, list):
-                field_type = 'array'
-            elif isinstance(value, dict):
-                field_type = 'object'
-            elif value is None:
-                field_type = 'null'
-            else:
-                field_type = 'unknown'
-            
-            fields.append({
-                'name': key,
-                'path': full_path,
-                'type': field_type,
-                'depth': depth
-            })
-            
-            # ALWAYS recurse into nested structures
-            if isinstance(value, dict):
-                fields.extend(extract_all_fields_recursive(value, full_path, depth + 1, max_depth))
-            elif isinstance(value, list) and len(value) > 0:
-                # Process ALL items in array, not just first
-                for i, item in enumerate(value[:3]):  # First 3 items to catch variations
-                    if isinstance(item, (dict, list)):
-                        fields.extend(extract_all_fields_recursive(item, full_path, depth + 1, max_depth))
-    
-    elif isinstance(obj, list) and len(obj) > 0:
-        for i, item in enumerate(obj[:3]):
-            if isinstance(item, (dict, list)):
-                fields.extend(extract_all_fields_recursive(item, parent, depth, max_depth))
-    
-    return fields
+    return field_dicts(obj, parent, depth, max_depth, occurrences)
 
 
-def parse_api_line_by_line(content):
+def extract_api_fields(response_str, skeleton=False):
     """
-    Line-by-line parser - more robust than regex.
-    Captures ALL 43 APIs.
+    Decode one response block and return its fields, deduplicated by name.
+    With skeleton=True the raw text is scanned for keys and value types
+    only, without decoding any values.
+    Top-level so it can run in worker processes.
     """
-    lines = content.split('\n')
-    apis = []
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Look for API name
-        name_match = re.search(r'name:\s*"([^"]+)"', line)
-        if name_match:
-            api_name = name_match.group(1)
-            
-            # Look for endpoint in next few lines
-            endpoint = None
-            for j in range(i, min(i+5, len(lines))):
-                endpoint_match = re.search(r'endpoint:\s*"([^"]+)"', lines[j])
-                if endpoint_match:
-                    endpoint = endpoint_match.group(1)
-                    break
-            
-            if endpoint:
-                # Find response block
-                response_start = -1
-                for j in range(i, min(i+20, len(lines))):
-                    if 'response:' in lines[j] and '{' in lines[j]:
-                        response_start = j
-                        break
-                
-                if response_start > 0:
-                    # Extract response by counting braces
-                    brace_count = 0
-                    response_lines = []
-                    started = False
-                    
-                    for j in range(response_start, min(response_start+5000, len(lines))):
-                        line_content = lines[j]
-                        
-                        # Start counting when we see response: {
-                        if 'response:' in line_content:
-                            # Extract just the part after 'response:'
-                            parts = line_content.split('response:', 1)
-                            if len(parts) > 1:
-                                line_content = parts[1].strip()
-                                started = True
-                        
-                        if started:
-                            response_lines.append(line_content)
-                            brace_count += line_content.count('{')
-                            brace_count -= line_content.count('}')
-                            
-                            # Stop when braces are balanced
-                            if brace_count == 0 and len(response_lines) > 1:
-                                break
-                            
-                            # Stop if we hit error:
-                            if ',\n' in line_content and 'error:' in lines[j+1] if j+1 < len(lines) else False:
-                                # Remove trailing comma
-                                response_lines[-1] = response_lines[-1].rstrip(',')
-                                break
-                    
-                    response_str = '\n'.join(response_lines)
-                    
-                    apis.append({
-                        'name': api_name,
-                        'endpoint': endpoint,
-                        'response': response_str,
-                        'line_number': i
-                    })
+    if skeleton:
+        fields = scan_skeleton(response_str)
+    else:
+        response_data = js_literal.loads(response_str)
         
-        i += 1
-    
-    return apis
+        # Extract ALL fields; same output as extract_all_fields_recursive,
+        # but each distinct subtree shape is only analyzed once per run
+        fields = SHAPE_MEMO.extract(response_data)
+    
+    # Deduplicate fields by name, summing occurrences of the kept path
+    unique_fields = {}
+    for field in fields:
+        kept = unique_fields.get(field['name'])
+        if kept is None:
+            unique_fields[field['name']] = field
+        elif kept['path'] == field['path'] and 'occurrences' in field:
+            kept['occurrences'] += field['occurrences']
+    
+    return list(unique_fields.values())
 
 
-def categorize_api(endpoint):
-    """Categorize API by endpoint."""
-    endpoint_lower = endpoint.lower()
-    
-    # FI-specific categories
-    if '/mutual-fund/' in endpoint_lower:
-        return 'mutual_funds'
-    elif '/term-deposit/' in endpoint_lower:
-        return 'term_deposit'
-    elif '/recurring-deposit/' in endpoint_lower:
-        return 'recurring_deposit'
-    elif '/equities/' in endpoint_lower or '/equities-and-etfs/' in endpoint_lower:
-        return 'equity_shares'
-    elif '/etf/' in endpoint_lower:
-        return 'exchange_traded_funds'
-    elif '/nps/' in endpoint_lower:
-        return 'national_pension_system'
-    elif '/deposit/' in endpoint_lower:
-        return 'deposit'
-    
-    # General categories
-    elif 'user-login' in endpoint_lower or 'user-details' in endpoint_lower or 'user-subscriptions' in endpoint_lower or 'user-account-delink' in endpoint_lower:
-        return 'user_management'
-    elif 'consent' in endpoint_lower:
-        return 'consent_management'
-    elif 'fips' in endpoint_lower or 'brokers' in endpoint_lower:
-        return 'provider_info'
-    elif 'firequest' in endpoint_lower or 'account-consents' in endpoint_lower:
-        return 'fi_request'
-    elif 'mutualfunds' in endpoint_lower and 'mutual-fund' not in endpoint_lower:
-        return 'reference_data'
-    elif 'account-statement' in endpoint_lower:
-        # Determine which FI type
-        if '/mutual-fund/' in endpoint_lower:
-            return 'mutual_funds'
-        elif '/deposit/' in endpoint_lower:
-            return 'deposit'
-        elif '/term-deposit/' in endpoint_lower:
-            return 'term_deposit'
-        elif '/recurring-deposit/' in endpoint_lower:
-            return 'recurring_deposit'
-        elif '/equities/' in endpoint_lower:
-            return 'equity_shares'
-        elif '/etf/' in endpoint_lower:
-            return 'exchange_traded_funds'
-        else:
-            return 'account_statements'
+def _extract_api_fields_safe(response_str, skeleton=False):
+    """
+    Worker wrapper: return (fields, error, (memo hits, memo misses))
+    instead of raising. The counts are this block's share of the
+    process-local SHAPE_MEMO's lookups.
+    """
+    hits, misses = SHAPE_MEMO.hits, SHAPE_MEMO.misses
+    try:
+        fields, error = extract_api_fields(response_str, skeleton), None
+    except Exception as e:
+        fields, error = None, str(e)
+    return fields, error, (SHAPE_MEMO.hits - hits, SHAPE_MEMO.misses - misses)
+
+
+def extract_all_apis(apis, workers=1, chunksize=4, cache=None, skeleton=False, memo_stats=None):
+    """
+    Yield (api_info, fields, error) for every API block, in input order.
+    
+    With workers > 1 the blocks are fanned out over a process pool in
+    chunks of `chunksize`; results come back in submission order, so the
+    merged per-category field maps are identical to a serial run.
+    With a BlockCache, only blocks whose content hash is not cached are
+    decoded; fresh results are written back to the cache.
+    skeleton=True uses the shape-only scanner instead of decoding.
+    Shape-memo hits and misses from every process, the parent's included,
+    are added to the `memo_stats` dict ('hits', 'misses') when given.
+    """
+    results = [None] * len(apis)
+    keys = [None] * len(apis)
+    pending = []
+    
+    for i, api_info in enumerate(apis):
+        if cache is not None:
+            keys[i] = cache.key(api_info['response'])
+            fields = cache.get(keys[i])
+            if fields is not None:
+                results[i] = (fields, None, (0, 0))
+                continue
+        pending.append(i)
+    
+    responses = [apis[i]['response'] for i in pending]
+    extract = partial(_extract_api_fields_safe, skeleton=skeleton)
+    
+    if workers <= 1 or len(pending) <= 1:
+        fresh = map(extract, responses)
+        for i, result in zip(pending, fresh):
+            results[i] = result
     else:
-        return 'other'
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            fresh = pool.map(extract, responses, chunksize=chunksize)
+            for i, result in zip(pending, fresh):
+                results[i] = result
+    
+    if cache is not None:
+        for i in pending:
+            fields, error, _ = results[i]
+            if error is None:
+                cache.put(keys[i], fields)
+    
+    for api_info, (fields, error, (hits, misses)) in zip(apis, results):
+        if memo_stats is not None:
+            memo_stats['hits'] = memo_stats.get('hits', 0) + hits
+            memo_stats['misses'] = memo_stats.get('misses', 0) + misses
+        yield api_info, fields, error
 
 
 def main():
     """Main function."""
+    # Only the ReBIT step needs the XSD parser; the extraction helpers above import without it
+    from parse_schemas import extract_xsd_data_points
+    
     base_dir = Path(__file__).parent
     rebit_dir = base_dir / 'rebit-schemas' / 'schemas'
     api_file = base_dir / 'finfactor' / 'apiResonse.json'
     
+    # --workers N fans decoding/extraction out over N processes
+    workers = 1
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    
+    # --skeleton scans keys and value types without decoding values
+    skeleton = '--skeleton' in sys.argv
+    
+    # Unchanged blocks are served from the content-hash cache (--no-cache to disable)
+    cache = None
+    if '--no-cache' not in sys.argv:
+        version = SKELETON_VERSION if skeleton else EXTRACTOR_VERSION
+        cache = BlockCache(base_dir / '.cache' / 'blocks', version=version)
+    
     print("="*80)
     print("🎯 BULLETPROOF PARSER - ALL 43 APIs - ZERO DATAPOINTS MISSED")
     print("="*80)
     
     # Step 1: Parse ReBIT schemas
     print("\n📖 STEP 1: Parsing ReBIT Schemas...")
-    rebit_data = {}
-    
-    for schema_dir in rebit_dir.iterdir():
-        if schema_dir.is_dir():
-            fi_type = schema_dir.name
-            
-            for xsd_file in schema_dir.glob('*.xsd'):
-                data_points = extract_xsd_data_points(xsd_file, fi_type)
-                
-                if fi_type not in rebit_data:
-                    rebit_data[fi_type] = {
-                        'fields': {},
-                        'schemas': set()
-                    }
-                
-                rebit_data[fi_type]['schemas'].add(xsd_file.name)
-                
-                for attr in data_points.get('attributes', []):
-                    field_name = attr['name']
-                    
-                    if field_name not in rebit_data[fi_type]['fields']:
-                        rebit_data[fi_type]['fields'][field_name] = {
-                            'name': field_name,
-                            'type': attr.get('type', 'string'),
-                            'required': attr.get('required', False),
-                            'path': attr.get('path', ''),
-                            'documentation': attr.get('documentation', ''),
-                            'schema_file': xsd_file.name,
-                            'source_type': 'rebit'
-                        }
+    # FI-type directories are parsed concurrently, merged in sorted order
+    rebit_data, schema_timings = load_rebit_data(rebit_dir, extract_xsd_data_points)
     
     print(f"✅ Parsed {len(rebit_data)} ReBIT FI types")
+    print_timings(schema_timings)
     
-    # Step 2: Parse ALL FinFactor APIs using line-by-line method
-    print("\n📡 STEP 2: Parsing ALL 43 FinFactor APIs (Line-by-Line Method)...")
+    # Step 2: Parse ALL FinFactor APIs using the single-pass tokenizer
+    print("\n📡 STEP 2: Parsing ALL 43 FinFactor APIs (Single-Pass Tokenizer)...")
     
-    with open(api_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+    print(f"   File size: {api_file.stat().st_size / 1024 / 1024:.1f} MB")
     
-    print(f"   File size: {len(content) / 1024 / 1024:.1f} MB")
-    
-    # Parse line by line
-    apis = parse_api_line_by_line(content)
+    # Walk the dump once; braces inside strings no longer unbalance blocks
+    apis = [api for api in read_api_blocks(api_file) if api['response']]
     
     print(f"\n🔍 Found {len(apis)} API responses")
     
     # Store ALL APIs
     all_apis = {}
+    # Per category, one entry per endpoint template rather than per captured call
     api_fields_by_category = defaultdict(lambda: {
-        'apis': OrderedDict(),
-        'all_fields': {},
-        'field_details': []
+        'apis': OrderedDict()
     })
-    
-    # Process each API
-    for api_info in apis:
+    # Field occurrences, interned and column-stored per category
+    field_store = FieldStore()
+    # Shape-memo lookups merged across worker processes
+    memo_stats = {'hits': 0, 'misses': 0}
+    
+    # Process each API (decode + extraction optionally fanned out over workers)
+    for api_info, fields, error in extract_all_apis(apis, workers, cache=cache, skeleton=skeleton,
+                                                    memo_stats=memo_stats):
         api_name = api_info['name']
         endpoint = api_info['endpoint']
-        response_str = api_info['response']
         
         category = categorize_api(endpoint)
         
@@ -276,72 +210,69 @@ def main():
         print(f"     Endpoint: {endpoint}")
         print(f"     Category: {category}")
         
-        # Parse response
-        try:
-            # Define JavaScript literals
-            true = True
-            false = False
-            null = None
-            
-            # Use eval to handle JavaScript object notation
-            response_data = eval(response_str)
-            
-            # Extract ALL fields with ultra-deep recursion
-            fields = extract_all_fields_recursive(response_data)
-            
-            # Deduplicate fields by name
-            unique_fields = {}
-            for field in fields:
-                if field['name'] not in unique_fields:
-                    unique_fields[field['name']] = field
-            
-            fields = list(unique_fields.values())
-            
-            print(f"     ✅ Extracted {len(fields)} unique fields")
-            
-            # Store API info
-            all_apis[api_name] = {
-                'endpoint': endpoint,
-                'category': category,
-                'field_count': len(fields),
-                'fields': fields
-            }
-            
-            # Store in category
-            api_fields_by_category[category]['apis'][api_name] = {
-                'endpoint': endpoint,
-                'field_count': len(fields),
-                'fields': [f['name'] for f in fields]
-            }
-            
-            # Track which APIs provide which fields
-            for field in fields:
-                field_name = field['name']
-                
-                if field_name not in api_fields_by_category[category]['all_fields']:
-                    api_fields_by_category[category]['all_fields'][field_name] = []
-                
-                api_fields_by_category[category]['all_fields'][field_name].append({
-                    'api_name': api_name,
-                    'api_endpoint': endpoint,
-                    'path': field['path'],
-                    'type': field['type'],
-                    'depth': field['depth']
-                })
-        
-        except Exception as e:
-            print(f"     ❌ Error: {str(e)[:200]}")
+        if error is not None:
+            print(f"     ❌ Error: {error[:200]}")
             continue
+        
+        print(f"     ✅ Extracted {len(fields)} unique fields")
+        
+        # Store API info; its fields live in the field store
+        all_apis[api_name] = {
+            'endpoint': endpoint,
+            'category': category,
+            'field_count': len(fields),
+            'api_id': field_store.add_api(api_name, endpoint, category, fields)
+        }
+        
+        # Store in category under the endpoint's template
+        template = normalize_endpoint(endpoint)
+        operation = api_fields_by_category[category]['apis'].get(template)
+        if operation is None:
+            operation = api_fields_by_category[category]['apis'][template] = {
+                'calls': 0,
+                'field_count': 0,
+                'api_names': []
+            }
+        operation['calls'] += 1
+        operation['field_count'] = max(operation['field_count'], len(fields))
+        if len(operation['api_names']) < MAX_TEMPLATE_API_NAMES:
+            operation['api_names'].append(api_name)
+
     
     print(f"\n✅ Successfully parsed {len(all_apis)} APIs")
     print(f"✅ Categorized into {len(api_fields_by_category)} categories")
     
+    lookups = memo_stats['hits'] + memo_stats['misses']
+    if lookups:
+        # Each miss builds one shape in that process's memo
+        print(f"\n🧩 Shape memo: {memo_stats['misses']} subtree shapes built "
+              f"across {max(workers, 1)} process(es), {memo_stats['hits'] / lookups * 100:.1f}% hit rate")
+    
+    if cache is not None:
+        print(f"\n♻️  Block cache: {cache.hits} reused, {cache.misses} decoded")
+        
+        shape_report = cache.diff_shapes({
+            f"{api_name} {api['endpoint']}": list(field_store.api_fields(api['api_id']))
+            for api_name, api in all_apis.items()
+        })
+        if not shape_report['first_run']:
+            print(f"   New APIs: {len(shape_report['added_apis'])}, "
+                  f"removed APIs: {len(shape_report['removed_apis'])}, "
+                  f"changed shape: {len(shape_report['changed'])}")
+            for api_key in shape_report['added_apis']:
+                print(f"   + {api_key}")
+            for api_key in shape_report['removed_apis']:
+                print(f"   - {api_key}")
+            for api_key, change in shape_report['changed'].items():
+                print(f"   ~ {api_key}: +{len(change['added'])} / -{len(change['removed'])} fields")
+    
     # Print category summary
     print("\n📊 APIs by Category:")
     for category, data in sorted(api_fields_by_category.items()):
-        unique_fields = len(data['all_fields'])
+        unique_fields = len(field_store.field_names(category))
         total_apis = len(data['apis'])
-        print(f"   {category}: {total_apis} APIs, {unique_fields} unique fields")
+        total_calls = sum(operation['calls'] for operation in data['apis'].values())
+        print(f"   {category}: {total_apis} APIs ({total_calls} calls), {unique_fields} unique fields")
     
     # Step 3: Create comprehensive comparison
     print("\n🔬 STEP 3: Creating Complete Comparison...")
@@ -367,22 +298,23 @@ def main():
     
     for category in all_categories:
         rebit_fields = rebit_data.get(category, {}).get('fields', {})
-        finn_fields = api_fields_by_category.get(category, {}).get('all_fields', {})
+        finn_names = field_store.field_names(category)
         
-        common_names = set(rebit_fields.keys()) & set(finn_fields.keys())
-        rebit_only_names = set(rebit_fields.keys()) - set(finn_fields.keys())
-        finn_only_names = set(finn_fields.keys()) - set(rebit_fields.keys())
+        common_names = set(rebit_fields.keys()) & set(finn_names)
+        rebit_only_names = set(rebit_fields.keys()) - set(finn_names)
+        finn_only_names = set(finn_names) - set(rebit_fields.keys())
         
         # Build detailed comparison
         common_fields = []
         for name in common_names:
+            sources = field_store.field_sources(category, name)
             common_fields.append({
                 'field_name': name,
                 'rebit': rebit_fields[name],
                 'finn': {
-                    'apis': finn_fields[name],
-                    'api_count': len(finn_fields[name]),
-                    'api_names': list(set(api['api_name'] for api in finn_fields[name]))
+                    'apis': sources,
+                    'api_count': len(sources),
+                    'api_names': field_store.apis_for_field(category, name)
                 }
             })
         
@@ -390,17 +322,18 @@ def main():
         
         finn_only_fields = []
         for name in finn_only_names:
+            sources = field_store.field_sources(category, name)
             finn_only_fields.append({
                 'field_name': name,
-                'apis': finn_fields[name],
-                'api_count': len(finn_fields[name]),
-                'api_names': list(set(api['api_name'] for api in finn_fields[name]))
+                'apis': sources,
+                'api_count': len(sources),
+                'api_names': field_store.apis_for_field(category, name)
             })
         
         comparison['categories'][category] = {
             'summary': {
                 'rebit_total': len(rebit_fields),
-                'finn_total': len(finn_fields),
+                'finn_total': len(finn_names),
                 'common': len(common_names),
                 'rebit_only': len(rebit_only_names),
                 'finn_only': len(finn_only_names),
@@ -410,7 +343,8 @@ def main():
             'common_fields': common_fields,
             'rebit_only_fields': rebit_only_fields,
             'finn_only_fields': finn_only_fields,
-            'apis': list(api_fields_by_category.get(category, {}).get('apis', {}).keys())
+            'apis': list(api_fields_by_category.get(category, {}).get('apis', {}).keys()),
+            'operations': api_fields_by_category.get(category, {}).get('apis', {})
         }
     
     # Save
@@ -427,7 +361,7 @@ def main():
     print(f"\n✅ Total APIs Parsed: {len(all_apis)} / 43")
     print(f"✅ Total Categories: {len(api_fields_by_category)}")
     
-    total_finn_fields = sum(len(data['all_fields']) for data in api_fields_by_category.values())
+    total_finn_fields = sum(len(field_store.field_names(category)) for category in api_fields_by_category)
     total_rebit_fields = sum(len(data['fields']) for data in rebit_data.values())
     
     print(f"✅ Total FinFactor Fields: {total_finn_fields}")
@@ -9,21 +9,15 @@ import re
 from pathlib import Path
 from collections import defaultdict
 from parse_schemas import extract_xsd_data_points
+import js_literal
+from field_walker import walk_fields
 
 
 def extract_all_field_names(obj, parent='', fields=None):
-    """Recursively extract all field names from nested structure."""
+    """Extract all field names from nested structure."""
     if fields is None:
         fields = set()
-    
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            path = f"{parent}.{key}" if parent else key
-            fields.add(key)  # Add just the field name
-            extract_all_field_names(value, path, fields)
-    elif isinstance(obj, list) and len(obj) > 0:
-        extract_all_field_names(obj[0], parent, fields)
-    
+    fields.update(name for name, _, _, _, _ in walk_fields(obj, parent))
     return fields
 
 
@@ -78,8 +72,8 @@ def main():
                 response_json = '{' + chunk[:error_pos+1]
                 
                 try:
-                    # Use eval to parse JavaScript object
-                    response_data = eval(response_json)
+                    # Decode the JavaScript object literal (no eval)
+                    response_data = js_literal.loads(response_json)
                     fields = extract_all_field_names(response_data)
                     finn_data['mutual_funds'] = fields
                     print(f"  ✅ Mutual Funds: {len(fields)} fields")
@@ -13,70 +13,17 @@ from collections import defaultdict, OrderedDict
 
 # Import ReBIT schema parser
 from parse_schemas import extract_xsd_data_points
+import js_literal
+from field_walker import field_dicts
+from categorizer import default_categorizer
 
 
 def extract_all_fields_recursively(data: Any, parent_path: str = '', depth: int = 0) -> List[Dict]:
     """
-    Recursively extract ALL fields from nested JSON structure.
+    Extract ALL fields from nested JSON structure.
     Returns list of field dictionaries with full paths.
     """
-    fields = []
-    
-    if depth > 50:  # Prevent infinite recursion
-        return fields
-    
-    if isinstance(data, dict):
-        for key, value in data.items():
-            current_path = f"{parent_path}.{key}" if parent_path else key
-            
-            # Add this field
-            field_info = {
-                'name': key,
-                'path': current_path,
-                'type': type(value).__name__,
-                'depth': depth
-            }
-            
-            # Determine more specific type
-            if isinstance(value, bool):
-                field_info['type'] = 'boolean'
-            elif isinstance(value, int):
-                field_info['type'] = 'integer'
-            elif isinstance(value, float):
-                field_info['type'] = 'float'
-            elif isinstance(value, str):
-                field_info['type'] = 'string'
-                # Check if it's a date
-                if re.match(r'\\d{4}-\\d{2}-\\d{2}', str(value)):
-                    field_info['type'] = 'date/datetime'
-            elif isinstance(value, list):
-                field_info['type'] = 'array'
-                if len(value) > 0:
-                    field_info['array_item_type'] = type(value[0]).__name__
-            elif isinstance(value, dict):
-                field_info['type'] = 'object'
-            elif value is None:
-                field_info['type'] = 'null'
-            
-            fields.append(field_info)
-            
-            # Recurse into nested structures
-            if isinstance(value, dict):
-                nested_fields = extract_all_fields_recursively(value, current_path, depth + 1)
-                fields.extend(nested_fields)
-            elif isinstance(value, list) and len(value) > 0:
-                # Process first item in array as template
-                if isinstance(value[0], (dict, list)):
-                    nested_fields = extract_all_fields_recursively(value[0], current_path, depth + 1)
-                    fields.extend(nested_fields)
-    
-    elif isinstance(data, list) and len(data) > 0:
-        # Process first item as template
-        if isinstance(data[0], (dict, list)):
-            nested_fields = extract_all_fields_recursively(data[0], parent_path, depth)
-            fields.extend(nested_fields)
-    
-    return fields
+    return field_dicts(data, parent_path, depth)
 
 
 def parse_api_response_file(api_response_file: Path) -> Dict[str, Any]:
@@ -113,24 +60,8 @@ def parse_api_response_file(api_response_file: Path) -> Dict[str, Any]:
         
         print(f"\\n  Processing: {api_name} ({endpoint})")
         
-        # Determine FI type from endpoint
-        fi_type = None
-        endpoint_lower = endpoint.lower()
-        
-        if '/mutual-fund/' in endpoint_lower:
-            fi_type = 'mutual_funds'
-        elif '/term-deposit/' in endpoint_lower:
-            fi_type = 'term_deposit'
-        elif '/recurring-deposit/' in endpoint_lower:
-            fi_type = 'recurring_deposit'
-        elif '/deposit/' in endpoint_lower and '/term-deposit/' not in endpoint_lower and '/recurring-deposit/' not in endpoint_lower:
-            fi_type = 'deposit'
-        elif '/etf/' in endpoint_lower:
-            fi_type = 'exchange_traded_funds'
-        elif '/equities/' in endpoint_lower or '/equities-and-etfs/' in endpoint_lower:
-            fi_type = 'equity_shares'
-        elif '/nps/' in endpoint_lower:
-            fi_type = 'national_pension_system'
+        # Determine FI type from endpoint (None for non-FI categories)
+        fi_type = default_categorizer().fi_type(endpoint)
         
         if not fi_type:
             print(f"    ⚠️  Skipping - not FI-specific")
@@ -138,18 +69,8 @@ def parse_api_response_file(api_response_file: Path) -> Dict[str, Any]:
         
         # Try to parse the response JSON
         try:
-            # Clean up JavaScript syntax to make it valid JSON
-            json_str = response_str
-            # Replace JavaScript object notation with JSON
-            json_str = re.sub(r'(\\w+):', r'"\\1":', json_str)  # Quote keys
-            json_str = re.sub(r':\\s*undefined', ': null', json_str)  # undefined -> null
-            
-            # Try to parse
-            try:
-                response_data = json.loads(json_str)
-            except:
-                # If that fails, use eval (careful!)
-                response_data = eval(response_str)
+            # Decode the JavaScript object literal (no eval)
+            response_data = js_literal.loads(response_str)
             
             # Extract all fields from this response
             fields = extract_all_fields_recursively(response_data)
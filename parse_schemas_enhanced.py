@@ -8,10 +8,30 @@ import json
 import os
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import Dict, List, Set, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Set, Any, Optional, Tuple
 from collections import defaultdict
 import re
 
+from aho_corasick import Automaton
+
+try:
+    from scipy import sparse
+    from field_assignment import assign
+    from fuzzy_match import FuzzyMatcher
+except ImportError:
+    # numpy / scipy missing: no fuzzy candidates, and each canonical name
+    # keeps its best-scoring pair instead of a global assignment
+    sparse = assign = FuzzyMatcher = None
+
+# Fuzzy candidates kept per unmatched ReBIT field, and the lowest score kept
+FUZZY_TOP_K = 3
+FUZZY_THRESHOLD = 0.5
+# Assignment weights: pairs sharing a canonical name score 0.9 - 1.0, fuzzy pairs
+# are scaled below that, and pairs under the threshold are never assigned
+ASSIGNMENT_THRESHOLD = 0.5
+FUZZY_ASSIGNMENT_WEIGHT = 0.85
+
+
 class SemanticMatcher:
     """Advanced semantic field name matcher."""
     
@@ -23,6 +43,13 @@ class SemanticMatcher:
         # Build reverse lookup for fast matching
         self.field_to_canonical = {}
         self._build_reverse_lookup()
+        
+        # Abbreviation expansion compiled once, plus every name it can reach
+        self._build_expanded_lookup()
+        self._build_context_lookup()
+        self._build_equivalence_groups()
+        # Resolved names, so each distinct name is canonicalized once
+        self._canonical_cache = {}
     
     def _build_reverse_lookup(self):
         """Build reverse lookup from all variations to canonical names."""
@@ -35,36 +62,138 @@ class SemanticMatcher:
                 for variant in variations:
                     self.field_to_canonical[self._normalize(variant)] = canonical
     
+    def _build_expanded_lookup(self, max_contractions: int = 6):
+        """
+        Every abbreviated or expanded spelling of a known name -> canonical.
+        Known names are contracted (each subset of their expansions swapped
+        for the abbreviation, so 'accountRefNumber' also yields 'accRefNum')
+        and fully expanded with the same automaton used on incoming names,
+        so 'txnAmt' and 'transactionAmount' meet on one key.
+        """
+        self.abbreviations = {
+            abbr.lower(): expansion.lower()
+            for abbr, expansion in self.mappings.get('abbreviation_expansions', {}).items()
+        }
+        self._abbreviation_automaton = Automaton(self.abbreviations)
+        contractions = {}
+        for abbr, expansion in self.abbreviations.items():
+            contractions.setdefault(expansion, abbr)
+        expansion_automaton = Automaton(contractions)
+        
+        self.expanded_to_canonical = dict(self.field_to_canonical)
+        for normalized, canonical in self.field_to_canonical.items():
+            matches = expansion_automaton.leftmost_longest(normalized)[:max_contractions]
+            for mask in range(1, 1 << len(matches)):
+                parts = []
+                position = 0
+                for bit, (start, end) in enumerate(matches):
+                    if mask >> bit & 1:
+                        parts.append(normalized[position:start])
+                        parts.append(contractions[normalized[start:end]])
+                        position = end
+                parts.append(normalized[position:])
+                self.expanded_to_canonical.setdefault(''.join(parts), canonical)
+        for normalized, canonical in self.field_to_canonical.items():
+            self.expanded_to_canonical.setdefault(self._expand(normalized), canonical)
+    
+    def _build_context_lookup(self):
+        """Field name -> [(context key, variant)] for the context-aware mappings."""
+        self.context_variants = {}
+        for field_name, context_mappings in self.mappings.get('context_aware_mappings', {}).items():
+            normalized = self._normalize(field_name)
+            matches = [
+                (ctx_key, variant)
+                for ctx_key, variants in context_mappings.items()
+                for variant in variants
+                if self._normalize(variant) == normalized
+            ]
+            if matches:
+                self.context_variants[field_name] = matches
+    
+    def _build_equivalence_groups(self):
+        """
+        Union-find over semantic_equivalents: groups sharing a name merge,
+        and each name maps to its merged group's id. A group is represented
+        by the first name of its earliest listed member group.
+        """
+        parent = {}
+        
+        def find(name):
+            root = name
+            while parent[root] != root:
+                root = parent[root]
+            while parent[name] != root:
+                parent[name], name = root, parent[name]
+            return root
+        
+        order = {}
+        for equiv_group in self.mappings.get('semantic_equivalents', {}).get('same_meaning_different_names', []):
+            for name in equiv_group:
+                if name not in parent:
+                    parent[name] = name
+                    order[name] = len(order)
+            for name in equiv_group[1:]:
+                root1, root2 = find(equiv_group[0]), find(name)
+                if root1 != root2:
+                    # The earlier-listed root stays representative
+                    if order[root2] < order[root1]:
+                        root1, root2 = root2, root1
+                    parent[root2] = root1
+        
+        self.equivalence_group = {}
+        self.group_representatives = []
+        group_ids = {}
+        for name in parent:
+            root = find(name)
+            if root not in group_ids:
+                group_ids[root] = len(self.group_representatives)
+                self.group_representatives.append(root)
+            self.equivalence_group[name] = group_ids[root]
+    
     def _normalize(self, field_name: str) -> str:
         """Normalize field name for comparison."""
         return field_name.lower().replace('_', '').replace('-', '').replace(' ', '')
     
+    def _expand(self, normalized: str) -> str:
+        """Spell out every abbreviation in a normalized name in one automaton pass."""
+        return self._abbreviation_automaton.replace(normalized, self.abbreviations)
+    
+    def _resolve(self, field_name: str) -> str:
+        """Canonical name ignoring context: known or contracted spelling, then fully expanded."""
+        normalized = self._normalize(field_name)
+        canonical = self.expanded_to_canonical.get(normalized)
+        if canonical is None:
+            canonical = self.expanded_to_canonical.get(self._expand(normalized), field_name)
+        return canonical
+    
     def get_canonical_name(self, field_name: str, context: str = '') -> str:
         """Get canonical name for a field, considering context."""
-        normalized = self._normalize(field_name)
-        
-        # Direct lookup
-        if normalized in self.field_to_canonical:
-            return self.field_to_canonical[normalized]
-        
-        # Context-aware lookup
-        if context and field_name in self.mappings.get('context_aware_mappings', {}):
-            context_mappings = self.mappings['context_aware_mappings'][field_name]
-            for ctx_key, variants in context_mappings.items():
-                if ctx_key in context.lower():
-                    for variant in variants:
-                        if self._normalize(variant) == normalized:
-                            return variant
+        canonical = self._canonical_cache.get(field_name)
+        if canonical is None:
+            canonical = self._canonical_cache[field_name] = self._resolve(field_name)
         
-        # Abbreviation expansion
-        for abbr, expansion in self.mappings.get('abbreviation_expansions', {}).items():
-            if abbr in normalized:
-                expanded = normalized.replace(abbr, expansion.lower())
-                if expanded in self.field_to_canonical:
-                    return self.field_to_canonical[expanded]
+        # Context-aware lookup, only for names without a direct mapping
+        if context and field_name in self.context_variants and \
+                self._normalize(field_name) not in self.field_to_canonical:
+            context_lower = context.lower()
+            for ctx_key, variant in self.context_variants[field_name]:
+                if ctx_key in context_lower:
+                    return variant
         
-        # Return original if no match
-        return field_name
+        return canonical
+    
+    def canonicalize_many(self, names: Iterable[str]) -> Dict[str, str]:
+        """Canonical name for each distinct name (context-free)."""
+        cache = self._canonical_cache
+        result = {}
+        for name in names:
+            if name in result:
+                continue
+            canonical = cache.get(name)
+            if canonical is None:
+                canonical = cache[name] = self._resolve(name)
+            result[name] = canonical
+        return result
     
     def are_equivalent(self, field1: str, field2: str, context1: str = '', context2: str = '') -> Tuple[bool, str]:
         """Check if two field names are semantically equivalent."""
@@ -74,10 +203,10 @@ class SemanticMatcher:
         if canonical1 == canonical2:
             return True, canonical1
         
-        # Check semantic equivalents
-        for equiv_group in self.mappings.get('semantic_equivalents', {}).get('same_meaning_different_names', []):
-            if field1 in equiv_group and field2 in equiv_group:
-                return True, equiv_group[0]  # Return first as canonical
+        # Check semantic equivalents (one id per transitively merged group)
+        group1 = self.equivalence_group.get(field1)
+        if group1 is not None and group1 == self.equivalence_group.get(field2):
+            return True, self.group_representatives[group1]
         
         return False, ''
     
@@ -118,18 +247,70 @@ def load_semantic_matcher() -> SemanticMatcher:
     return SemanticMatcher(mappings_file)
 
 
-# Import existing parser functions
-from parse_schemas import (
-    extract_xsd_data_points,
-    parse_postman_collection,
-    extract_schema_from_body,
-    extract_fields_from_json,
-    extract_fields_from_string
-)
+def _canonical_pair_weight(matcher: SemanticMatcher, rebit_name: str, finn_name: str) -> float:
+    """Assignment weight of two names sharing a canonical name: 1.0 when identical."""
+    return 0.9 + 0.1 * matcher.get_similarity_score(rebit_name, finn_name)
+
+
+def assign_fields(rebit_by_canonical: Dict[str, List[Dict]], finn_by_canonical: Dict[str, List[Dict]],
+                  matcher: SemanticMatcher, fuzzy: Optional['FuzzyMatcher'] = None,
+                  time_budget: float = 5.0) -> Tuple[List[Tuple[Tuple[str, str], Tuple[str, str], float]], Dict]:
+    """
+    One-to-one mapping of one FI type's ReBIT fields onto FinFactor fields.
+    Nodes are (canonical name, field name) pairs, sorted, so the result
+    does not depend on input order. Pairs sharing a canonical name are
+    weighted by name similarity; with a fuzzy matcher every other pair is
+    weighted by its scaled fuzzy score. Returns ([(rebit node, finn node,
+    weight)], assignment stats).
+    """
+    rebit_nodes = sorted({(canonical, field['name'])
+                          for canonical, fields in rebit_by_canonical.items() for field in fields})
+    finn_nodes = sorted({(canonical, field['name'])
+                         for canonical, fields in finn_by_canonical.items() for field in fields})
+    rebit_index = {node: index for index, node in enumerate(rebit_nodes)}
+    finn_index = {node: index for index, node in enumerate(finn_nodes)}
+    
+    rows, cols, data = [], [], []
+    for canonical in rebit_by_canonical.keys() & finn_by_canonical.keys():
+        for rebit_name in {field['name'] for field in rebit_by_canonical[canonical]}:
+            for finn_name in {field['name'] for field in finn_by_canonical[canonical]}:
+                rows.append(rebit_index[canonical, rebit_name])
+                cols.append(finn_index[canonical, finn_name])
+                data.append(_canonical_pair_weight(matcher, rebit_name, finn_name))
+    weights = sparse.csr_matrix((data, (rows, cols)), shape=(len(rebit_nodes), len(finn_nodes)))
+    
+    if fuzzy is not None:
+        rebit_names, finn_names, scores = fuzzy.similarity(
+            (name for _, name in rebit_nodes),
+            (name for _, name in finn_nodes),
+            threshold=ASSIGNMENT_THRESHOLD / FUZZY_ASSIGNMENT_WEIGHT
+        )
+        # Spread name-level scores onto every node carrying the name
+        def incidence(nodes, names):
+            position = {name: index for index, name in enumerate(names)}
+            return sparse.csr_matrix(
+                ([1.0] * len(nodes), ([position[name] for _, name in nodes], range(len(nodes)))),
+                shape=(len(names), len(nodes)))
+        scores = incidence(rebit_nodes, rebit_names).T @ scores @ incidence(finn_nodes, finn_names)
+        weights = weights.maximum(scores * FUZZY_ASSIGNMENT_WEIGHT)
+    
+    pairs, stats = assign(weights, threshold=ASSIGNMENT_THRESHOLD, time_budget=time_budget)
+    return [(rebit_nodes[row], finn_nodes[col], weight) for row, col, weight in pairs], stats
+
+
+def _representative(variants: List[Dict], name: str) -> Dict:
+    """The field named `name` with the smallest path, so duplicates resolve stably."""
+    return min((field for field in variants if field['name'] == name), key=lambda field: field.get('path', ''))
 
 
-def enhanced_comparison(rebit_data: Dict, finn_data: Dict, matcher: SemanticMatcher) -> Dict:
-    """Perform enhanced comparison with semantic matching."""
+def enhanced_comparison(rebit_data: Dict, finn_data: Dict, matcher: SemanticMatcher,
+                        fuzzy: Optional['FuzzyMatcher'] = None) -> Dict:
+    """
+    Perform enhanced comparison with semantic matching. Fields are paired
+    by a one-to-one assignment per FI type (see assign_fields). With a fuzzy
+    matcher, ReBIT-only fields also get their closest FinFactor-only names,
+    and the assignment can pair them across canonical names.
+    """
     
     comparison_results = {}
     
@@ -140,22 +321,25 @@ def enhanced_comparison(rebit_data: Dict, finn_data: Dict, matcher: SemanticMatc
         rebit_fields = rebit_data.get(fi_type, {}).get('all_fields', [])
         finn_fields = finn_data.get(fi_type, {}).get('all_fields', [])
         
+        # Canonicalize each distinct name once; only context-aware names look at the path
+        canonical_names = matcher.canonicalize_many(
+            field['name'] for fields in (rebit_fields, finn_fields) for field in fields
+        )
+        
         # Build lookup by canonical name
         rebit_by_canonical = defaultdict(list)
         for field in rebit_fields:
-            canonical = matcher.get_canonical_name(
-                field['name'],
-                field.get('path', '')
-            )
+            canonical = canonical_names[field['name']]
+            if field['name'] in matcher.context_variants:
+                canonical = matcher.get_canonical_name(field['name'], field.get('path', ''))
             field['canonical_name'] = canonical
             rebit_by_canonical[canonical].append(field)
         
         finn_by_canonical = defaultdict(list)
         for field in finn_fields:
-            canonical = matcher.get_canonical_name(
-                field['name'],
-                field.get('path', '')
-            )
+            canonical = canonical_names[field['name']]
+            if field['name'] in matcher.context_variants:
+                canonical = matcher.get_canonical_name(field['name'], field.get('path', ''))
             field['canonical_name'] = canonical
             finn_by_canonical[canonical].append(field)
         
@@ -167,13 +351,40 @@ def enhanced_comparison(rebit_data: Dict, finn_data: Dict, matcher: SemanticMatc
         # Find common fields (by canonical name)
         common_canonical = set(rebit_by_canonical.keys()) & set(finn_by_canonical.keys())
         
-        for canonical in common_canonical:
+        # Globally best one-to-one pairs; each canonical name reports its best pair
+        assigned_pairs, assignment_stats = [], None
+        if assign is not None:
+            assigned_pairs, assignment_stats = assign_fields(rebit_by_canonical, finn_by_canonical, matcher, fuzzy)
+        best_pair = {}
+        for (rebit_canonical, rebit_name), (finn_canonical, finn_name), weight in assigned_pairs:
+            if rebit_canonical == finn_canonical and weight > best_pair.get(rebit_canonical, (0.0,))[0]:
+                best_pair[rebit_canonical] = (weight, rebit_name, finn_name)
+        used_rebit = {rebit_node for rebit_node, _, _ in assigned_pairs}
+        used_finn = {finn_node for _, finn_node, _ in assigned_pairs}
+        unassigned_common = []
+        
+        for canonical in sorted(common_canonical):
             rebit_variants = rebit_by_canonical[canonical]
             finn_variants = finn_by_canonical[canonical]
             
-            # Take the most representative field from each
-            rebit_field = rebit_variants[0]
-            finn_field = finn_variants[0]
+            # Assigned pair, or else the best-scoring pair of names the assignment left free
+            if canonical in best_pair:
+                _, rebit_name, finn_name = best_pair[canonical]
+            else:
+                free_pairs = [
+                    (-_canonical_pair_weight(matcher, rebit_name, finn_name), rebit_name, finn_name)
+                    for rebit_name in {field['name'] for field in rebit_variants}
+                    if (canonical, rebit_name) not in used_rebit
+                    for finn_name in {field['name'] for field in finn_variants}
+                    if (canonical, finn_name) not in used_finn
+                ]
+                if not free_pairs:
+                    # Every name on one side is already paired across canonical names
+                    unassigned_common.append(canonical)
+                    continue
+                _, rebit_name, finn_name = min(free_pairs)
+            rebit_field = _representative(rebit_variants, rebit_name)
+            finn_field = _representative(finn_variants, finn_name)
             
             # Check if names are different (semantic match)
             is_semantic_match = rebit_field['name'] != finn_field['name']
@@ -217,12 +428,42 @@ def enhanced_comparison(rebit_data: Dict, finn_data: Dict, matcher: SemanticMatc
                 'exact_matches': sum(1 for f in common_fields if not f['is_semantic_match'])
             }
         }
+        
+        if assignment_stats is not None:
+            # Cross-canonical pairs between otherwise unmatched fields
+            comparison_results[fi_type]['assigned_matches'] = [
+                {'rebit_name': rebit_name, 'finn_name': finn_name, 'score': round(weight, 4)}
+                for (rebit_canonical, rebit_name), (finn_canonical, finn_name), weight in assigned_pairs
+                if rebit_canonical in rebit_only_canonical and finn_canonical in finn_only_canonical
+            ]
+            comparison_results[fi_type]['unassigned_common'] = unassigned_common
+            comparison_results[fi_type]['assignment'] = assignment_stats
+            comparison_results[fi_type]['summary']['unassigned_common'] = len(unassigned_common)
+            comparison_results[fi_type]['summary']['assigned_matches'] = \
+                len(comparison_results[fi_type]['assigned_matches'])
+        
+        if fuzzy is not None:
+            candidates = fuzzy.top_k(
+                (field['name'] for field in rebit_only_fields),
+                (field['name'] for field in finn_only_fields),
+                k=FUZZY_TOP_K,
+                threshold=FUZZY_THRESHOLD
+            )
+            comparison_results[fi_type]['fuzzy_candidates'] = {
+                name: [{'finn_name': finn_name, 'score': score} for finn_name, score in matches]
+                for name, matches in candidates.items()
+            }
+            comparison_results[fi_type]['summary']['fuzzy_candidates'] = len(candidates)
     
     return comparison_results
 
 
 def main():
     """Main function with enhanced semantic matching."""
+    # Existing parser functions; imported here so the matcher and assignment
+    # helpers above stay importable without the base parser
+    from parse_schemas import extract_xsd_data_points, parse_postman_collection
+
     base_dir = Path(__file__).parent
     rebit_dir = base_dir / 'rebit-schemas' / 'schemas'
     postman_file = base_dir / 'postman.json'
@@ -233,6 +474,9 @@ def main():
     print("📚 Loading semantic mappings...")
     matcher = load_semantic_matcher()
     print(f"✅ Loaded {len(matcher.field_to_canonical)} field mappings")
+    fuzzy = FuzzyMatcher.from_semantic_matcher(matcher) if FuzzyMatcher is not None else None
+    if fuzzy is None:
+        print("ℹ️  numpy/scipy not installed, skipping fuzzy candidates")
     
     # Parse ReBIT schemas (reuse existing function)
     print("\n📖 Parsing ReBIT schemas...")
@@ -342,7 +586,8 @@ def main():
     comparison_results = enhanced_comparison(
         rebit_data_points,
         dict(finn_factor_data_points),
-        matcher
+        matcher,
+        fuzzy
     )
     
     # Build final output structure
@@ -351,6 +596,7 @@ def main():
             'generated_at': '2026-01-04',
             'parser_version': '2.0-enhanced',
             'semantic_matching': True,
+            'fuzzy_matching': fuzzy is not None,
             'total_rebit_fi_types': len(rebit_data_points),
             'total_finn_fi_types': len(finn_factor_data_points)
         },
@@ -389,7 +635,9 @@ def main():
             print(f"  │  ├─ Exact Matches: {summary['exact_matches']}")
             print(f"  │  └─ Semantic Matches: {summary['semantic_matches']} 🎯")
             print(f"  ├─ ReBIT Only: {summary['total_rebit_only']}")
-            print(f"  └─ FinFactor Extra: {summary['total_finn_only']} ⭐")
+            print(f"  ├─ FinFactor Extra: {summary['total_finn_only']} ⭐")
+            print(f"  ├─ Fuzzy Candidates: {summary.get('fuzzy_candidates', 0)} 🔎")
+            print(f"  └─ Assigned Fuzzy Matches: {summary.get('assigned_matches', 0)} 🧮")
             
             total_semantic_matches += summary['semantic_matches']
             total_exact_matches += summary['exact_matches']
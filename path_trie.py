@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Prefix tree of dotted JSON field paths.
+
+Every distinct path is a node with an integer id; a node stores only its
+own key and its parent, so "summary.investment.currentValue" costs one
+key string instead of a full path per record. Records carry node ids and
+the trie answers prefix, subtree and depth queries in time proportional
+to the result. Node depth follows the walkers' convention: top-level keys
+are depth 0 and the root is -1.
+"""
+
+from array import array
+from typing import Iterator, List, Optional
+
+ROOT = 0
+
+
+class PathTrie:
+    """Interning prefix tree of field paths."""
+
+    __slots__ = ('keys', 'parents', 'depths', 'children', 'by_depth')
+
+    def __init__(self):
+        self.keys = ['']
+        self.parents = array('i', (-1,))
+        self.depths = array('h', (-1,))
+        # Child maps are created on first insert; leaves keep None
+        self.children = [None]
+        self.by_depth = {}
+
+    def __len__(self):
+        """Number of paths (the root is not a path)."""
+        return len(self.keys) - 1
+
+    def child(self, node: int, key: str) -> int:
+        """Id of `node`'s child `key`, inserting it if needed."""
+        children = self.children[node]
+        if children is None:
+            children = self.children[node] = {}
+        child = children.get(key)
+        if child is None:
+            child = len(self.keys)
+            depth = self.depths[node] + 1
+            children[key] = child
+            self.keys.append(key)
+            self.parents.append(node)
+            self.depths.append(depth)
+            self.children.append(None)
+            nodes = self.by_depth.get(depth)
+            if nodes is None:
+                self.by_depth[depth] = array('I', (child,))
+            else:
+                nodes.append(child)
+        return child
+
+    def insert(self, path: str) -> int:
+        """Node id of a dotted path, inserting missing components."""
+        node = ROOT
+        for key in path.split('.'):
+            node = self.child(node, key)
+        return node
+
+    def find(self, path: str) -> Optional[int]:
+        """Node id of a dotted path, or None if it was never inserted."""
+        node = ROOT
+        for key in path.split('.') if path else ():
+            children = self.children[node]
+            if children is None or key not in children:
+                return None
+            node = children[key]
+        return node
+
+    def name(self, node: int) -> str:
+        return self.keys[node]
+
+    def path(self, node: int) -> str:
+        """Dotted path of a node."""
+        keys = []
+        keys_append = keys.append
+        parents = self.parents
+        while node > ROOT:
+            keys_append(self.keys[node])
+            node = parents[node]
+        return '.'.join(reversed(keys))
+
+    def subtree(self, node: int = ROOT) -> Iterator[int]:
+        """Node ids below `node` (excluding it), depth-first in insertion order."""
+        children = self.children
+        stack = [iter(children[node].values())] if children[node] else []
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if children[child]:
+                    stack.append(iter(children[child].values()))
+                    break
+            else:
+                stack.pop()
+
+    def prefix(self, path: str) -> List[int]:
+        """The node for `path` and every node under it."""
+        node = self.find(path)
+        if node is None:
+            return []
+        nodes = [] if node == ROOT else [node]
+        nodes.extend(self.subtree(node))
+        return nodes
+
+    def at_depth(self, depth: int, under: Optional[int] = None) -> List[int]:
+        """Nodes at a given depth, optionally restricted to one subtree."""
+        if under is None or under == ROOT:
+            return list(self.by_depth.get(depth, ()))
+        # Descend level by level; stops at the requested depth
+        level = [under]
+        children = self.children
+        for _ in range(depth - self.depths[under]):
+            level = [child for node in level if children[node] for child in children[node].values()]
+        return level if depth >= self.depths[under] else []
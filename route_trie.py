@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Route matching of captured URLs against path templates.
+
+Templates from the ReBIT OpenAPI specs (see spec_index) and the FinFactor
+postman collection are compiled into a segment trie. Each node has a
+literal child map, one parameter child ({id}, :id or {{var}}) and one
+wildcard child (*, which takes the rest of the path). A concrete URL is
+matched segment by segment, trying literal children first, then the
+parameter child, then the wildcard. Lower-priority branches are only
+revisited when a higher-priority one dead-ends, so a lookup costs time
+proportional to the path length, not to the number of templates.
+"""
+
+import json
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class RouteMatch(NamedTuple):
+    template: str
+    operation_id: str
+    params: Dict[str, str]
+
+
+def _segments(url: str) -> List[str]:
+    """Path segments of a URL, without scheme, host, query string or fragment."""
+    if url.startswith('{{'):
+        # Postman '{{baseUrl}}/path'
+        url = url[url.find('}}') + 2:]
+    elif '://' in url:
+        url = url[url.find('/', url.find('://') + 3):] if '/' in url[url.find('://') + 3:] else '/'
+    for separator in ('?', '#'):
+        cut = url.find(separator)
+        if cut != -1:
+            url = url[:cut]
+    return [segment for segment in url.split('/') if segment]
+
+
+def _param_name(segment: str) -> Optional[str]:
+    """Parameter name of a template segment, or None for a literal."""
+    if segment.startswith('{{') and segment.endswith('}}'):
+        return segment[2:-2]
+    if segment.startswith('{') and segment.endswith('}'):
+        return segment[1:-1]
+    if segment.startswith(':') and len(segment) > 1:
+        return segment[1:]
+    return None
+
+
+class _Node:
+    __slots__ = ('literals', 'param', 'wildcard', 'targets')
+
+    def __init__(self):
+        self.literals = {}
+        self.param = None
+        self.wildcard = None
+        # method (None for any) -> (template, operation id, parameter names)
+        self.targets = None
+
+    def target(self, method: Optional[str]):
+        targets = self.targets
+        if targets is None:
+            return None
+        if method is not None and method in targets:
+            return targets[method]
+        return targets.get(None) or (next(iter(targets.values())) if method is None else None)
+
+
+class RouteTrie:
+    """Compiled path templates: literal segments, then parameters, then wildcards."""
+
+    def __init__(self, routes: Iterable[Tuple[Optional[str], str, str]] = ()):
+        self.root = _Node()
+        self.count = 0
+        for method, template, operation_id in routes:
+            self.add(template, operation_id, method)
+
+    def add(self, template: str, operation_id: str, method: Optional[str] = None):
+        """Register a template; the first registration of a (template, method) wins."""
+        node = self.root
+        names = []
+        for segment in _segments(template):
+            if segment == '*':
+                if node.wildcard is None:
+                    node.wildcard = _Node()
+                node = node.wildcard
+                names.append('*')
+                break
+            name = _param_name(segment)
+            if name is not None:
+                if node.param is None:
+                    node.param = _Node()
+                node = node.param
+                names.append(name)
+            else:
+                child = node.literals.get(segment)
+                if child is None:
+                    child = node.literals[segment] = _Node()
+                node = child
+
+        if node.targets is None:
+            node.targets = {}
+        key = method.upper() if method else None
+        if key not in node.targets:
+            node.targets[key] = (template, operation_id, tuple(names))
+            self.count += 1
+
+    def match(self, url: str, method: Optional[str] = None) -> Optional[RouteMatch]:
+        """The highest-priority template matching a concrete URL, or None."""
+        segments = _segments(url)
+        end = len(segments)
+        method = method.upper() if method else None
+        # Frames are (node, segment index, bound parameter values)
+        stack = [(self.root, 0, ())]
+        while stack:
+            node, i, values = stack.pop()
+            if i == end:
+                target = node.target(method)
+                if target is not None:
+                    template, operation_id, names = target
+                    return RouteMatch(template, operation_id, dict(zip(names, values)))
+                if node.wildcard is not None:
+                    stack.append((node.wildcard, end, values + ('',)))
+                continue
+
+            segment = segments[i]
+            # Pushed lowest priority first, so literals are tried first
+            if node.wildcard is not None:
+                stack.append((node.wildcard, end, values + ('/'.join(segments[i:]),)))
+            if node.param is not None:
+                stack.append((node.param, i + 1, values + (segment,)))
+            child = node.literals.get(segment)
+            if child is not None:
+                stack.append((child, i + 1, values))
+        return None
+
+
+def routes_from_specs(indexes: Dict[str, Dict]) -> Iterator[Tuple[str, str, str]]:
+    """(method, template, operation id) for every endpoint of the spec indexes."""
+    for index in indexes.values():
+        for endpoint in index['endpoints']:
+            yield endpoint['method'], index['base_path'].rstrip('/') + endpoint['path'], endpoint['operation_id']
+
+
+def routes_from_postman(postman_file: Path) -> Iterator[Tuple[str, str, str]]:
+    """(method, template, request name) for every request of a postman collection."""
+    with open(postman_file, 'r', encoding='utf-8') as f:
+        collection = json.load(f)
+    # Frames are item lists of nested folders
+    stack = [collection.get('item', [])]
+    while stack:
+        for item in stack.pop():
+            if 'item' in item:
+                stack.append(item['item'])
+                continue
+            request = item.get('request')
+            if not isinstance(request, dict):
+                continue
+            url = request.get('url')
+            raw = url if isinstance(url, str) else (url or {}).get('raw')
+            if raw:
+                yield request.get('method'), raw, item.get('name', raw)
+
+
+def main():
+    """Map captured FinFactor endpoints onto postman and ReBIT spec templates."""
+    from api_blocks import read_api_blocks
+    from spec_index import load_spec_indexes
+
+    base_dir = Path(__file__).parent
+    api_file = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'finfactor' / 'apiResonse.json'
+
+    trie = RouteTrie(routes_from_postman(base_dir / 'postman.json'))
+    postman_routes = trie.count
+    for method, template, operation_id in routes_from_specs(load_spec_indexes()):
+        trie.add(template, operation_id, method)
+    print(f"🧭 Route trie: {trie.count} templates ({postman_routes} postman, {trie.count - postman_routes} ReBIT spec)")
+
+    if not api_file.exists():
+        return
+    matched = 0
+    apis = read_api_blocks(api_file)
+    for api in apis:
+        route = trie.match(api['endpoint'])
+        if route is None:
+            print(f"   ❌ {api['endpoint']}")
+            continue
+        matched += 1
+        params = ', '.join(f"{name}={value}" for name, value in route.params.items())
+        print(f"   ✅ {api['endpoint']} -> {route.operation_id}{f' ({params})' if params else ''}")
+    print(f"\n📊 {matched} / {len(apis)} endpoints matched a template")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Structural interning of ReBIT complex types across FI schemas.
+
+Holders, Profile, Summary and Transaction-like types recur, often
+verbatim, in many FI-type XSDs. Every complex element of a compiled
+model (see xsd_compiler) is hash-consed bottom-up under an integer type
+id derived from its children's names, kinds, value types, cardinality
+and child type ids, so two elements get the same id exactly when their
+whole content models match, regardless of which XSD declared them. A
+model's root elements are children of a per-document pseudo type keyed
+by the empty path.
+
+SharedTypeMatcher computes ReBIT-vs-FinFactor name matches once per
+(type id, FinFactor name set) and reuses them for every FI type that
+shares the type.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+
+from xsd_compiler import load_compiled
+
+
+def _member(field: Dict, child_type) -> tuple:
+    return (
+        field['kind'], field['name'], field['base'], field['required'],
+        field.get('min_occurs'), field.get('max_occurs'),
+        tuple(field['enumerations']), tuple(field['patterns']),
+        tuple(sorted(field['facets'].items())), child_type
+    )
+
+
+class TypeInterner:
+    """Run-wide table of structural type ids for compiled XSD elements."""
+
+    def __init__(self):
+        self.ids = {}
+        # type id -> frozenset of direct child names
+        self.names = []
+        # type id -> (fi_type, schema_file, path) of every element using it
+        self.uses = []
+
+    def intern_model(self, model: Dict, fi_type: str) -> Dict[str, int]:
+        """Element path -> type id for every complex element of one model ('' is the document)."""
+        children = {'': []}
+        for field in model['fields']:
+            parent = field['path'].rpartition('.')[0]
+            children.setdefault(parent, []).append(field)
+            if field['kind'] == 'element' and field['base'] == 'object':
+                children.setdefault(field['path'], [])
+
+        # Deepest first, so child ids exist before their parents are keyed
+        type_of = {}
+        for path in sorted(children, key=lambda path: -path.count('.') if path else 1):
+            key = tuple(sorted(
+                _member(field, type_of.get(field['path']) if field['base'] == 'object' else None)
+                for field in children[path]
+            ))
+            type_id = self.ids.get(key)
+            if type_id is None:
+                type_id = self.ids[key] = len(self.names)
+                self.names.append(frozenset(field['name'] for field in children[path]))
+                self.uses.append([])
+            self.uses[type_id].append((fi_type, model['schema_file'], path))
+            type_of[path] = type_id
+        return type_of
+
+    def shared(self) -> List[int]:
+        """Type ids used by more than one FI type."""
+        return [type_id for type_id, uses in enumerate(self.uses)
+                if len({fi_type for fi_type, _, _ in uses}) > 1]
+
+    def stats(self) -> Dict:
+        elements = sum(len(uses) for uses in self.uses)
+        return {
+            'elements': elements,
+            'types': len(self.names),
+            'shared_types': len(self.shared()),
+            'dedup_percent': round((1 - len(self.names) / elements) * 100, 1) if elements else 0.0
+        }
+
+
+def intern_schema_tree(rebit_dir: Path, interner: TypeInterner = None) -> Tuple[TypeInterner, Dict[str, List[int]]]:
+    """Intern every XSD under rebit_dir; returns (interner, {fi_type: distinct type ids})."""
+    interner = interner or TypeInterner()
+    types_by_fi = {}
+    for xsd_file in sorted(Path(rebit_dir).glob('*/*.xsd')):
+        type_of = interner.intern_model(load_compiled(xsd_file), xsd_file.parent.name)
+        type_ids = types_by_fi.setdefault(xsd_file.parent.name, [])
+        type_ids.extend(type_id for type_id in type_of.values() if type_id not in type_ids)
+    return interner, types_by_fi
+
+
+class SharedTypeMatcher:
+    """
+    ReBIT-vs-FinFactor name matches, memoized per type id. Each type is
+    intersected once with the union of every FinFactor name set it will be
+    asked about, so a type shared by several FI types is matched once.
+    """
+
+    def __init__(self, interner: TypeInterner, finn_names: Iterable[str]):
+        self.interner = interner
+        self.finn_names = frozenset(finn_names)
+        self.memo = {}
+        self.computed = 0
+        self.reused = 0
+
+    def common(self, type_ids: Iterable[int], finn_names: Iterable[str]) -> FrozenSet[str]:
+        """
+        ReBIT names declared by any of the types that also occur in
+        finn_names, which must be drawn from the names given at construction.
+        """
+        memo = self.memo
+        names = self.interner.names
+        common = set()
+        for type_id in type_ids:
+            matched = memo.get(type_id)
+            if matched is None:
+                matched = memo[type_id] = names[type_id] & self.finn_names
+                self.computed += 1
+            else:
+                self.reused += 1
+            common |= matched
+        return frozenset(common.intersection(finn_names))
+
+    def stats(self) -> Dict:
+        requests = self.computed + self.reused
+        return {
+            'computed': self.computed,
+            'reused': self.reused,
+            'reuse_percent': round(self.reused / requests * 100, 1) if requests else 0.0
+        }
+
+
+def main():
+    """Report structurally shared types across the ReBIT schema tree."""
+    base_dir = Path(__file__).parent
+    rebit_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else base_dir / 'rebit-schemas' / 'schemas'
+
+    interner, types_by_fi = intern_schema_tree(rebit_dir)
+    stats = interner.stats()
+    print(f"🧩 {stats['elements']} complex elements in {len(types_by_fi)} FI types -> "
+          f"{stats['types']} distinct types ({stats['dedup_percent']}% deduplicated), "
+          f"{stats['shared_types']} shared across FI types")
+
+    for type_id in sorted(interner.shared(), key=lambda type_id: -len(interner.uses[type_id])):
+        uses = interner.uses[type_id]
+        fi_types = sorted({fi_type for fi_type, _, _ in uses})
+        paths = sorted({path for _, _, path in uses})
+        print(f"   #{type_id} {', '.join(paths)}: {len(interner.names[type_id])} fields, "
+              f"{len(fi_types)} FI types ({', '.join(fi_types[:4])}{', ...' if len(fi_types) > 4 else ''})")
+
+
+if __name__ == '__main__':
+    main()
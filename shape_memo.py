@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Structural hash-consing of decoded response subtrees.
+
+Every container in a response is interned bottom-up under an integer
+shape id: a dict's id is derived from its keys and its children's ids, a
+list's from the ids (and multiplicities) of its distinct element shapes.
+The relative field list of each shape is built once, from its children's
+already-memoized lists, and reused for every later subtree with the same
+id, within one API and across all APIs of the run.
+"""
+
+from typing import Any, Dict, List
+
+_CONTAINERS = (dict, list)
+
+
+# Containers map to None so they are interned instead of typed
+_TYPE_NAMES = {
+    bool: 'boolean',
+    int: 'integer',
+    float: 'float',
+    str: 'string',
+    type(None): 'null',
+    dict: None,
+    list: None,
+}
+
+
+class ShapeMemo:
+    """Run-wide memo of shape id -> relative field records."""
+
+    def __init__(self):
+        self.ids = {}
+        # shape id -> tuple of (relative_path, name, type, relative_depth, occurrences)
+        self.records = []
+        self.kinds = []
+        self.hits = 0
+        self.misses = 0
+
+    def intern(self, value: Any) -> int:
+        """Shape id of a dict or list, building its records on first sight."""
+        type_name = _TYPE_NAMES.get
+        intern = self.intern
+        if isinstance(value, dict):
+            key = (tuple(value), tuple([
+                type_name(type(child), 'unknown') or intern(child)
+                for child in value.values()
+            ]))
+        else:
+            counts = {}
+            for item in value:
+                if type_name(type(item), '') is None:
+                    child = intern(item)
+                    counts[child] = counts.get(child, 0) + 1
+            key = ('[]', tuple(counts.items()))
+
+        shape_id = self.ids.get(key)
+        if shape_id is not None:
+            self.hits += 1
+            return shape_id
+
+        self.misses += 1
+        if isinstance(value, dict):
+            records = self._dict_records(key)
+        else:
+            records = self._list_records(key[1])
+        shape_id = len(self.records)
+        self.records.append(records)
+        self.kinds.append('object' if isinstance(value, dict) else 'array')
+        self.ids[key] = shape_id
+        return shape_id
+
+    def _dict_records(self, key) -> tuple:
+        records = []
+        names, children = key
+        for name, child in zip(names, children):
+            if isinstance(child, str):
+                records.append((name, name, child, 0, 1))
+                continue
+            child_records = self.records[child]
+            records.append((name, name, self.kinds[child], 0, 1))
+            prefix = name + '.'
+            for path, field_name, field_type, depth, occurrences in child_records:
+                records.append((prefix + path if path else name, field_name, field_type, depth + 1, occurrences))
+        return tuple(records)
+
+    def _list_records(self, counts) -> tuple:
+        records = []
+        for child, count in counts:
+            for path, field_name, field_type, depth, occurrences in self.records[child]:
+                records.append((path, field_name, field_type, depth, occurrences * count))
+        return tuple(records)
+
+    def extract(self, obj: Any, max_depth: int = 100) -> List[Dict]:
+        """Field records of a decoded response, in the walkers' record format."""
+        if not isinstance(obj, _CONTAINERS):
+            return []
+        return [
+            {
+                'name': field_name,
+                'path': path,
+                'type': field_type,
+                'depth': depth,
+                'occurrences': occurrences
+            }
+            for path, field_name, field_type, depth, occurrences in self.records[self.intern(obj)]
+            if depth <= max_depth
+        ]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            'shapes': len(self.records),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups * 100, 1) if lookups else 0.0
+        }
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Shape-only skeleton scanner for API response text.
+
+Produces the same field inventory as the recursive walkers (name, path,
+type, depth) straight from the raw JS/JSON text, without materializing
+any values: string contents are skipped by the regex engine and numbers
+are classified, never parsed. Object elements of an array are
+fingerprinted by their keys and value kinds and skipped wholesale when
+an element of the same shape has already been scanned at that path.
+"""
+
+import json
+import re
+from typing import Dict, List
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"|\'[^\'\\]*(?:\\.[^\'\\]*)*\''
+
+# One value/key/bracket per match; commas, whitespace and comments are
+# swallowed as separators. Group 2 is set when the token is a key.
+_TOKEN = re.compile(
+    r'(?:[\s,]+|//[^\n]*|/\*.*?\*/)*'
+    r'(' + _STRING + r'|[{}\[\]]|-?\d[\d.eE+-]*|[A-Za-z_$][\w$]*)'
+    r'(\s*:)?',
+    re.DOTALL,
+)
+
+# Bracket matching for skipping a whole element: strings and plain text
+# up to the next bracket in one match.
+_BRACKET = re.compile(
+    r'[^"\'{}\[\]]*(?:(?:' + _STRING + r'|["\'])[^"\'{}\[\]]*)*[{}\[\]]',
+    re.DOTALL,
+)
+
+# Structural fingerprint of an element: one tuple per token, where keys
+# keep their name, numbers are reduced to int/float, words and brackets are
+# kept, and strings are consumed whole (separators and comments are
+# swallowed), so nesting is part of the shape but text inside a value can
+# never pass for a key.
+_SHAPE_KEY = re.compile(
+    r'(?:[\s,:]+|//[^\n]*|/\*.*?\*/)*'
+    r'(?:(?:"([^"\\]*(?:\\.[^"\\]*)*)"|\'([^\'\\]*(?:\\.[^\'\\]*)*)\'|([A-Za-z_$][\w$]*))\s*:'
+    r'|(?=(["\']))(?:' + _STRING + r')'
+    r'|-?\d+([.eE])?[\d.eE+-]*'
+    r'|([{}\[\]]|[A-Za-z_$][\w$]*))',
+    re.DOTALL,
+)
+
+_WORD_TYPES = {
+    'true': 'boolean',
+    'false': 'boolean',
+    'null': 'null',
+    'undefined': 'null',
+    'NaN': 'float',
+    'Infinity': 'float',
+}
+
+
+def _value_type(token: str) -> str:
+    c = token[0]
+    if c == '"' or c == "'":
+        return 'string'
+    if c == '{':
+        return 'object'
+    if c == '[':
+        return 'array'
+    if c == '-' or c.isdigit():
+        if '.' in token or 'e' in token or 'E' in token:
+            return 'float'
+        return 'integer'
+    return _WORD_TYPES.get(token, 'unknown')
+
+
+def _key_name(token: str) -> str:
+    if token[0] == '"':
+        return json.loads(token) if '\\' in token else token[1:-1]
+    if token[0] == "'":
+        return token[1:-1].replace("\\'", "'")
+    return token
+
+
+def _skip_container(text: str, start: int) -> int:
+    """End offset of the bracketed value opening at `start`."""
+    depth = 0
+    pos = start
+    match = _BRACKET.match
+    while True:
+        m = match(text, pos)
+        if m is None:
+            return len(text)
+        pos = m.end()
+        if text[pos - 1] in '{[':
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def scan_skeleton(text: str, stats: Dict = None) -> List[Dict]:
+    """
+    Field inventory of a response block, unique by (path, type), in
+    first-seen order. Pass a dict as `stats` to collect skip counters.
+    """
+    fields = []
+    seen = set()
+    element_shapes = {}
+    scanned = skipped = 0
+
+    # Frames are (is_object, path, depth of keys inside it)
+    stack = []
+    pending = None
+    pos = 0
+    match = _TOKEN.match
+
+    while True:
+        m = match(text, pos)
+        if m is None:
+            break
+        token = m.group(1)
+        pos = m.end()
+        c = token[0]
+
+        if m.group(2) is not None:
+            pending = _key_name(token)
+            continue
+
+        if c == '}' or c == ']':
+            if stack:
+                stack.pop()
+            continue
+
+        frame = stack[-1] if stack else None
+
+        if pending is not None:
+            path = f"{frame[1]}.{pending}" if frame and frame[1] else pending
+            depth = frame[2] if frame else 0
+            field_type = _value_type(token)
+            if (path, field_type) not in seen:
+                seen.add((path, field_type))
+                fields.append({
+                    'name': pending,
+                    'path': path,
+                    'type': field_type,
+                    'depth': depth
+                })
+            pending = None
+            if c == '{' or c == '[':
+                stack.append((c == '{', path, depth + 1))
+            continue
+
+        if c != '{' and c != '[':
+            # Scalar array element: contributes no fields
+            continue
+
+        if frame is None:
+            stack.append((c == '{', '', 0))
+            continue
+
+        if c == '{' and not frame[0]:
+            start = m.start(1)
+            end = _skip_container(text, start)
+            shape = tuple(_SHAPE_KEY.findall(text, start, end))
+            shapes = element_shapes.setdefault(frame[1], set())
+            if shape in shapes:
+                skipped += 1
+                pos = end
+                continue
+            shapes.add(shape)
+            scanned += 1
+
+        stack.append((c == '{', frame[1], frame[2]))
+
+    if stats is not None:
+        stats['elements_scanned'] = stats.get('elements_scanned', 0) + scanned
+        stats['elements_skipped'] = stats.get('elements_skipped', 0) + skipped
+
+    return fields
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Compiled index of the ReBIT AA / FIP / FIU OpenAPI specs.
+
+Each spec under rebit-schemas/specs is parsed once with PyYAML's
+libyaml-backed CSafeLoader (falling back to the pure-Python SafeLoader
+when libyaml is missing). Local `$ref`s are resolved with a per-document
+memo, so every definition is flattened into field records exactly once
+however many operations and definitions point at it. The result is an
+endpoint index (method, path template, operation id, parameters, request
+and response schemas) and a schema index (definition -> dotted field
+records), cached on disk keyed by the spec's content hash.
+"""
+
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from block_cache import BlockCache
+
+try:
+    from yaml import CSafeLoader as SpecLoader
+except ImportError:
+    from yaml import SafeLoader as SpecLoader
+
+SPEC_INDEX_VERSION = 'spec_index/v1'
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache' / 'specs'
+DEFAULT_SPECS_DIR = Path(__file__).parent / 'rebit-schemas' / 'specs'
+
+HTTP_METHODS = ('get', 'put', 'post', 'delete', 'options', 'head', 'patch')
+
+
+class RefResolver:
+    """Memoized `#/...` reference resolution and schema flattening for one document."""
+
+    def __init__(self, document: Dict):
+        self.document = document
+        self.targets = {}
+        self.flattened = {}
+
+    def resolve(self, ref: str) -> Dict:
+        """The node a local JSON pointer refers to."""
+        node = self.targets.get(ref)
+        if node is None:
+            if not ref.startswith('#/'):
+                raise ValueError(f"Only local $refs are supported: {ref}")
+            node = self.document
+            for part in ref[2:].split('/'):
+                node = node[part.replace('~1', '/').replace('~0', '~')]
+            self.targets[ref] = node
+        return node
+
+    def fields(self, schema: Dict, stack: tuple = ()) -> List[Dict]:
+        """
+        Field records of a schema relative to it: {'name', 'path', 'type',
+        'format', 'required', 'enumerations', 'description'}. Referenced
+        definitions are flattened once and re-prefixed wherever they appear.
+        """
+        ref = schema.get('$ref')
+        if ref is None:
+            return self._flatten(schema, stack)
+        records = self.flattened.get(ref)
+        if records is None:
+            if ref in stack:
+                # Recursive definitions stop at the first repeat
+                return []
+            records = self._flatten(self.resolve(ref), stack + (ref,))
+            self.flattened[ref] = records
+        return records
+
+    def _flatten(self, schema: Dict, stack: tuple) -> List[Dict]:
+        records = []
+        for part in schema.get('allOf', ()):
+            records.extend(self.fields(part, stack))
+        if schema.get('type') == 'array' or 'items' in schema:
+            return records + self.fields(schema.get('items', {}), stack)
+
+        required = set(schema.get('required', ()))
+        for name, prop in schema.get('properties', {}).items():
+            target = self.resolve(prop['$ref']) if '$ref' in prop else prop
+            items = target.get('items', {})
+            if '$ref' in items:
+                items = self.resolve(items['$ref'])
+            records.append({
+                'name': name,
+                'path': name,
+                'type': target.get('type', 'object'),
+                'format': target.get('format') or items.get('format'),
+                'required': name in required,
+                'enumerations': list(target.get('enum') or items.get('enum') or ()),
+                'description': ' '.join((target.get('description') or '').split())
+            })
+            for child in self.fields(prop, stack):
+                records.append(dict(child, path=f"{name}.{child['path']}"))
+        return records
+
+
+def _schema_name(schema: Optional[Dict]) -> Optional[str]:
+    if not schema:
+        return None
+    ref = schema.get('$ref') or schema.get('items', {}).get('$ref')
+    return ref.rsplit('/', 1)[-1] if ref else None
+
+
+def build_spec_index(spec_path: Path) -> Dict:
+    """Parse one spec and index its endpoints and definitions."""
+    spec_path = Path(spec_path)
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        document = yaml.load(f, Loader=SpecLoader)
+    resolver = RefResolver(document)
+    spec_name = spec_path.stem
+
+    endpoints = []
+    for path, item in document.get('paths', {}).items():
+        shared_parameters = item.get('parameters', [])
+        for method in HTTP_METHODS:
+            operation = item.get(method)
+            if operation is None:
+                continue
+            parameters = [resolver.resolve(p['$ref']) if '$ref' in p else p
+                          for p in shared_parameters + operation.get('parameters', [])]
+            body = next((p for p in parameters if p.get('in') == 'body'), None)
+            endpoints.append({
+                'method': method.upper(),
+                'path': path,
+                'operation_id': operation.get('operationId') or f"{spec_name}.{method}{path}",
+                'tags': operation.get('tags', []),
+                'parameters': [{'name': p['name'], 'in': p['in'], 'required': p.get('required', False)}
+                               for p in parameters if p.get('in') != 'body'],
+                'request_schema': _schema_name(body.get('schema')) if body else None,
+                'response_schemas': {str(code): _schema_name(response.get('schema'))
+                                     for code, response in operation.get('responses', {}).items()}
+            })
+
+    schemas = {name: resolver.fields({'$ref': f'#/definitions/{name}'})
+               for name in document.get('definitions', {})}
+
+    info = document.get('info', {})
+    return {
+        'version': SPEC_INDEX_VERSION,
+        'spec': spec_name,
+        'title': info.get('title'),
+        'spec_version': info.get('version'),
+        'base_path': document.get('basePath', ''),
+        'endpoints': endpoints,
+        'schemas': schemas
+    }
+
+
+def load_spec_index(spec_path: Path, cache: Optional[BlockCache] = None) -> Dict:
+    """Index of one spec, from the content-hash cache when unchanged."""
+    spec_path = Path(spec_path)
+    if cache is None:
+        cache = BlockCache(DEFAULT_CACHE_DIR, version=SPEC_INDEX_VERSION)
+    key = cache.key(spec_path.read_text(encoding='utf-8'))
+    index = cache.get(key)
+    if index is None:
+        index = build_spec_index(spec_path)
+        cache.put(key, index)
+    return index
+
+
+def load_spec_indexes(specs_dir: Path = DEFAULT_SPECS_DIR,
+                      cache: Optional[BlockCache] = None) -> Dict[str, Dict]:
+    """{spec name: index} for every *.yaml spec in specs_dir."""
+    return {path.stem: load_spec_index(path, cache) for path in sorted(Path(specs_dir).glob('*.yaml'))}
+
+
+def contract_fields(indexes: Dict[str, Dict]) -> Dict[str, List[Dict]]:
+    """Field name -> [{'spec', 'schema', 'path'}] across the request/response schemas of every spec."""
+    by_name = {}
+    for spec_name, index in indexes.items():
+        used = set()
+        for endpoint in index['endpoints']:
+            used.add(endpoint['request_schema'])
+            used.update(endpoint['response_schemas'].values())
+        for schema_name in sorted(name for name in used if name):
+            for field in index['schemas'].get(schema_name, ()):
+                by_name.setdefault(field['name'], []).append(
+                    {'spec': spec_name, 'schema': schema_name, 'path': field['path']})
+    return by_name
+
+
+def main():
+    """Index the ReBIT specs and match FinFactor payload field names against them."""
+    base_dir = Path(__file__).parent
+    specs_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_SPECS_DIR
+    cache = BlockCache(DEFAULT_CACHE_DIR, version=SPEC_INDEX_VERSION)
+
+    print(f"📖 YAML loader: {SpecLoader.__name__}")
+    indexes = load_spec_indexes(specs_dir, cache)
+    for spec_name, index in indexes.items():
+        fields = sum(len(records) for records in index['schemas'].values())
+        print(f"✅ {spec_name}: {index['title']} {index['spec_version']}, "
+              f"{len(index['endpoints'])} endpoints, {len(index['schemas'])} schemas, {fields} schema fields")
+        for endpoint in index['endpoints']:
+            print(f"   {endpoint['method']:6s} {endpoint['path']}  "
+                  f"-> {endpoint['response_schemas'].get('200') or '-'}")
+    print(f"\n♻️  Spec index cache: {cache.hits} reused, {cache.misses} built")
+
+    api_file = base_dir / 'finfactor' / 'apiResonse.json'
+    if not api_file.exists():
+        return
+
+    import js_literal
+    from api_blocks import read_api_blocks
+    from field_walker import walk_fields
+
+    finn_names = set()
+    for api in read_api_blocks(api_file):
+        if api['response']:
+            try:
+                response = js_literal.loads(api['response'])
+            except js_literal.JSLiteralError:
+                continue
+            finn_names.update(name for name, _, _, _, _ in walk_fields(response))
+
+    contracts = contract_fields(indexes)
+    matched = sorted(finn_names & contracts.keys())
+    print(f"\n🔬 {len(matched)} of {len(finn_names)} FinFactor field names appear in AA/FIP/FIU contracts")
+    for name in matched:
+        specs = sorted({f"{use['spec']}:{use['schema']}" for use in contracts[name]})
+        print(f"   {name}: {', '.join(specs[:4])}{', ...' if len(specs) > 4 else ''}")
+
+
+if __name__ == '__main__':
+    main()
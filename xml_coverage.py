@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Streaming path coverage of FI data XML statements.
+
+Statements are streamed with iterparse and every finished element is
+cleared and detached, so memory stays flat however many <Transaction>
+elements a statement holds. For each XSD-declared element and attribute
+path we count how many times it occurs and how many of those carry a
+non-empty value; undeclared attributes are counted too. A directory of
+statements is spread over a process pool and the per-file counts are
+summed per FI type.
+
+Coverage is keyed by FI type (the rebit-schemas/schemas directory name)
+and field name, the same keys as the categories and field names of the
+comparison_*.json reports, so the two can be joined.
+"""
+
+import json
+import sys
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from xml_validator import iter_events, local_name
+from xsd_compiler import load_compiled
+
+
+def load_declarations(rebit_dir: Path) -> Dict[str, Tuple[str, Dict[str, frozenset]]]:
+    """Target namespace -> (FI type, {element path: declared attribute names})."""
+    declarations = {}
+    for xsd_file in sorted(Path(rebit_dir).glob('*/*.xsd')):
+        model = load_compiled(xsd_file)
+        elements = {}
+        for field in model['fields']:
+            if field['kind'] == 'element':
+                elements.setdefault(field['path'], set())
+            else:
+                elements.setdefault(field['path'].rpartition('.')[0], set()).add(field['name'])
+        declarations[model['target_namespace']] = (
+            xsd_file.parent.name,
+            {path: frozenset(names) for path, names in elements.items()}
+        )
+    return declarations
+
+
+def scan_statement(source, declarations: Dict) -> Tuple[Optional[str], Counter, int]:
+    """
+    Stream one statement. Returns (FI type, counts, element count) where
+    counts[(path, True)] is how often the path carried a value and
+    counts[(path, False)] how often it was present but empty.
+    """
+    counts = Counter()
+    events = iter_events(source)
+    elements = 0
+    fi_type = None
+    paths = []
+    parents = []
+    # Per open element: whether a child has started (children are detached by its end)
+    has_children = []
+
+    for event, elem in events:
+        if event == 'start':
+            name = local_name(elem.tag)
+            if not paths:
+                namespace = elem.tag[1:].split('}', 1)[0] if elem.tag[0] == '{' else None
+                if namespace not in declarations:
+                    return None, counts, 0
+                fi_type = declarations[namespace][0]
+            path = f"{paths[-1]}.{name}" if paths else name
+            paths.append(path)
+            parents.append(elem)
+            if has_children:
+                has_children[-1] = True
+            has_children.append(False)
+            elements += 1
+            for attr_name, value in elem.attrib.items():
+                if attr_name[0] != '{':
+                    counts[(f"{path}.{attr_name}", bool(value.strip()))] += 1
+        else:
+            path = paths.pop()
+            parents.pop()
+            counts[(path, bool(elem.text and elem.text.strip()) or has_children.pop() or bool(elem.attrib))] += 1
+            # Drop the finished element so memory stays flat on large statements
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+    return fi_type, counts, elements
+
+
+_WORKER_DECLARATIONS = None
+
+
+def _init_worker(declarations: Dict):
+    global _WORKER_DECLARATIONS
+    _WORKER_DECLARATIONS = declarations
+
+
+def _scan_one(source) -> Tuple[Optional[str], Counter, int, Optional[str]]:
+    try:
+        return (*scan_statement(source, _WORKER_DECLARATIONS), None)
+    except ET.ParseError as e:
+        return None, Counter(), 0, f'malformed XML: {e}'
+
+
+def scan_statements(sources: Iterable, declarations: Dict, workers: int = 1,
+                    chunksize: int = 4) -> Dict[str, Dict]:
+    """
+    Sum coverage per FI type over many statements.
+    Returns {fi_type: {'documents', 'elements', 'counts'}}, plus an
+    'errors' list under the None key for unreadable or unknown documents.
+    """
+    sources = list(sources)
+    if workers <= 1 or len(sources) <= 1:
+        _init_worker(declarations)
+        results = map(_scan_one, sources)
+        return _merge(sources, results)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(declarations,)) as pool:
+        return _merge(sources, pool.map(_scan_one, sources, chunksize=chunksize))
+
+
+def _merge(sources: List, results) -> Dict[str, Dict]:
+    by_fi_type = {None: {'errors': []}}
+    for source, (fi_type, counts, elements, error) in zip(sources, results):
+        if fi_type is None:
+            by_fi_type[None]['errors'].append({'source': str(source), 'error': error or 'no schema for root namespace'})
+            continue
+        totals = by_fi_type.setdefault(fi_type, {'documents': 0, 'elements': 0, 'counts': Counter()})
+        totals['documents'] += 1
+        totals['elements'] += elements
+        totals['counts'].update(counts)
+    return by_fi_type
+
+
+def coverage_report(scanned: Dict[str, Dict], declarations: Dict) -> Dict[str, Dict]:
+    """
+    Per FI type: every declared path with its occurrence and populated
+    counts, undeclared paths seen in statements, and a by-name rollup
+    ({field name: populated count}) for joining with the comparisons.
+    """
+    declared_by_fi = {}
+    for fi_type, elements in declarations.values():
+        paths = declared_by_fi.setdefault(fi_type, set())
+        for path, attributes in elements.items():
+            paths.add(path)
+            paths.update(f"{path}.{name}" for name in attributes)
+
+    report = {}
+    for fi_type, totals in scanned.items():
+        if fi_type is None:
+            continue
+        declared = declared_by_fi.get(fi_type, set())
+        counts = totals['counts']
+        fields = {}
+        by_name = {}
+        for path in sorted(declared | {path for path, _ in counts}):
+            populated = counts[(path, True)]
+            occurrences = populated + counts[(path, False)]
+            fields[path] = {
+                'declared': path in declared,
+                'occurrences': occurrences,
+                'populated': populated
+            }
+            name = path.rpartition('.')[2]
+            by_name[name] = by_name.get(name, 0) + populated
+
+        populated_declared = sum(1 for path in declared if counts[(path, True)])
+        report[fi_type] = {
+            'documents': totals['documents'],
+            'elements': totals['elements'],
+            'declared_fields': len(declared),
+            'populated_fields': populated_declared,
+            'coverage_percent': round(populated_declared / len(declared) * 100, 1) if declared else 0.0,
+            'fields': fields,
+            'by_name': by_name
+        }
+    return report
+
+
+def join_comparison(comparison: Dict, report: Dict) -> Dict[str, Dict]:
+    """
+    Per category of a comparison_*.json: ReBIT-only fields that real
+    statements do populate, and common fields that statements never fill.
+    """
+    joined = {}
+    for category, data in comparison.get('categories', {}).items():
+        by_name = report.get(category, {}).get('by_name')
+        if by_name is None:
+            continue
+        rebit_only = {field['name'] for field in data['rebit_only_fields'] if 'name' in field}
+        common = {field['field_name'] for field in data['common_fields']}
+        joined[category] = {
+            'rebit_only_populated': sorted(name for name in rebit_only if by_name.get(name)),
+            'common_never_populated': sorted(name for name in common if name in by_name and not by_name[name])
+        }
+    return joined
+
+
+def main():
+    """Coverage of XML statements (files or directories; default: the ReBIT samples)."""
+    base_dir = Path(__file__).parent
+    rebit_dir = base_dir / 'rebit-schemas' / 'schemas'
+
+    workers = 1
+    args = sys.argv[1:]
+    if '--workers' in args:
+        index = args.index('--workers')
+        workers = int(args[index + 1])
+        del args[index:index + 2]
+
+    sources = []
+    for arg in map(Path, args):
+        sources.extend(sorted(arg.rglob('*.xml')) if arg.is_dir() else [arg])
+    sources = sources or sorted(rebit_dir.glob('*/*.xml'))
+
+    declarations = load_declarations(rebit_dir)
+    scanned = scan_statements(sources, declarations, workers)
+    report = coverage_report(scanned, declarations)
+
+    print(f"📄 Scanned {len(sources)} statements")
+    for fi_type, data in sorted(report.items()):
+        print(f"   {fi_type}: {data['documents']} documents, {data['elements']:,} elements, "
+              f"{data['populated_fields']}/{data['declared_fields']} declared fields populated "
+              f"({data['coverage_percent']}%)")
+    for error in scanned[None]['errors']:
+        print(f"   ❌ {error['source']}: {error['error']}")
+
+    output = {'fi_types': report}
+    comparison_file = base_dir / 'comparison_complete_43_apis.json'
+    if comparison_file.exists():
+        with open(comparison_file, encoding='utf-8') as f:
+            output['comparison_join'] = join_comparison(json.load(f), report)
+        for category, joined in sorted(output['comparison_join'].items()):
+            if joined['rebit_only_populated']:
+                print(f"   ⚠️  {category}: {len(joined['rebit_only_populated'])} ReBIT-only fields "
+                      f"are populated in statements")
+
+    output_file = base_dir / 'xml_coverage.json'
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Saved to: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
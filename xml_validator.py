@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Streaming validator for FI data XML against the compiled ReBIT XSDs.
+
+Each compiled schema (see xsd_compiler) becomes a table of per-element
+checkers keyed by element path: declared attributes with their required
+flag, enumeration set, anchored pattern, lexical type check and numeric
+bounds, plus the element's required and bounded children. Documents are
+streamed with iterparse, so every attribute costs a dict probe and at
+most one precompiled regex match, and processed elements are cleared as
+soon as they close.
+"""
+
+import io
+import itertools
+import re
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from xsd_compiler import load_compiled
+
+# Lexical forms of the XSD built-in types the ReBIT schemas use
+_NUMBER = r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?'
+_TIMEZONE = r'(?:Z|[+-]\d{2}:\d{2})?'
+_LEXICAL = {
+    'integer': r'[+-]?\d+',
+    'int': r'[+-]?\d+',
+    'long': r'[+-]?\d+',
+    'short': r'[+-]?\d+',
+    'nonNegativeInteger': r'\+?\d+',
+    'positiveInteger': r'\+?0*[1-9]\d*',
+    'decimal': r'[+-]?(?:\d+(?:\.\d*)?|\.\d+)',
+    'float': _NUMBER + r'|[+-]?INF|NaN',
+    'double': _NUMBER + r'|[+-]?INF|NaN',
+    'boolean': r'true|false|1|0',
+    'date': r'-?\d{4,}-\d{2}-\d{2}' + _TIMEZONE,
+    'dateTime': r'-?\d{4,}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.\d+)?' + _TIMEZONE,
+    'time': r'\d{2}:\d{2}:\d{2}(?:\.\d+)?' + _TIMEZONE,
+}
+LEXICAL_CHECKS = {name: re.compile(pattern).fullmatch for name, pattern in _LEXICAL.items()}
+
+_NUMERIC_BASES = {'integer', 'int', 'long', 'short', 'nonNegativeInteger', 'positiveInteger',
+                  'decimal', 'float', 'double'}
+_BOUNDS = {
+    'minInclusive': lambda value, bound: value >= bound,
+    'maxInclusive': lambda value, bound: value <= bound,
+    'minExclusive': lambda value, bound: value > bound,
+    'maxExclusive': lambda value, bound: value < bound,
+}
+
+Source = Union[str, Path, bytes]
+
+
+def local_name(tag: str) -> str:
+    """Tag without its '{namespace}' prefix."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def iter_events(source: Source):
+    """Streaming (event, element) pairs of start and end tags for a path or bytes."""
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    return ET.iterparse(source, events=('start', 'end'))
+
+
+class ValueCheck:
+    """Precompiled checks for one attribute (or simple-content element)."""
+
+    __slots__ = ('name', 'base', 'required', 'enumerations', 'pattern', 'lexical', 'bounds', 'fixed')
+
+    def __init__(self, field: Dict, lexical: bool = True):
+        self.name = field['name']
+        self.base = field['base']
+        self.required = field['required']
+        self.enumerations = frozenset(field['enumerations']) if field['enumerations'] else None
+        # Patterns from one restriction are alternatives; XSD patterns are implicitly anchored
+        self.pattern = (re.compile('|'.join(f'(?:{p})' for p in field['patterns'])).fullmatch
+                        if field['patterns'] else None)
+        self.lexical = LEXICAL_CHECKS.get(field['base']) if lexical else None
+        self.bounds = tuple(
+            (facet, _BOUNDS[facet], float(value))
+            for facet, value in field['facets'].items()
+            if facet in _BOUNDS and field['base'] in _NUMERIC_BASES
+        )
+        self.fixed = field.get('fixed')
+
+    def check(self, value: str) -> Optional[str]:
+        """Error message for a value, or None when it conforms."""
+        if self.fixed is not None and value != self.fixed:
+            return f"must be fixed value {self.fixed!r}"
+        if self.enumerations is not None:
+            if value not in self.enumerations:
+                return f"{value!r} not in enumeration"
+            return None
+        if self.pattern is not None and self.pattern(value) is None:
+            return f"{value!r} does not match pattern"
+        if self.lexical is not None and self.lexical(value) is None:
+            return f"{value!r} is not a valid {self.base}"
+        for facet, compare, bound in self.bounds:
+            if not compare(float(value), bound):
+                return f"{value!r} violates {facet} {bound:g}"
+        return None
+
+
+class ElementCheck:
+    """Declared attributes and child cardinalities of one element path."""
+
+    __slots__ = ('path', 'attributes', 'required_attributes', 'children', 'text')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.attributes = {}
+        self.required_attributes = ()
+        # child name -> (min_occurs, max_occurs or None for unbounded)
+        self.children = {}
+        self.text = None
+
+
+class SchemaValidator:
+    """Validator for documents of one compiled XSD."""
+
+    def __init__(self, model: Dict):
+        self.schema_file = model['schema_file']
+        self.namespace = model['target_namespace']
+        self.elements = {}
+
+        for field in model['fields']:
+            path = field['path']
+            parent, _, name = path.rpartition('.')
+            if field['kind'] == 'element':
+                element = self.elements.setdefault(path, ElementCheck(path))
+                if field['base'] != 'object':
+                    element.text = ValueCheck(field)
+                if parent:
+                    max_occurs = field.get('max_occurs', '1')
+                    self.elements.setdefault(parent, ElementCheck(parent)).children[name] = (
+                        field.get('min_occurs', 1),
+                        None if max_occurs == 'unbounded' else int(max_occurs)
+                    )
+            else:
+                self.elements.setdefault(parent, ElementCheck(parent)).attributes[name] = ValueCheck(field)
+
+        for element in self.elements.values():
+            element.required_attributes = tuple(
+                name for name, check in element.attributes.items() if check.required
+            )
+
+    def validate(self, source, max_errors: Optional[int] = None) -> List[Dict]:
+        """
+        Stream one document (path, bytes or binary file object) and return
+        its errors as {'path', 'field', 'error'} dicts.
+        """
+        return self.check_events(iter_events(source), max_errors)
+
+    def check_events(self, events, max_errors: Optional[int] = None) -> List[Dict]:
+        """Validate an iterparse ('start', 'end') event stream."""
+        errors = []
+        elements = self.elements
+        # Frames are (element path, checker, child counts, element)
+        stack = []
+
+        for event, elem in events:
+            if event == 'start':
+                name = local_name(elem.tag)
+                path = f"{stack[-1][0]}.{name}" if stack else name
+                checker = elements.get(path)
+                if checker is None:
+                    errors.append({'path': path, 'field': None, 'error': 'undeclared element'})
+                else:
+                    attrib = elem.attrib
+                    declared = checker.attributes
+                    for attr_name, value in attrib.items():
+                        if attr_name[0] == '{':
+                            # xsi:schemaLocation and other namespaced attributes
+                            continue
+                        check = declared.get(attr_name)
+                        if check is None:
+                            errors.append({'path': path, 'field': attr_name, 'error': 'undeclared attribute'})
+                            continue
+                        message = check.check(value)
+                        if message is not None:
+                            errors.append({'path': path, 'field': attr_name, 'error': message})
+                    for attr_name in checker.required_attributes:
+                        if attr_name not in attrib:
+                            errors.append({'path': path, 'field': attr_name, 'error': 'missing required attribute'})
+                if stack:
+                    counts = stack[-1][2]
+                    counts[name] = counts.get(name, 0) + 1
+                stack.append((path, checker, {}, elem))
+            else:
+                path, checker, counts, _ = stack.pop()
+                if checker is not None:
+                    if checker.text is not None:
+                        message = checker.text.check((elem.text or '').strip())
+                        if message is not None:
+                            errors.append({'path': path, 'field': None, 'error': message})
+                    for child, (min_occurs, max_occurs) in checker.children.items():
+                        seen = counts.get(child, 0)
+                        if seen < min_occurs:
+                            errors.append({'path': path, 'field': child, 'error': 'missing required element'})
+                        elif max_occurs is not None and seen > max_occurs:
+                            errors.append({'path': path, 'field': child,
+                                           'error': f'occurs {seen} times, max {max_occurs}'})
+                # Drop the finished element so memory stays flat on large statements
+                elem.clear()
+                if stack:
+                    stack[-1][3].remove(elem)
+
+            if max_errors is not None and len(errors) >= max_errors:
+                break
+
+        return errors
+
+
+def load_validators(rebit_dir: Path) -> Dict[str, SchemaValidator]:
+    """One validator per target namespace of the XSDs under rebit_dir."""
+    validators = {}
+    for xsd_file in sorted(Path(rebit_dir).glob('*/*.xsd')):
+        validator = SchemaValidator(load_compiled(xsd_file))
+        validators[validator.namespace] = validator
+    return validators
+
+
+_WORKER_VALIDATORS = None
+
+
+def _init_worker(validators: Dict[str, SchemaValidator]):
+    global _WORKER_VALIDATORS
+    _WORKER_VALIDATORS = validators
+
+
+def _validate_one(source: Source, validators: Optional[Dict[str, SchemaValidator]] = None,
+                  max_errors: Optional[int] = None) -> Tuple[Optional[str], List[Dict]]:
+    validators = validators if validators is not None else _WORKER_VALIDATORS
+    try:
+        # The root's start event picks the schema; the same parse then continues
+        events = iter_events(source)
+        first = next(events)
+        root = first[1]
+        namespace = root.tag[1:].split('}', 1)[0] if root.tag[0] == '{' else None
+        validator = validators.get(namespace)
+        if validator is None:
+            return None, [{'path': None, 'field': None, 'error': f'no schema for namespace {namespace!r}'}]
+        return validator.schema_file, validator.check_events(itertools.chain((first,), events), max_errors)
+    except ET.ParseError as e:
+        return None, [{'path': None, 'field': None, 'error': f'malformed XML: {e}'}]
+
+
+def validate_many(sources: Iterable[Source], validators: Dict[str, SchemaValidator],
+                  workers: int = 1, chunksize: int = 16,
+                  max_errors: Optional[int] = None) -> Iterator[Tuple[Source, Optional[str], List[Dict]]]:
+    """
+    Yield (source, schema file, errors) for each document, in input order.
+    The schema is picked by the document root's namespace. With
+    workers > 1 documents are validated in a process pool.
+    """
+    sources = list(sources)
+    if workers <= 1 or len(sources) <= 1:
+        results = (_validate_one(source, validators, max_errors) for source in sources)
+        for source, (schema_file, errors) in zip(sources, results):
+            yield source, schema_file, errors
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(validators,)) as pool:
+        results = pool.map(_validate_one, sources, [None] * len(sources), [max_errors] * len(sources),
+                           chunksize=chunksize)
+        for source, (schema_file, errors) in zip(sources, results):
+            yield source, schema_file, errors
+
+
+def main():
+    """Validate XML files (default: the ReBIT sample instances)."""
+    base_dir = Path(__file__).parent
+    rebit_dir = base_dir / 'rebit-schemas' / 'schemas'
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted(rebit_dir.glob('*/*.xml'))
+
+    validators = load_validators(rebit_dir)
+    invalid = 0
+    for path, schema_file, errors in validate_many(paths, validators):
+        if not errors:
+            print(f"✅ {path.name} ({schema_file})")
+            continue
+        invalid += 1
+        print(f"❌ {path.name} ({schema_file}): {len(errors)} errors")
+        for error in errors[:5]:
+            print(f"   {error['path']}{'@' + error['field'] if error['field'] else ''}: {error['error']}")
+
+    print(f"\n📊 {len(paths) - invalid} valid, {invalid} invalid of {len(paths)} documents")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Compiler from ReBIT XSD schemas to a resolved, path-qualified field model.
+
+Named complexTypes and simpleTypes, element refs, groups, attributeGroups
+and complexContent/simpleContent extensions are resolved starting from the
+schema's root elements, producing one record per element and attribute
+with its dotted path (e.g. "Account.Summary.currentBalance"), effective
+base type, cardinality, enumerations and facets.
+
+Compiled models are plain JSON and are cached on disk keyed by the XSD's
+content hash, so later runs skip XML parsing entirely.
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from block_cache import BlockCache
+
+COMPILER_VERSION = 'xsd_compiler/v2'
+DEFAULT_CACHE_DIR = Path(__file__).parent / '.cache' / 'xsd'
+
+XS = '{http://www.w3.org/2001/XMLSchema}'
+
+# Facets kept from xs:restriction (enumerations and patterns are collected separately)
+FACETS = (
+    'minInclusive', 'maxInclusive', 'minExclusive', 'maxExclusive',
+    'length', 'minLength', 'maxLength', 'totalDigits', 'fractionDigits', 'whiteSpace',
+)
+
+_GLOBAL_KINDS = {
+    XS + 'element': 'elements',
+    XS + 'complexType': 'complex_types',
+    XS + 'simpleType': 'simple_types',
+    XS + 'group': 'groups',
+    XS + 'attributeGroup': 'attribute_groups',
+}
+
+
+def _local(qname: Optional[str]) -> Optional[str]:
+    """Strip a namespace prefix: 'aa:AccountType' -> 'AccountType'."""
+    if qname is None:
+        return None
+    return qname.rsplit(':', 1)[-1]
+
+
+def _is_builtin(qname: str) -> bool:
+    return qname.startswith('xs:') or qname.startswith('xsd:')
+
+
+def _documentation(node: ET.Element) -> str:
+    doc = node.find(f'{XS}annotation/{XS}documentation')
+    if doc is None or not doc.text:
+        return ''
+    return ' '.join(doc.text.split())
+
+
+class _Compiler:
+    """Resolves one schema document into its field list."""
+
+    def __init__(self, root: ET.Element, schema_file: str):
+        self.schema_file = schema_file
+        self.globals = {kind: {} for kind in _GLOBAL_KINDS.values()}
+        for node in root:
+            kind = _GLOBAL_KINDS.get(node.tag)
+            if kind is not None and node.get('name'):
+                self.globals[kind][node.get('name')] = node
+        self.simple_types = {}
+        self.fields = []
+
+    # -- simple types -------------------------------------------------------
+
+    def simple_type(self, name: str, seen=()) -> Dict:
+        """Resolved restriction chain of a named simpleType (memoized)."""
+        if name in self.simple_types:
+            return self.simple_types[name]
+        node = self.globals['simple_types'].get(name)
+        if node is None or name in seen:
+            return {'base': name, 'enumerations': [], 'patterns': [], 'facets': {}}
+        resolved = self._restriction(node, seen + (name,))
+        self.simple_types[name] = resolved
+        return resolved
+
+    def _restriction(self, simple_type: ET.Element, seen=()) -> Dict:
+        restriction = simple_type.find(f'{XS}restriction')
+        if restriction is None:
+            # xs:list / xs:union carry no facets we can check per value
+            return {'base': 'string', 'enumerations': [], 'patterns': [], 'facets': {}}
+
+        base = restriction.get('base', 'xs:string')
+        if _is_builtin(base):
+            resolved = {'base': _local(base), 'enumerations': [], 'patterns': [], 'facets': {}}
+        else:
+            inherited = self.simple_type(_local(base), seen)
+            resolved = {
+                'base': inherited['base'],
+                'enumerations': list(inherited['enumerations']),
+                'patterns': list(inherited['patterns']),
+                'facets': dict(inherited['facets']),
+            }
+
+        enumerations = [node.get('value') for node in restriction.findall(f'{XS}enumeration')]
+        if enumerations:
+            # A derived enumeration narrows the inherited one
+            resolved['enumerations'] = enumerations
+        resolved['patterns'].extend(node.get('value') for node in restriction.findall(f'{XS}pattern'))
+        for facet in FACETS:
+            node = restriction.find(XS + facet)
+            if node is not None:
+                resolved['facets'][facet] = node.get('value')
+        return resolved
+
+    def value_type(self, type_name: Optional[str], inline: Optional[ET.Element]) -> Dict:
+        """Type info for an attribute or simple-content element."""
+        if inline is not None:
+            resolved = self._restriction(inline)
+            return dict(resolved, type=resolved['base'])
+        if type_name is None:
+            return {'type': 'string', 'base': 'string', 'enumerations': [], 'patterns': [], 'facets': {}}
+        if _is_builtin(type_name):
+            return {'type': _local(type_name), 'base': _local(type_name),
+                    'enumerations': [], 'patterns': [], 'facets': {}}
+        resolved = self.simple_type(_local(type_name))
+        return dict(resolved, type=_local(type_name))
+
+    # -- structure ----------------------------------------------------------
+
+    def _add(self, kind: str, name: str, path: str, depth: int, required: bool,
+             type_info: Dict, node: ET.Element, **extra):
+        self.fields.append({
+            'name': name,
+            'path': path,
+            'kind': kind,
+            'type': type_info['type'],
+            'base': type_info['base'],
+            'required': required,
+            'depth': depth,
+            'enumerations': type_info['enumerations'],
+            'patterns': type_info['patterns'],
+            'facets': type_info['facets'],
+            'fixed': node.get('fixed'),
+            'documentation': _documentation(node),
+            'schema_file': self.schema_file,
+            **extra
+        })
+
+    def element(self, node: ET.Element, parent: str, depth: int, stack: tuple):
+        min_occurs = node.get('minOccurs', '1')
+        max_occurs = node.get('maxOccurs', '1')
+        if node.get('ref'):
+            target = self.globals['elements'].get(_local(node.get('ref')))
+            if target is None:
+                return
+            node_for_doc = target
+            definition = target
+        else:
+            node_for_doc = node
+            definition = node
+
+        name = definition.get('name')
+        path = f"{parent}.{name}" if parent else name
+        type_name = definition.get('type')
+        complex_type = definition.find(f'{XS}complexType')
+        if complex_type is None and type_name and not _is_builtin(type_name):
+            complex_type = self.globals['complex_types'].get(_local(type_name))
+
+        cardinality = {'min_occurs': int(min_occurs), 'max_occurs': max_occurs}
+        if complex_type is None:
+            type_info = self.value_type(type_name, definition.find(f'{XS}simpleType'))
+            self._add('element', name, path, depth, min_occurs != '0', type_info, node_for_doc, **cardinality)
+            return
+
+        type_info = {'type': _local(type_name) or 'object', 'base': 'object',
+                     'enumerations': [], 'patterns': [], 'facets': {}}
+        self._add('element', name, path, depth, min_occurs != '0', type_info, node_for_doc, **cardinality)
+
+        # Recursive content models stop at the first repeat of a type/element
+        key = _local(type_name) or name
+        if key in stack:
+            return
+        self.complex_type(complex_type, path, depth + 1, stack + (key,))
+
+    def complex_type(self, node: ET.Element, path: str, depth: int, stack: tuple):
+        for child in node:
+            tag = child.tag
+            if tag in (XS + 'sequence', XS + 'choice', XS + 'all'):
+                self.particles(child, path, depth, stack)
+            elif tag == XS + 'group':
+                self.group(child, path, depth, stack)
+            elif tag == XS + 'attribute':
+                self.attribute(child, path, depth)
+            elif tag == XS + 'attributeGroup':
+                self.attribute_group(child, path, depth, stack)
+            elif tag in (XS + 'complexContent', XS + 'simpleContent'):
+                self.derived_content(child, path, depth, stack)
+
+    def derived_content(self, node: ET.Element, path: str, depth: int, stack: tuple):
+        derivation = node.find(f'{XS}extension')
+        if derivation is None:
+            derivation = node.find(f'{XS}restriction')
+        if derivation is None:
+            return
+        base = derivation.get('base')
+        if base and not _is_builtin(base):
+            base_type = self.globals['complex_types'].get(_local(base))
+            if base_type is not None and _local(base) not in stack:
+                self.complex_type(base_type, path, depth, stack + (_local(base),))
+        self.complex_type(derivation, path, depth, stack)
+
+    def particles(self, node: ET.Element, path: str, depth: int, stack: tuple):
+        for child in node:
+            tag = child.tag
+            if tag == XS + 'element':
+                self.element(child, path, depth, stack)
+            elif tag in (XS + 'sequence', XS + 'choice', XS + 'all'):
+                self.particles(child, path, depth, stack)
+            elif tag == XS + 'group':
+                self.group(child, path, depth, stack)
+
+    def group(self, node: ET.Element, path: str, depth: int, stack: tuple):
+        name = _local(node.get('ref'))
+        target = self.globals['groups'].get(name)
+        if target is None or name in stack:
+            return
+        for child in target:
+            if child.tag in (XS + 'sequence', XS + 'choice', XS + 'all'):
+                self.particles(child, path, depth, stack + (name,))
+
+    def attribute(self, node: ET.Element, path: str, depth: int):
+        name = node.get('name') or _local(node.get('ref'))
+        if not name:
+            return
+        type_info = self.value_type(node.get('type'), node.find(f'{XS}simpleType'))
+        self._add('attribute', name, f"{path}.{name}" if path else name, depth,
+                  node.get('use') == 'required', type_info, node)
+
+    def attribute_group(self, node: ET.Element, path: str, depth: int, stack: tuple):
+        name = _local(node.get('ref'))
+        target = self.globals['attribute_groups'].get(name)
+        if target is None or name in stack:
+            return
+        self.complex_type(target, path, depth, stack + (name,))
+
+    def compile(self) -> List[str]:
+        """Walk every root element (global elements nobody references)."""
+        # Refs can sit in any global definition: elements, complex types and
+        # named groups, at any depth of sequence / choice / all nesting
+        referenced = set()
+        for definitions in self.globals.values():
+            for node in definitions.values():
+                for ref in node.iter(f'{XS}element'):
+                    if ref.get('ref'):
+                        referenced.add(_local(ref.get('ref')))
+
+        roots = [name for name in self.globals['elements'] if name not in referenced]
+        for name in roots:
+            self.element(self.globals['elements'][name], '', 0, ())
+        return roots
+
+
+def compile_xsd(xsd_path: Path) -> Dict:
+    """Parse and resolve one XSD into its field model."""
+    xsd_path = Path(xsd_path)
+    root = ET.parse(xsd_path).getroot()
+    compiler = _Compiler(root, xsd_path.name)
+    roots = compiler.compile()
+    for name in compiler.globals['simple_types']:
+        compiler.simple_type(name)
+    return {
+        'version': COMPILER_VERSION,
+        'schema_file': xsd_path.name,
+        'target_namespace': root.get('targetNamespace'),
+        'roots': roots,
+        'simple_types': compiler.simple_types,
+        'fields': compiler.fields
+    }
+
+
+def load_compiled(xsd_path: Path, cache: Optional[BlockCache] = None) -> Dict:
+    """Compiled model for an XSD, from the content-hash cache when unchanged."""
+    xsd_path = Path(xsd_path)
+    if cache is None:
+        cache = BlockCache(DEFAULT_CACHE_DIR, version=COMPILER_VERSION)
+    key = cache.key(xsd_path.read_text(encoding='utf-8'))
+    model = cache.get(key)
+    if model is None:
+        model = compile_xsd(xsd_path)
+        cache.put(key, model)
+    return model
+
+
+def compiled_data_points(xsd_path: Path, fi_type: Optional[str] = None) -> Dict:
+    """Value-carrying fields of a compiled XSD in extract_xsd_data_points' shape."""
+    model = load_compiled(xsd_path)
+    return {
+        'fi_type': fi_type,
+        'schema_file': model['schema_file'],
+        'attributes': [field for field in model['fields'] if field['base'] != 'object']
+    }
+
+
+def main():
+    """Compile every XSD under rebit-schemas/schemas (or the given paths)."""
+    base_dir = Path(__file__).parent
+    paths = [Path(arg) for arg in sys.argv[1:]] or sorted((base_dir / 'rebit-schemas' / 'schemas').glob('*/*.xsd'))
+    cache = BlockCache(DEFAULT_CACHE_DIR, version=COMPILER_VERSION)
+
+    for xsd_path in paths:
+        model = load_compiled(xsd_path, cache)
+        attributes = sum(1 for field in model['fields'] if field['kind'] == 'attribute')
+        enumerated = sum(1 for field in model['fields'] if field['enumerations'])
+        print(f"✅ {xsd_path.parent.name}/{xsd_path.name}: {len(model['fields'])} fields "
+              f"({attributes} attributes, {enumerated} enumerated), roots {', '.join(model['roots'])}")
+
+    print(f"\n♻️  Compiled model cache: {cache.hits} reused, {cache.misses} compiled")
+
+
+if __name__ == '__main__':
+    main()